@@ -11,8 +11,11 @@ from qtpy import API_NAME, PYQT_VERSION, PYSIDE_VERSION, QT_VERSION
 
 from gridsync._version import get_versions  # type: ignore
 from gridsync.config import Config
+from gridsync.profiler import startup_profiler
 from gridsync.util import to_bool
 
+_init_span = startup_profiler.begin("import gridsync")
+
 __author__ = "Christopher R. Wood"
 __url__ = "https://github.com/gridsync/gridsync"
 __license__ = "GPLv3"
@@ -55,7 +58,8 @@ else:
     pkgdir = os.path.dirname(os.path.realpath(__file__))
 
 
-settings = Config(os.path.join(pkgdir, "resources", "config.txt")).load()
+with startup_profiler.span("load settings"):
+    settings = Config(os.path.join(pkgdir, "resources", "config.txt")).load()
 
 
 for envvar, value in os.environ.items():
@@ -196,7 +200,8 @@ def _load_grid_settings() -> dict[str, dict]:
     return results
 
 
-grid_settings = _load_grid_settings()
+with startup_profiler.span("load grid settings"):
+    grid_settings = _load_grid_settings()
 
 
 CONNECTION_DEFAULT = settings.get("connection", {}).get("default", "")
@@ -229,3 +234,5 @@ def get_version() -> str:
 
 
 __version__ = get_version()
+
+startup_profiler.end(_init_span)
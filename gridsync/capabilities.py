@@ -45,3 +45,17 @@ def diminish(cap: str) -> str:
         return cap
     # FIXME mypy warns 'Item [...] has no attribute "reader"'
     return danger_real_capability_string(c.reader)  # type: ignore
+
+
+def children_json(children: dict[str, str]) -> dict[str, list]:
+    """
+    Convert a mapping of names to capabilities into the JSON representation
+    of directory children expected by the Tahoe-LAFS web API (e.g., by the
+    "mkdir-with-children" and "set_children" operations).
+    """
+    results = {}
+    for name, cap in children.items():
+        node_type = "dirnode" if cap.startswith("URI:DIR2") else "filenode"
+        key = "ro_uri" if is_readonly(cap) else "rw_uri"
+        results[name] = [node_type, {key: cap}]
+    return results
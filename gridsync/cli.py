@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import multiprocessing
 import subprocess
 import sys
 from typing import Optional, Sequence, Union
@@ -52,4 +53,7 @@ def main() -> Union[int, str]:
 
 
 if __name__ == "__main__":
+    # Needed for worker processes (e.g., those used to filter eliot logs) to
+    # be started by frozen (i.e., PyInstaller-bundled) executables
+    multiprocessing.freeze_support()
     sys.exit(main())
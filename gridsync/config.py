@@ -1,47 +1,98 @@
 # -*- coding: utf-8 -*-
 
+import os
 from collections import defaultdict
 from configparser import NoOptionError, NoSectionError, RawConfigParser
+from threading import Lock
 from typing import Optional
 
 from atomicwrites import atomic_write
 
+# Parsed config files, by filename, along with the (inode, mtime, size) of
+# the file at the time it was read. Since a ``Config`` is cheap to create
+# (and many are, e.g., by ``get_preference``), the cache is shared by all
+# instances, so that files are only re-read and re-parsed after they change.
+_cache: dict[str, tuple[tuple[int, int, int], RawConfigParser]] = {}
+_cache_lock = Lock()
+
+
+def _stat_key(filename: str) -> Optional[tuple[int, int, int]]:
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
 
 class Config:
     def __init__(self, filename: str) -> None:
         self.filename = filename
 
-    def set(self, section: str, option: str, value: str) -> None:
+    def _read(self) -> RawConfigParser:
         config = RawConfigParser(allow_no_value=True)
         config.read(self.filename)
-        if not config.has_section(section):
-            config.add_section(section)
-        config.set(section, option, value)
+        return config
+
+    def _read_cached(self) -> RawConfigParser:
+        """
+        Return the parsed contents of the config file, re-reading it only if
+        it has changed since it was last read (or written by us). The
+        returned parser is shared and must not be modified.
+        """
+        key = _stat_key(self.filename)
+        with _cache_lock:
+            cached = _cache.get(self.filename)
+            if cached and cached[0] == key:
+                return cached[1]
+        config = self._read()
+        with _cache_lock:
+            if key is None:
+                _cache.pop(self.filename, None)
+            else:
+                _cache[self.filename] = (key, config)
+        return config
+
+    def _write(self, config: RawConfigParser) -> None:
         with atomic_write(self.filename, mode="w", overwrite=True) as f:
             config.write(f)
+        key = _stat_key(self.filename)
+        with _cache_lock:
+            if key is None:
+                _cache.pop(self.filename, None)
+            else:
+                _cache[self.filename] = (key, config)
+
+    def set(self, section: str, option: str, value: str) -> None:
+        self.save({section: {option: value}})
 
     def get(self, section: str, option: str) -> Optional[str]:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
         try:
-            return config.get(section, option)
+            return self._read_cached().get(section, option)
         except (NoOptionError, NoSectionError):
             return None
 
     def save(self, settings_dict: dict) -> None:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
+        """
+        Set all of the options in ``settings_dict`` (a mapping of sections
+        to mappings of options to values), writing the file only once.
+        """
+        # Always read afresh (rather than copying the cached parser) so as
+        # not to clobber any changes written by other processes.
+        config = self._read()
         for section, d in settings_dict.items():
             if not config.has_section(section):
                 config.add_section(section)
             for option, value in d.items():
                 config.set(section, option, value)
-        with atomic_write(self.filename, mode="w", overwrite=True) as f:
-            config.write(f)
+        self._write(config)
 
     def load(self) -> dict:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
+        config = self._read_cached()
         settings_dict: defaultdict = defaultdict(dict)
         for section in config.sections():
             for option, value in config.items(section):
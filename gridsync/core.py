@@ -5,6 +5,8 @@ import argparse
 import logging
 import os
 import sys
+from functools import partial
+from typing import Callable
 
 from qtpy.QtCore import Qt
 from qtpy.QtGui import QIcon
@@ -55,7 +57,13 @@ qtreactor.install()  # type: ignore
 
 # pylint: disable=wrong-import-order
 from twisted.internet import reactor
-from twisted.internet.defer import Deferred, DeferredList, inlineCallbacks
+from twisted.internet.defer import (
+    Deferred,
+    DeferredList,
+    DeferredSemaphore,
+    inlineCallbacks,
+    succeed,
+)
 
 from gridsync import (
     APP_NAME,
@@ -73,6 +81,8 @@ from gridsync.lock import FilesystemLock
 from gridsync.log import LOGGING_ENABLED, initialize_logger
 from gridsync.magic_folder import MagicFolder
 from gridsync.preferences import get_preference, set_preference
+from gridsync.profiler import startup_profiler
+from gridsync.system import ExecutableVersionCache, which
 from gridsync.tahoe import Tahoe, get_nodedirs
 from gridsync.tor import get_tor
 from gridsync.types import TwistedDeferred
@@ -86,6 +96,13 @@ class Core:
         self.gateways: list = []
         self.tahoe_version: str = ""
         self.magic_folder_version: str = ""
+        # The maximum number of gateways to start at once
+        self.gateway_start_concurrency: int = 4
+        # The number of seconds taken by each phase of start_gateways
+        self.startup_timings: dict[str, float] = {}
+        self._version_cache = ExecutableVersionCache(
+            os.path.join(config_dir, "versions.json")
+        )
 
         if LOGGING_ENABLED:
             initialize_logger(self.args.debug)
@@ -93,7 +110,8 @@ class Core:
             initialize_logger(self.args.debug, use_null_handler=True)
         # The `Gui` object must be initialized after initialize_logger,
         # otherwise log messages will be duplicated.
-        self.gui = Gui(self)
+        with startup_profiler.span("Gui.__init__"):
+            self.gui = Gui(self)
 
     @staticmethod
     @inlineCallbacks
@@ -118,33 +136,88 @@ class Core:
                 str(e),
             )
 
-    async def _get_executable_versions(self) -> None:
+    @inlineCallbacks
+    def _timed(
+        self, phase: str, f: Callable[[], Deferred], track: str = "main"
+    ) -> TwistedDeferred[object]:
+        """
+        Call ``f`` and record the number of seconds it took to complete (as
+        the duration of the startup phase ``phase``, on the startup profile
+        track ``track``).
+        """
+        span = startup_profiler.begin(phase, track)
+        try:
+            result = yield f()
+            return result
+        finally:
+            startup_profiler.end(span)
+            self.startup_timings[phase] = span.duration
+
+    async def _get_tahoe_version(self) -> None:
         tahoe = Tahoe(enable_logging=False)
         try:
-            self.tahoe_version = await tahoe.version()
+            self.tahoe_version = await self._version_cache.get_version(
+                which("tahoe"), tahoe.version
+            )
         except Exception as e:  # pylint: disable=broad-except
             msg.critical(
                 "Error getting Tahoe-LAFS version",
                 "{}: {}".format(type(e).__name__, str(e)),
             )
-        magic_folder = MagicFolder(tahoe, enable_logging=False)
+
+    async def _get_magic_folder_version(self) -> None:
+        magic_folder = MagicFolder(
+            Tahoe(enable_logging=False), enable_logging=False
+        )
         try:
-            self.magic_folder_version = await magic_folder.version()
+            self.magic_folder_version = await self._version_cache.get_version(
+                which("magic-folder"), magic_folder.version
+            )
         except Exception as e:  # pylint: disable=broad-except
             msg.critical(
                 "Error getting Magic-Folder version",
                 "{}: {}".format(type(e).__name__, str(e)),
             )
 
+    async def _get_executable_versions(self) -> None:
+        await DeferredList(
+            [
+                Deferred.fromCoroutine(self._get_tahoe_version()),
+                Deferred.fromCoroutine(self._get_magic_folder_version()),
+            ]
+        )
+
+    def _write_startup_trace(self) -> None:
+        startup_profiler.finish()
+        path = os.path.join(config_dir, "startup_trace.json")
+        try:
+            startup_profiler.write_chrome_trace(path)
+        except OSError as e:
+            logging.warning("Error writing startup trace: %s", str(e))
+            return
+        logging.debug("Wrote startup trace to %s", path)
+
     @inlineCallbacks
     def start_gateways(self) -> TwistedDeferred[None]:
+        start_span = startup_profiler.begin("Core.start_gateways")
+        # The versions of the executables don't depend on any gateway, so
+        # determine them while the gateways are starting (and so on a track
+        # of their own, as are the gateways themselves).
+        versions_d = self._timed(
+            "versions",
+            lambda: Deferred.fromCoroutine(self._get_executable_versions()),
+            "versions",
+        )
+        gateways_d: Deferred = succeed(None)
         nodedirs = get_nodedirs(config_dir)
         if nodedirs:
             minimize_preference = get_preference("startup", "minimize")
             if not minimize_preference or minimize_preference == "false":
                 self.gui.show_main_window()
-            tor_available = yield get_tor(reactor)
+            tor_available = yield self._timed("tor", lambda: get_tor(reactor))
             logging.debug("Starting Tahoe-LAFS gateway(s)...")
+            semaphore = DeferredSemaphore(self.gateway_start_concurrency)
+            starting = []
             for nodedir in nodedirs:
                 gateway = Tahoe(nodedir)
                 tcp = gateway.config_get("connections", "tcp")
@@ -159,7 +232,15 @@ class Core:
                         "Tor again.".format(gateway.name),
                     )
                 self.gateways.append(gateway)
-                self._start_gateway(gateway)
+                starting.append(
+                    semaphore.run(
+                        self._timed,
+                        f"gateway:{gateway.name}",
+                        partial(self._start_gateway, gateway),
+                        f"{gateway.name} Tahoe-LAFS",
+                    )
+                )
+            gateways_d = DeferredList(starting)
             self.gui.populate(self.gateways)
             cheatcode = settings.get("connection", {}).get("default")
             if cheatcode and not cheatcode_used(cheatcode):
@@ -169,7 +250,17 @@ class Core:
             if DEFAULT_AUTOSTART:
                 autostart_enable()
                 self.gui.preferences_window.general_pane.load_preferences()
-        yield Deferred.fromCoroutine(self._get_executable_versions())
+        yield DeferredList([gateways_d, versions_d])
+        startup_profiler.end(start_span)
+        self.startup_timings["total"] = start_span.duration
+        logging.debug(
+            "Startup timings: %s",
+            ", ".join(
+                f"{phase}={seconds:.3f}s"
+                for phase, seconds in self.startup_timings.items()
+            ),
+        )
+        self._write_startup_trace()
 
     @staticmethod
     def show_message() -> None:
@@ -215,6 +306,7 @@ class Core:
         )
 
     def start(self) -> None:
+        span = startup_profiler.begin("Core.start")
         try:
             os.makedirs(config_dir)
         except OSError:
@@ -233,6 +325,7 @@ class Core:
 
         self.gui.show_systray()
 
+        startup_profiler.end(span)
         reactor.callLater(0, self.start_gateways)  # type: ignore
         reactor.addSystemEventTrigger(  # type: ignore
             "before", "shutdown", self.stop_gateways
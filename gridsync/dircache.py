@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import lru_cache
+from time import monotonic
+from typing import Awaitable, Callable, Optional
+
+import attr
+from twisted.internet.defer import Deferred
+from twisted.python.failure import Failure
+
+from gridsync.capabilities import diminish
+
+# Reading a directory from the grid requires fetching shares from several
+# storage servers, so listings are cached for a short while. Listings only
+# go stale when the directory is modified by another client (e.g., another
+# device in the same magic-folder); local modifications invalidate them.
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 256
+
+
+@lru_cache(maxsize=1024)
+def _directory_key(key: str) -> str:
+    """
+    Return ``key`` (a capability, or a path beneath one) with its capability
+    diminished to a read-only one, so that all of the keys which refer to
+    the same directory -- through either its read-write or read-only cap --
+    have the same directory key.
+    """
+    cap, sep, path = key.partition("/")
+    try:
+        cap = diminish(cap)
+    except ValueError:
+        pass
+    return cap + sep + path
+
+
+@attr.s
+class DirectoryCacheStats:
+    """
+    :ivar hits: The number of lookups that were answered from the cache
+        (including those that waited on an identical in-flight request).
+
+    :ivar misses: The number of lookups that required reading from the
+        grid.
+
+    :ivar evictions: The number of entries that were discarded in order to
+        stay within the maximum number of entries.
+
+    :ivar invalidations: The number of entries that were discarded because
+        the corresponding directory was modified.
+    """
+
+    hits: int = attr.ib(default=0)
+    misses: int = attr.ib(default=0)
+    evictions: int = attr.ib(default=0)
+    invalidations: int = attr.ib(default=0)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+        return self.hits / lookups
+
+
+class DirectoryCache:
+    """
+    A size-bounded, least-recently-used cache of (the raw JSON content of)
+    Tahoe-LAFS directory listings, keyed by capability (or path).
+
+    The listings of a directory's read-write and read-only capabilities
+    differ (only the former include the read-write caps of its children) and
+    so are cached separately, but invalidating either one invalidates both.
+
+    :param clock: A callable returning the current time, in seconds, which
+        is used to expire entries.
+
+    :param ttl: The number of seconds for which an entry remains valid.
+
+    :param max_entries: The maximum number of entries to keep.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = monotonic,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self._clock = clock
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = DirectoryCacheStats()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._pending: dict[str, list[Deferred[Optional[bytes]]]] = {}
+        # Incremented on every invalidation so that a read which started
+        # before a modification doesn't (re-)populate the cache with the
+        # pre-modification contents.
+        self._generation = 0
+        # The generation at which each directory key was last invalidated
+        # (or, for those that weren't since, at which the cache was cleared)
+        self._versions: dict[str, int] = {}
+        self._cleared = 0
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, content = entry
+        if self._clock() >= expires:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return content
+
+    def _store(self, key: str, content: bytes) -> None:
+        self._entries[key] = (self._clock() + self.ttl, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def get(
+        self, key: str, fetch: Callable[[], Awaitable[Optional[bytes]]]
+    ) -> Optional[bytes]:
+        """
+        Return the cached content for ``key``, calling (and awaiting)
+        ``fetch`` to read it if it is missing or has expired. Concurrent
+        lookups of the same missing key share a single call to ``fetch``.
+
+        Results of ``None`` (i.e., failed reads) are not cached.
+        """
+        content = self._lookup(key)
+        if content is not None:
+            self.stats.hits += 1
+            return content
+        waiters = self._pending.get(key)
+        if waiters is not None:
+            self.stats.hits += 1
+            waiter: Deferred[Optional[bytes]] = Deferred()
+            waiters.append(waiter)
+            return await waiter
+        self.stats.misses += 1
+        generation = self._generation
+        waiters = self._pending[key] = []
+        try:
+            content = await fetch()
+        except Exception:
+            failure = Failure()
+            self._discard_pending(key, waiters)
+            for waiter in waiters:
+                waiter.errback(failure)
+            raise
+        self._discard_pending(key, waiters)
+        if content is not None and generation == self._generation:
+            self._store(key, content)
+        for waiter in waiters:
+            waiter.callback(content)
+        return content
+
+    def _discard_pending(
+        self, key: str, waiters: list[Deferred[Optional[bytes]]]
+    ) -> None:
+        # The fetch may have been invalidated (and another one started for
+        # the same key) in the meantime.
+        if self._pending.get(key) is waiters:
+            del self._pending[key]
+
+    def version(self, cap: str) -> int:
+        """
+        Return a number that changes whenever the directory ``cap`` (in
+        either its read-write or read-only form) is invalidated, allowing
+        callers to cache values derived from its listing for longer than
+        the listing itself is cached.
+        """
+        return self._versions.get(_directory_key(cap), self._cleared)
+
+    def invalidate(self, cap: str) -> None:
+        """
+        Discard the cached listings of the directory ``cap`` (in both its
+        read-write and read-only forms) along with any cached listings of
+        paths beneath it. Any reads of those that are still in progress are
+        no longer joined by later lookups, since they may return the
+        pre-modification contents.
+        """
+        self._generation += 1
+        directory_key = _directory_key(cap)
+        self._versions[directory_key] = self._generation
+        prefix = directory_key + "/"
+
+        def matches(key: str) -> bool:
+            key = _directory_key(key)
+            return key == directory_key or key.startswith(prefix)
+
+        for key in [k for k in self._entries if matches(k)]:
+            del self._entries[key]
+            self.stats.invalidations += 1
+        for key in [k for k in self._pending if matches(k)]:
+            del self._pending[key]
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._cleared = self._generation
+        self._versions.clear()
+        self._entries.clear()
+        self._pending.clear()
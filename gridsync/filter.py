@@ -3,7 +3,21 @@ from __future__ import annotations
 
 import json
 import os
-from typing import TYPE_CHECKING, Optional
+import re
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from multiprocessing import get_context
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+try:
+    # orjson parses JSON several times faster than the standard library
+    from orjson import JSONDecodeError
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional
+    from json import JSONDecodeError
+    from json import loads as json_loads
 
 from gridsync import autostart_file_path, config_dir, pkgdir
 from gridsync.crypto import trunchash
@@ -11,6 +25,13 @@ from gridsync.crypto import trunchash
 if TYPE_CHECKING:
     from gridsync.core import Core
 
+# Filtering eliot logs is CPU-bound, so (large) eliot logs are filtered in
+# several processes at once, leaving one CPU core free for everything else.
+ELIOT_FILTER_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+# The maximum number of chunks of an eliot log that may be being filtered
+# (or waiting to be consumed) at once, per worker process.
+ELIOT_FILTER_CHUNKS_PER_WORKER = 2
+
 
 def is_eliot_log_message(s: str) -> bool:
     try:
@@ -122,12 +143,70 @@ def get_filters(core: Core) -> list:
     return filters
 
 
-def apply_filters(in_str: str, filters: list) -> str:
-    filtered = in_str
+def _trie_pattern(strings: list[str]) -> str:
+    """
+    Return a regular expression pattern that matches any of the given
+    (non-empty) strings, preferring the longest match at any position.
+
+    The strings are arranged in a trie (so that strings sharing a common
+    prefix -- e.g., capabilities or paths beneath the same directory --
+    share a single branch of the pattern) in order that the cost of trying
+    to match at each position of the input is proportional to the length of
+    the matching prefix rather than to the number of strings.
+    """
+    trie: dict = {}
+    for string in strings:
+        node = trie
+        for char in string:
+            node = node.setdefault(char, {})
+        node[""] = {}  # Marks the end of a string
+
+    def pattern(node: dict) -> str:
+        prefix = ""
+        # Collapse chains of single characters into literals
+        while len(node) == 1 and "" not in node:
+            char, node = next(iter(node.items()))
+            prefix += re.escape(char)
+        branches = [
+            re.escape(char) + pattern(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return prefix
+        if "" in node:  # A string ends here; try to match longer ones first
+            return prefix + "(?:" + "|".join(branches) + ")?"
+        if len(branches) == 1:
+            return prefix + branches[0]
+        return prefix + "(?:" + "|".join(branches) + ")"
+
+    return pattern(trie)
+
+
+@lru_cache(maxsize=8)
+def _compile_filters(
+    filters: tuple[tuple[str, str], ...],
+) -> tuple[Optional[re.Pattern], dict[str, str]]:
+    masks: dict[str, str] = {}
     for s, mask in filters:
-        if s and mask:
-            filtered = filtered.replace(s, "<Filtered:{}>".format(mask))
-    return filtered
+        if s and mask and s not in masks:
+            masks[s] = "<Filtered:{}>".format(mask)
+    if not masks:
+        return None, masks
+    return re.compile(_trie_pattern(list(masks))), masks
+
+
+def apply_filters(in_str: str, filters: list) -> str:
+    """
+    Replace each occurrence of each of the strings in ``filters`` (a list
+    of ``(string, mask)`` pairs, such as that returned by ``get_filters``)
+    with its mask, in a single pass over ``in_str``. Where several strings
+    match at the same position, the longest one is replaced.
+    """
+    pattern, masks = _compile_filters(tuple(map(tuple, filters)))
+    if pattern is None:
+        return in_str
+    return pattern.sub(lambda match: masks[match.group()], in_str)
 
 
 def get_mask(string: str, tag: str, identifier: Optional[str] = None) -> str:
@@ -308,7 +387,12 @@ def _apply_filter_by_message_type(  # noqa: max-complexity
 def filter_eliot_log_message(
     message: str, identifier: Optional[str] = None
 ) -> str:
-    msg = json.loads(message)
+    try:
+        msg = json_loads(message)
+    except JSONDecodeError:
+        # orjson rejects some input that the standard library accepts
+        # (integers that don't fit in 64 bits, NaN, and Infinity)
+        msg = json.loads(message)
 
     action_type = msg.get("action_type")
     if action_type:
@@ -341,4 +425,49 @@ def join_eliot_logs(messages: list[str]) -> str:
 
 def apply_eliot_filters(content: str, identifier: Optional[str] = None) -> str:
     messages = content.split("\n")
-    return join_eliot_logs(filter_eliot_logs(messages, identifier))
+    # The messages returned by filter_eliot_logs are already sorted so
+    # there's no need to re-encode them with join_eliot_logs.
+    return "\n".join(filter_eliot_logs(messages, identifier))
+
+
+def make_eliot_filter_executor(
+    max_workers: int = ELIOT_FILTER_WORKERS,
+) -> ProcessPoolExecutor:
+    # Worker processes are started on demand. They're started afresh
+    # ("spawned") rather than forked since forking a process with several
+    # threads (e.g., those of Qt) running can leave the child deadlocked.
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=get_context("spawn")
+    )
+
+
+def apply_eliot_filters_chunked(
+    chunks: Iterable[str],
+    identifier: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    max_pending: int = ELIOT_FILTER_WORKERS * ELIOT_FILTER_CHUNKS_PER_WORKER,
+) -> Iterator[str]:
+    """
+    Yield the results of calling ``apply_eliot_filters`` on each of the
+    given chunks of an eliot log (each of which must consist only of whole
+    lines), in order.
+
+    If an ``executor`` (e.g., one returned by ``make_eliot_filter_executor``)
+    is given, and there is more than one chunk, the chunks are filtered in
+    parallel, with at most ``max_pending`` chunks being read ahead of the
+    chunk whose result is to be yielded next.
+    """
+    it = iter(chunks)
+    head = list(islice(it, 2))
+    if executor is None or len(head) < 2:
+        # A single chunk isn't worth the overhead of sending it elsewhere
+        for chunk in chain(head, it):
+            yield apply_eliot_filters(chunk, identifier)
+        return
+    pending: deque[Future[str]] = deque()
+    for chunk in chain(head, it):
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(apply_eliot_filters, chunk, identifier))
+    while pending:
+        yield pending.popleft().result()
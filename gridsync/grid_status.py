@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import json
+from time import monotonic
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+import treq
+from twisted.internet.defer import Deferred
+from twisted.internet.error import ConnectError
+from twisted.python.failure import Failure
+
+if TYPE_CHECKING:
+    from gridsync.http_client import HTTPClient
+
+# The number of seconds for which a result of GridStatusFeed.get may be
+# reused. The readiness poller (every 0.2 seconds while connecting) and the
+# Monitor's GridChecker (every 2 seconds) both want the same information.
+GRID_STATUS_MAX_AGE = 0.5
+
+# The number of storage servers to which a node is connected, the number
+# of storage servers it knows about, and the total amount of space
+# available on the connected servers.
+GridStatus = tuple[int, int, int]
+
+
+def parse_grid_status(content: bytes) -> GridStatus:
+    """
+    Parse the grid status from the JSON representation of a Tahoe-LAFS
+    node's welcome page (i.e., as returned by its "?t=json" web API).
+    """
+    data = json.loads(content.decode("utf-8"))
+    servers_connected = 0
+    servers_known = 0
+    available_space = 0
+    if "servers" in data:
+        servers = data["servers"]
+        servers_known = len(servers)
+        for server in servers:
+            if server["connection_status"].startswith("Connected"):
+                servers_connected += 1
+                if server["available_space"]:
+                    available_space += server["available_space"]
+    return servers_connected, servers_known, available_space
+
+
+async def fetch_grid_status(
+    http_client: HTTPClient, nodeurl: str
+) -> Optional[GridStatus]:
+    """
+    Read the grid status of the Tahoe-LAFS node whose web API is rooted at
+    ``nodeurl``, returning ``None`` if the node couldn't be reached.
+    """
+    if not nodeurl:
+        return None
+    try:
+        resp = await http_client.get(nodeurl + "?t=json")
+    except ConnectError:
+        return None
+    if resp.code == 200:
+        return parse_grid_status(await treq.content(resp))
+    return None
+
+
+class GridStatusFeed:
+    """
+    A single source of grid status for a gateway, shared by all of its
+    consumers: concurrent callers of ``get`` share one call to ``fetch``
+    and results younger than ``max_age`` seconds are reused.
+
+    :param fetch: A callable that reads the current grid status (or returns
+        ``None`` if the node couldn't be reached).
+
+    :param clock: A callable returning the current time, in seconds, which
+        is used to determine the age of results.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[Optional[GridStatus]]],
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self._fetch = fetch
+        self._clock = clock
+        self._result: Optional[GridStatus] = None
+        self._result_time: Optional[float] = None
+        self._waiters: Optional[list[Deferred[Optional[GridStatus]]]] = None
+
+    async def get(
+        self, max_age: float = GRID_STATUS_MAX_AGE
+    ) -> Optional[GridStatus]:
+        if (
+            self._result_time is not None
+            and self._clock() - self._result_time < max_age
+        ):
+            return self._result
+        if self._waiters is not None:
+            waiter: Deferred[Optional[GridStatus]] = Deferred()
+            self._waiters.append(waiter)
+            return await waiter
+        waiters = self._waiters = []
+        try:
+            result = await self._fetch()
+        except Exception:
+            failure = Failure()
+            self._waiters = None
+            for waiter in waiters:
+                waiter.errback(failure)
+            raise
+        self._waiters = None
+        self._result = result
+        self._result_time = self._clock()
+        for waiter in waiters:
+            waiter.callback(result)
+        return result
@@ -4,14 +4,28 @@ from __future__ import annotations
 import logging
 import os
 import platform
+import shutil
 import sys
+import threading
 import time
+from concurrent.futures import Executor
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Optional
+from functools import partial
+from itertools import tee
+from tempfile import TemporaryFile
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+)
 
 from atomicwrites import atomic_write
 from qtpy.QtCore import QObject, QSize, Qt, QThread, Signal
-from qtpy.QtGui import QFontDatabase, QIcon
+from qtpy.QtGui import QFontDatabase, QIcon, QTextCursor
 from qtpy.QtWidgets import (
     QCheckBox,
     QDialog,
@@ -19,6 +33,7 @@ from qtpy.QtWidgets import (
     QGridLayout,
     QMessageBox,
     QPlainTextEdit,
+    QProgressBar,
     QPushButton,
     QWidget,
 )
@@ -32,17 +47,21 @@ from gridsync import (
 )
 from gridsync.desktop import get_clipboard_modes, set_clipboard_text
 from gridsync.filter import (
-    apply_eliot_filters,
+    ELIOT_FILTER_WORKERS,
+    apply_eliot_filters_chunked,
     apply_filters,
     get_filters,
     get_mask,
+    make_eliot_filter_executor,
 )
 from gridsync.gui.widgets import HSpacer
-from gridsync.log import read_log
+from gridsync.log import LOG_CHUNK_SIZE, iter_log, log_size, log_writer
 from gridsync.msg import error
+from gridsync.profiler import startup_profiler
 
 if TYPE_CHECKING:
     from gridsync.core import Core
+    from gridsync.tahoe import Tahoe
 
 
 if sys.platform == "darwin":
@@ -57,6 +76,10 @@ elif sys.platform.startswith("linux"):
 else:
     system = platform.system()
 
+# The (approximate) number of bytes of logs to show in the viewer at first
+# and to add each time the viewer is scrolled to the bottom.
+PAGE_SIZE = 1_000_000
+
 
 def _make_header(core: Core) -> str:
     return f"""\
@@ -82,96 +105,317 @@ Datetime:     {datetime.now(timezone.utc).isoformat()}
 """
 
 
-def _format_log(log_name: str, content: str) -> str:
-    if content and not content.endswith("\n"):
-        content += "\n"
+def _log_begin(log_name: str) -> str:
     return (
         f"-------------------- Beginning of {log_name} --------------------\n"
-        f"{content}"
-        f"-------------------- End of {log_name} --------------------\n\n"
     )
 
 
+def _log_end(log_name: str) -> str:
+    return f"-------------------- End of {log_name} --------------------\n\n"
+
+
+def _format_log(log_name: str, content: str) -> str:
+    if content and not content.endswith("\n"):
+        content += "\n"
+    return _log_begin(log_name) + content + _log_end(log_name)
+
+
+def _filter_eliot_chunks(
+    chunks: Iterable[str],
+    gateway_id: str,
+    executor: Optional[Executor] = None,
+) -> Iterator[str]:
+    for filtered in apply_eliot_filters_chunked(chunks, gateway_id, executor):
+        yield filtered + "\n" if filtered else filtered
+
+
+class _LogSource(Protocol):
+    def get_log_size(self, log_name: str) -> int:
+        pass
+
+    def iter_log(self, log_name: str) -> Iterator[str]:
+        pass
+
+
+def _log_sources(gateway: Tahoe) -> list[tuple[str, _LogSource]]:
+    """
+    Return the processes whose logs are collected for ``gateway``, along
+    with the objects from which to read their logs.
+    """
+    return [
+        ("Tahoe-LAFS", gateway),
+        ("Magic-Folder", gateway.magic_folder),
+    ]
+
+
+class _LoadCancelled(Exception):
+    pass
+
+
 class LogLoader(QObject):
+    """
+    Assemble the debug information -- the header and the contents of each
+    of the logs -- in two renderings: one as-is and one with potentially
+    identifying information filtered out.
+
+    The logs are read, filtered, and written to a pair of temporary files
+    in chunks so that the amount of memory used doesn't depend upon the size
+    of the logs; the rendered content can then be read back a "page" at a
+    time (see ``read_page``) or copied elsewhere (see ``export``).
+
+    ``load`` is intended to be called in a separate thread; it reports its
+    progress, in bytes of logs processed, via ``progress_updated`` and can
+    be interrupted (from any thread) by calling ``cancel``. Once it emits
+    ``done``, the newly-loaded content replaces any previously-loaded
+    content only when ``swap_files`` is called (i.e., in the thread that
+    reads the content).
+    """
 
     done = Signal()
-
-    def __init__(self, core: Core) -> None:
+    cancelled = Signal()
+    failed = Signal(str)
+    progress_updated = Signal(int, int)  # bytes processed, total bytes
+
+    def __init__(
+        self,
+        core: Core,
+        chunk_size: int = LOG_CHUNK_SIZE,
+        eliot_filter_workers: int = ELIOT_FILTER_WORKERS,
+    ) -> None:
         super().__init__()
         self.core = core
-        self.content = ""
-        self.filtered_content = ""
+        self.chunk_size = chunk_size
+        self.eliot_filter_workers = eliot_filter_workers
+        self._files: dict[bool, IO[bytes]] = {}
+        self._sizes: dict[bool, int] = {}
+        self._loaded: Optional[
+            tuple[dict[bool, IO[bytes]], dict[bool, int]]
+        ] = None
+        self._cancel_requested = threading.Event()
+        self._bytes_processed = 0
+        self._bytes_total = 0
+
+    def cancel(self) -> None:
+        """
+        Stop loading logs (at the end of the current chunk).
+        """
+        self._cancel_requested.set()
+
+    def _advance(self, num_bytes: int) -> None:
+        if self._cancel_requested.is_set():
+            raise _LoadCancelled()
+        self._bytes_processed += num_bytes
+        self.progress_updated.emit(
+            min(self._bytes_processed, self._bytes_total), self._bytes_total
+        )
 
-    def load(self) -> None:
-        start_time = time.time()
-        self.content = _make_header(self.core) + _format_log(
-            f"{APP_NAME} log", read_log()
+    def _write(
+        self, files: dict[bool, IO[bytes]], raw: str, filtered: str
+    ) -> int:
+        # Returns the number of (unfiltered) bytes written
+        num_bytes = files[False].write(raw.encode("utf-8"))
+        files[True].write(filtered.encode("utf-8"))
+        return num_bytes
+
+    def _write_log(  # pylint: disable=too-many-arguments
+        self,
+        files: dict[bool, IO[bytes]],
+        title: str,
+        filtered_title: str,
+        chunks: Iterable[str],
+        filter_chunks: Callable[[Iterable[str]], Iterable[str]],
+        omit_if_empty: bool = True,
+    ) -> None:
+        """
+        Write the given chunks of a log, and the corresponding chunks
+        produced by ``filter_chunks``, preceded and followed by the
+        beginning and end markers of the log (respectively).
+        """
+        self._advance(0)
+        last_raw = ""
+        last_filtered = ""
+        raw_chunks, chunks_to_filter = tee(c for c in chunks if c)
+        if not omit_if_empty:
+            self._write(files, _log_begin(title), _log_begin(filtered_title))
+        for chunk, filtered in zip(
+            raw_chunks, filter_chunks(chunks_to_filter)
+        ):
+            if not last_raw and omit_if_empty:
+                self._write(
+                    files, _log_begin(title), _log_begin(filtered_title)
+                )
+            num_bytes = self._write(files, chunk, filtered)
+            last_raw = chunk
+            last_filtered = filtered or last_filtered
+            self._advance(num_bytes)
+        if not last_raw and omit_if_empty:
+            return  # Omit empty logs altogether
+        self._write(
+            files,
+            "" if not last_raw or last_raw.endswith("\n") else "\n",
+            "" if not last_filtered or last_filtered.endswith("\n") else "\n",
         )
+        self._write(files, _log_end(title), _log_end(filtered_title))
+
+    def _write_logs(
+        self, files: dict[bool, IO[bytes]], executor: Optional[Executor]
+    ) -> None:
         filters = get_filters(self.core)
-        self.filtered_content = apply_filters(self.content, filters)
-        for i, gateway in enumerate(self.core.gui.main_window.gateways):
+
+        def filter_chunk(chunk: str) -> str:
+            return apply_filters(chunk, filters)
+
+        def filter_chunks(chunks: Iterable[str]) -> Iterator[str]:
+            return map(filter_chunk, chunks)
+
+        # Wait (in this thread) for any queued lines to be written
+        log_writer.flush()
+        gateways = list(self.core.gui.main_window.gateways)
+        self._bytes_total = log_size()
+        for gateway in gateways:
+            for _, source in _log_sources(gateway):
+                for log_name in ("stdout", "stderr", "eliot"):
+                    self._bytes_total += source.get_log_size(log_name)
+
+        header = _make_header(self.core) + _format_log(
+            "startup profile", startup_profiler.summary()
+        )
+        self._write(files, header, filter_chunk(header))
+        app_log = f"{APP_NAME} log"
+        self._write_log(
+            files,
+            app_log,
+            app_log,
+            iter_log(chunk_size=self.chunk_size),
+            filter_chunks,
+            omit_if_empty=False,
+        )
+
+        for i, gateway in enumerate(gateways):
             gateway_id = str(i + 1)
             gateway_mask = get_mask(gateway.name, "GatewayName", gateway_id)
+            filter_eliot_chunks: Callable[
+                [Iterable[str]], Iterable[str]
+            ] = partial(
+                _filter_eliot_chunks, gateway_id=gateway_id, executor=executor
+            )
+
+            for process, source in _log_sources(gateway):
+                for log_name in ("stdout", "stderr", "eliot"):
+                    self._write_log(
+                        files,
+                        f"{gateway.name} {process} {log_name} log",
+                        f"{gateway_mask} {process} {log_name} log",
+                        source.iter_log(log_name),
+                        (
+                            filter_eliot_chunks
+                            if log_name == "eliot"
+                            else filter_chunks
+                        ),
+                    )
 
-            tahoe_stdout = gateway.get_log("stdout")
-            if tahoe_stdout:
-                self.content += _format_log(
-                    f"{gateway.name} Tahoe-LAFS stdout log", tahoe_stdout
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Tahoe-LAFS stdout log",
-                    apply_filters(tahoe_stdout, filters),
-                )
-            tahoe_stderr = gateway.get_log("stderr")
-            if tahoe_stderr:
-                self.content += _format_log(
-                    f"{gateway.name} Tahoe-LAFS stderr log", tahoe_stderr
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Tahoe-LAFS stderr log",
-                    apply_filters(tahoe_stderr, filters),
-                )
-            tahoe_eliot = gateway.get_log("eliot")
-            if tahoe_eliot:
-                self.content += _format_log(
-                    f"{gateway.name} Tahoe-LAFS eliot log", tahoe_eliot
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Tahoe-LAFS eliot log",
-                    apply_eliot_filters(tahoe_eliot, gateway_id),
-                )
-            magic_folder_stdout = gateway.magic_folder.get_log("stdout")
-            if magic_folder_stdout:
-                self.content += _format_log(
-                    f"{gateway.name} Magic-Folder stdout log",
-                    magic_folder_stdout,
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Magic-Folder stdout log",
-                    apply_filters(magic_folder_stdout, filters),
-                )
-            magic_folder_stderr = gateway.magic_folder.get_log("stderr")
-            if magic_folder_stderr:
-                self.content += _format_log(
-                    f"{gateway.name} Magic-Folder stderr log",
-                    magic_folder_stderr,
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Magic-Folder stderr log",
-                    apply_filters(magic_folder_stderr, filters),
-                )
-            magic_folder_eliot = gateway.magic_folder.get_log("eliot")
-            if magic_folder_eliot:
-                self.content += _format_log(
-                    f"{gateway.name} Magic-Folder eliot log",
-                    magic_folder_eliot,
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Magic-Folder eliot log",
-                    apply_eliot_filters(magic_folder_eliot, gateway_id),
-                )
+    def load(self) -> None:
+        start_time = time.time()
+        self._cancel_requested.clear()
+        self._bytes_processed = 0
+        self._bytes_total = 0
+        files: dict[bool, IO[bytes]] = {
+            False: TemporaryFile(),
+            True: TemporaryFile(),
+        }
+        executor = None
+        if self.eliot_filter_workers > 1:
+            executor = make_eliot_filter_executor(self.eliot_filter_workers)
+        try:
+            self._write_logs(files, executor)
+        except _LoadCancelled:
+            for f in files.values():
+                f.close()
+            logging.debug(
+                "Cancelled loading logs after %f seconds",
+                time.time() - start_time,
+            )
+            self.cancelled.emit()
+            return
+        except Exception as e:  # pylint: disable=broad-except
+            for f in files.values():
+                f.close()
+            logging.exception("Error loading logs")
+            self.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        sizes: dict[bool, int] = {}
+        for filtered, f in files.items():
+            f.flush()
+            sizes[filtered] = f.tell()
+        self._close_loaded()
+        self._loaded = (files, sizes)
         self.done.emit()
-        logging.debug("Loaded logs in %f seconds", time.time() - start_time)
+        logging.debug(
+            "Loaded logs (%i bytes) in %f seconds",
+            sizes[False],
+            time.time() - start_time,
+        )
+
+    def _close_loaded(self) -> None:
+        if self._loaded is not None:
+            for f in self._loaded[0].values():
+                f.close()
+            self._loaded = None
+
+    def swap_files(self) -> None:
+        """
+        Replace the previously-loaded content (if any) with the content
+        most recently loaded by ``load``.
+        """
+        if self._loaded is None:
+            return
+        old_files = self._files
+        self._files, self._sizes = self._loaded
+        self._loaded = None
+        for old_file in old_files.values():
+            old_file.close()
+
+    def size(self, filtered: bool) -> int:
+        """
+        Return the size, in bytes, of the loaded content.
+        """
+        return self._sizes.get(filtered, 0)
+
+    def read_page(
+        self,
+        filtered: bool,
+        offset: int = 0,
+        page_size: Optional[int] = None,
+    ) -> tuple[str, int]:
+        """
+        Read (approximately) ``page_size`` bytes of the loaded content,
+        starting from ``offset`` and ending at the end of a line. Return the
+        text along with the offset from which to read the next page.
+        """
+        f = self._files.get(filtered)
+        if f is None:
+            return "", 0
+        if page_size is None:
+            page_size = PAGE_SIZE
+        f.seek(offset)
+        data = f.read(page_size)
+        if len(data) == page_size:
+            data += f.readline()
+        return data.decode("utf-8", errors="replace"), offset + len(data)
+
+    def export(self, dest: str, filtered: bool) -> None:
+        """
+        Write the loaded content to ``dest``, atomically.
+        """
+        f = self._files.get(filtered)
+        with atomic_write(dest, mode="wb", overwrite=True) as out:
+            if f is not None:
+                f.seek(0)
+                shutil.copyfileobj(f, out, self.chunk_size)
 
 
 class DebugExporter(QDialog):
@@ -183,6 +427,9 @@ class DebugExporter(QDialog):
         self.log_loader_thread = QThread()
         self.log_loader.moveToThread(self.log_loader_thread)
         self.log_loader.done.connect(self.on_loaded)
+        self.log_loader.cancelled.connect(self.on_cancelled)
+        self.log_loader.failed.connect(self.on_failed)
+        self.log_loader.progress_updated.connect(self.on_progress_updated)
         self.log_loader_thread.started.connect(self.log_loader.load)
 
         self.setMinimumSize(800, 600)
@@ -198,6 +445,19 @@ class DebugExporter(QDialog):
         )
 
         self.scrollbar = self.plaintextedit.verticalScrollBar()
+        self.scrollbar.valueChanged.connect(self.on_scrollbar_value_changed)
+        # The offset (into the content currently being shown) from which
+        # the next page should be read, or None if no content is loaded
+        self._next_offset: Optional[int] = None
+        self._filtered = True
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel)
+        self.cancel_button.hide()
 
         self.reload_button = QPushButton("Reload")
         self.reload_button.clicked.connect(self.load)
@@ -241,9 +501,10 @@ class DebugExporter(QDialog):
         checkbox_layout.addWidget(self.filter_info_button, 1, 2)
 
         buttons_layout = QGridLayout()
-        buttons_layout.addWidget(self.reload_button, 1, 1)
-        buttons_layout.addWidget(self.copy_button, 1, 2)
-        buttons_layout.addWidget(self.export_button, 1, 3)
+        buttons_layout.addWidget(self.cancel_button, 1, 1)
+        buttons_layout.addWidget(self.reload_button, 1, 2)
+        buttons_layout.addWidget(self.copy_button, 1, 3)
+        buttons_layout.addWidget(self.export_button, 1, 4)
 
         bottom_layout = QGridLayout()
         bottom_layout.addLayout(checkbox_layout, 1, 1)
@@ -252,17 +513,45 @@ class DebugExporter(QDialog):
 
         layout = QGridLayout(self)
         layout.addWidget(self.plaintextedit, 1, 1)
-        layout.addLayout(bottom_layout, 2, 1)
+        layout.addWidget(self.progress_bar, 2, 1)
+        layout.addLayout(bottom_layout, 3, 1)
+
+    def _has_more_pages(self) -> bool:
+        return self._next_offset is not None and self._next_offset < (
+            self.log_loader.size(self._filtered)
+        )
+
+    def _append_page(self) -> None:
+        if self._next_offset is None:
+            return
+        text, self._next_offset = self.log_loader.read_page(
+            self._filtered, self._next_offset
+        )
+        cursor = QTextCursor(self.plaintextedit.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+
+    def _append_remaining_pages(self) -> None:
+        while self._has_more_pages():
+            self._append_page()
+
+    def on_scrollbar_value_changed(self, value: int) -> None:
+        # Only read (and show) more of the logs once the user has scrolled
+        # to the end of what is currently shown
+        if value >= self.scrollbar.maximum() and self._has_more_pages():
+            self._append_page()
 
     def on_checkbox_state_changed(self, state: int) -> None:
         scrollbar_position = self.scrollbar.value()
-        if state == Qt.Checked:
-            self.plaintextedit.setPlainText(self.log_loader.filtered_content)
-        else:
-            self.plaintextedit.setPlainText(self.log_loader.content)
+        self._filtered = state == Qt.Checked
+        text, self._next_offset = self.log_loader.read_page(self._filtered)
+        # Don't load more pages merely because of the jumping around below
+        self.scrollbar.blockSignals(True)
+        self.plaintextedit.setPlainText(text)
         # Needed on some platforms to maintain scroll step accuracy/consistency
         self.scrollbar.setValue(self.scrollbar.maximum())
         self.scrollbar.setValue(scrollbar_position)
+        self.scrollbar.blockSignals(False)
 
     def on_filter_info_button_clicked(self) -> None:
         msgbox = QMessageBox(self)
@@ -275,18 +564,61 @@ class DebugExporter(QDialog):
             msgbox.setText(self.filter_info_text)
         msgbox.show()
 
+    def _set_loading(self, loading: bool) -> None:
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(loading)
+        self.cancel_button.setVisible(loading)
+        self.reload_button.setEnabled(not loading)
+        self.copy_button.setEnabled(not loading)
+        self.export_button.setEnabled(not loading)
+
+    def on_progress_updated(self, processed: int, total: int) -> None:
+        if total:
+            self.progress_bar.setValue(int(processed / total * 100))
+
     def on_loaded(self) -> None:
+        # The previous content is replaced here, in the GUI thread, so that
+        # it isn't replaced while a page of it is being read (and so that
+        # ``_next_offset`` never points into content other than its own).
+        self.log_loader.swap_files()
         self.on_checkbox_state_changed(self.checkbox.checkState())
         self.log_loader_thread.quit()
         self.log_loader_thread.wait()
+        self._set_loading(False)
+
+    def _on_not_loaded(self, message: str) -> None:
+        self.log_loader_thread.quit()
+        self.log_loader_thread.wait()
+        self._set_loading(False)
+        if self._next_offset is None:  # Nothing was loaded previously
+            self.plaintextedit.setPlainText(message)
+            self.copy_button.setEnabled(False)
+            self.export_button.setEnabled(False)
+
+    def on_cancelled(self) -> None:
+        self._on_not_loaded("Loading cancelled.")
+
+    def on_failed(self, message: str) -> None:
+        self._on_not_loaded(f"Error loading logs: {message}")
+
+    def cancel(self) -> None:
+        if self.log_loader_thread.isRunning():
+            self.log_loader.cancel()
 
     def load(self) -> None:
         if self.log_loader_thread.isRunning():
             logging.warning("LogLoader thread is already running; returning")
             return
+        self._set_loading(True)
         self.log_loader_thread.start()
 
+    def reject(self) -> None:
+        # Don't keep loading logs in the background once the dialog closes
+        self.cancel()
+        super().reject()
+
     def copy_to_clipboard(self) -> None:
+        self._append_remaining_pages()
         for mode in get_clipboard_modes():
             set_clipboard_text(self.plaintextedit.toPlainText(), mode)
         self.close()
@@ -302,8 +634,7 @@ class DebugExporter(QDialog):
         if not dest:
             return
         try:
-            with atomic_write(dest, mode="w", overwrite=True) as f:
-                f.write(self.plaintextedit.toPlainText())
+            self.log_loader.export(dest, self._filtered)
         except Exception as e:  # pylint: disable=broad-except
             logging.error("%s: %s", type(e).__name__, str(e))
             error(self, "Error saving debug information", str(e))
@@ -3,21 +3,41 @@ from __future__ import annotations
 
 import os
 import time
-from typing import TYPE_CHECKING, Optional, cast
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Optional
 
 from humanize import naturalsize, naturaltime
-from qtpy.QtCore import QEvent, QFileInfo, QPoint, Qt, QTimer
-from qtpy.QtGui import QCursor, QIcon, QPixmap, QShowEvent
+from qtpy.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    QPoint,
+    QRect,
+    QRectF,
+    QSize,
+    Qt,
+    QTimer,
+)
+from qtpy.QtGui import (
+    QCursor,
+    QFontMetrics,
+    QIcon,
+    QImage,
+    QMouseEvent,
+    QPainter,
+    QPixmap,
+    QShowEvent,
+    QTextOption,
+)
 from qtpy.QtWidgets import (
     QAbstractItemView,
     QAction,
-    QFileIconProvider,
     QGridLayout,
-    QLabel,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMenu,
-    QPushButton,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QWidget,
 )
 
@@ -25,208 +45,364 @@ from gridsync import resource
 from gridsync.desktop import open_enclosing_folder, open_path
 from gridsync.gui.color import BlendedColor
 from gridsync.gui.font import Font
+from gridsync.gui.pixmap import icon_cache
 from gridsync.gui.status import StatusPanel
-from gridsync.gui.widgets import HSpacer
+from gridsync.gui.thumbnail import ThumbnailService, get_thumbnail_service
 
 if TYPE_CHECKING:
     from gridsync.gui import AbstractGui
     from gridsync.tahoe import Tahoe
 
+# The role with which to retrieve the HistoryItem of a given row
+HISTORY_ITEM_ROLE = Qt.UserRole
 
-class HistoryItemWidget(QWidget):
-    def __init__(
-        self, gateway: Tahoe, data: dict, parent: HistoryListWidget
-    ) -> None:
-        super().__init__(parent)
-        self.gateway = gateway
-        self.data = data
-        self._parent = parent
 
+class HistoryItem:
+    def __init__(self, data: dict) -> None:
+        self.data = data
         self.path = data.get("path", "Unknown")
-        self.filesize = data.get("size")
-        if self.filesize is None:
+        size = data.get("size")
+        if size is None:
             self.action = "Deleted"
-            self.filesize = 0
+            self.size = 0
         else:
             self.action = data.get("action", "Updated")
+            self.size = size
         self.mtime = data.get("last-updated", data.get("mtime", 0))
-        self._thumbnail_loaded = False
-
-        self.setAutoFillBackground(True)
-
         self.basename = os.path.basename(os.path.normpath(self.path))
-
-        self.setToolTip(
-            f"{self.path}\n\nSize: {naturalsize(self.filesize)}\n"
-            f"{self.action}: {time.ctime(self.mtime)}"
+        self.icon: Optional[QIcon] = None
+        self.thumbnail: Optional[QPixmap] = None
+        self.thumbnail_loaded = False
+
+    @property
+    def key(self) -> tuple[str, Optional[str]]:
+        return (self.path, self.data.get("member"))  # XXX
+
+    def details(self) -> str:
+        return "{} {}".format(
+            self.action.capitalize(),
+            naturaltime(int(time.time() - self.mtime)),
         )
 
-        self.icon = QLabel()
-        self.icon.setPixmap(
-            QFileIconProvider().icon(QFileInfo(self.path)).pixmap(48, 48)
+    def tooltip(self) -> str:
+        return (
+            f"{self.path}\n\nSize: {naturalsize(self.size)}\n"
+            f"{self.action}: {time.ctime(self.mtime)}"
         )
 
-        self.basename_label = QLabel(self.basename)
-        self.basename_label.setFont(Font(11))
 
-        self.details_label = QLabel()
-        self.details_label.setFont(Font(10))
-        palette = self.palette()
-        dimmer_grey = BlendedColor(
-            palette.text().color(), palette.base().color(), 0.6
-        ).name()
-        self.details_label.setStyleSheet("color: {}".format(dimmer_grey))
+class HistoryModel(QAbstractListModel):
+    """
+    The most recent file events, newest (by mtime) first.
 
-        self.button = QPushButton()
-        self.button.setIcon(QIcon(resource("dots-horizontal-triple.png")))
-        self.button.setStyleSheet("border: none;")
-        self.button.clicked.connect(self._parent.on_right_click)
-        self.button.hide()
+    Rows are kept in order by inserting each new item at its position (found
+    by bisection) rather than by re-sorting, and, if ``deduplicate`` is
+    ``True``, an earlier item for the same (path, member) is found through a
+    dict rather than by scanning every row. Adding an item thus costs about
+    the same however many rows there are.
+    """
 
-        layout = QGridLayout(self)
-        layout.addWidget(self.icon, 1, 1, 2, 2)
-        layout.addWidget(self.basename_label, 1, 3)
-        layout.addWidget(self.details_label, 2, 3)
-        layout.addItem(HSpacer(), 4, 4)
-        layout.addWidget(self.button, 1, 5, 2, 2)
-
-        self.update_text()
-        QTimer.singleShot(50, self.load_thumbnail)
-
-    def update_text(self) -> None:
-        self.details_label.setText(
-            "{} {}".format(
-                self.action.capitalize(),
-                naturaltime(int(time.time() - self.mtime)),
-            )
-        )
+    def __init__(
+        self,
+        deduplicate: bool = True,
+        max_items: int = 30,
+        parent: Optional[QObject] = None,
+        thumbnail_service: Optional[ThumbnailService] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.deduplicate = deduplicate
+        self.max_items = max_items
+        self.thumbnail_service = thumbnail_service
+        if thumbnail_service:
+            thumbnail_service.thumbnail_ready.connect(self._on_thumbnail_ready)
+        # Items whose thumbnails have been requested, by path
+        self._awaiting_thumbnails: dict[str, list[HistoryItem]] = {}
+        self._items: list[HistoryItem] = []
+        # The negated mtime of each item in self._items (and so in ascending
+        # order), for bisection
+        self._keys: list[float] = []
+        self._index: dict[tuple[str, Optional[str]], HistoryItem] = {}
+
+    def rowCount(self, parent: Optional[QModelIndex] = None) -> int:
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._items)
+
+    def item(self, row: int) -> Optional[HistoryItem]:
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    def _icon(self, item: HistoryItem) -> QIcon:
+        if item.icon is None:
+            item.icon = icon_cache.file_icon(item.path)
+        return item.icon
+
+    def data(
+        self, index: QModelIndex, role: int = Qt.DisplayRole
+    ) -> Optional[object]:
+        item = self.item(index.row()) if index.isValid() else None
+        if item is None:
+            return None
+        if role == Qt.DisplayRole:
+            return item.basename
+        if role == Qt.ToolTipRole:
+            return item.tooltip()
+        if role == Qt.DecorationRole:
+            return item.thumbnail or self._icon(item)
+        if role == HISTORY_ITEM_ROLE:
+            return item
+        return None
+
+    def _row(self, item: HistoryItem) -> Optional[int]:
+        key = -item.mtime
+        row = bisect_left(self._keys, key)
+        while row < len(self._items) and self._keys[row] == key:
+            if self._items[row] is item:
+                return row
+            row += 1
+        return None
+
+    def _remove_row(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        item = self._items.pop(row)
+        del self._keys[row]
+        self.endRemoveRows()
+        if self._index.get(item.key) is item:
+            del self._index[item.key]
 
-    def _do_load_thumbnail(self) -> None:
-        pixmap = QPixmap(self.path)
-        if not pixmap.isNull():
-            self.icon.setPixmap(
-                pixmap.scaled(
-                    48, 48, Qt.IgnoreAspectRatio, Qt.SmoothTransformation
-                )
-            )
+    def add_item(self, data: dict) -> None:
+        item = HistoryItem(data)
+        if self.deduplicate:
+            duplicate = self._index.get(item.key)
+            row = None if duplicate is None else self._row(duplicate)
+            if row is not None:
+                self._remove_row(row)
+        key = -item.mtime
+        row = bisect_left(self._keys, key)  # Newest on top
+        if row >= self.max_items:
+            return  # Older than everything else; it would be dropped anyway
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.insert(row, item)
+        self._keys.insert(row, key)
+        self.endInsertRows()
+        if self.deduplicate:
+            self._index[item.key] = item
+        while len(self._items) > self.max_items:
+            self._remove_row(len(self._items) - 1)
+
+    def load_thumbnail(self, row: int) -> None:
+        """
+        Request the thumbnail of the item at ``row`` (if it's an image) from
+        the thumbnail service, to be shown in place of its icon once ready.
+        """
+        item = self.item(row)
+        if item is None or item.thumbnail_loaded or not self.thumbnail_service:
+            return
+        item.thumbnail_loaded = True
+        self._awaiting_thumbnails.setdefault(item.path, []).append(item)
+        self.thumbnail_service.request(item.path)
 
-    def load_thumbnail(self) -> None:
-        if self.isVisible() and not self._thumbnail_loaded:
-            self._thumbnail_loaded = True
-            QTimer.singleShot(50, self._do_load_thumbnail)
+    def _on_thumbnail_ready(self, path: str, image: QImage) -> None:
+        items = self._awaiting_thumbnails.pop(path, [])
+        if not items:
+            return
+        pixmap = QPixmap.fromImage(image)
+        for item in items:
+            item.thumbnail = pixmap
+            row = self._row(item)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def refresh(self, first: int, last: int) -> None:
+        """
+        Signal that the (time-relative) details of the given rows changed.
+        """
+        if self._items:
+            last = min(last, len(self._items) - 1)
+            self.dataChanged.emit(self.index(first), self.index(last))
+
+
+class HistoryItemDelegate(QStyledItemDelegate):
+    """
+    Paint a HistoryItem as an icon (or thumbnail), its name and (beneath
+    that) what happened to it and when, and, while hovered over, a button
+    with which to show its context menu.
+    """
+
+    icon_size = 48
+    margin = 8
+    button_size = 24
+
+    def __init__(self, parent: HistoryListView) -> None:
+        super().__init__(parent)
+        self._parent = parent
+        self.basename_font = Font(11)
+        self.details_font = Font(10)
+        self.action_icon = QIcon(resource("dots-horizontal-triple.png"))
+        self.text_option = QTextOption(Qt.AlignLeft | Qt.AlignVCenter)
+        self.text_option.setWrapMode(QTextOption.NoWrap)
+
+    def sizeHint(
+        self, option: QStyleOptionViewItem, _index: QModelIndex
+    ) -> QSize:
+        return QSize(option.rect.width(), self.icon_size + 2 * self.margin)
+
+    def button_rect(self, rect: QRect) -> QRect:
+        size = self.button_size
+        return QRect(
+            rect.right() - self.margin - size,
+            rect.center().y() - size // 2,
+            size,
+            size,
+        )
 
-    def unhighlight(self) -> None:
-        self.button.hide()
-        palette = self.palette()
-        palette.setColor(self.backgroundRole(), self._parent.base_color)
-        self.setPalette(palette)
+    def paint(
+        self,
+        painter: QPainter,
+        option: QStyleOptionViewItem,
+        index: QModelIndex,
+    ) -> None:
+        item = index.data(HISTORY_ITEM_ROLE)
+        if not isinstance(item, HistoryItem):
+            return
+        rect = option.rect
+        palette = option.palette
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        painter.save()
+        if hovered:
+            painter.fillRect(rect, self._parent.highlighted_color)
+
+        icon_rect = QRect(
+            rect.x() + self.margin,
+            rect.y() + self.margin,
+            self.icon_size,
+            self.icon_size,
+        )
+        decoration = index.data(Qt.DecorationRole)
+        if isinstance(decoration, QPixmap):
+            painter.drawPixmap(icon_rect, decoration)
+        elif isinstance(decoration, QIcon):
+            decoration.paint(painter, icon_rect)
+
+        button_rect = self.button_rect(rect)
+        text_x = icon_rect.right() + self.margin
+        text_width = max(0, button_rect.left() - self.margin - text_x)
+        half_height = self.icon_size // 2
+
+        painter.setFont(self.basename_font)
+        painter.setPen(palette.text().color())
+        painter.drawText(
+            QRectF(text_x, icon_rect.y(), text_width, half_height),
+            QFontMetrics(self.basename_font).elidedText(
+                item.basename, Qt.ElideMiddle, text_width
+            ),
+            self.text_option,
+        )
+        painter.setFont(self.details_font)
+        painter.setPen(
+            BlendedColor(palette.text().color(), palette.base().color(), 0.6)
+        )
+        painter.drawText(
+            QRectF(
+                text_x, icon_rect.y() + half_height, text_width, half_height
+            ),
+            item.details(),
+            self.text_option,
+        )
 
-    def enterEvent(self, _: QEvent) -> None:
-        self.button.show()
-        palette = self.palette()
-        palette.setColor(self.backgroundRole(), self._parent.highlighted_color)
-        self.setPalette(palette)
-        if self._parent.highlighted and self._parent.highlighted is not self:
-            try:
-                self._parent.highlighted.unhighlight()
-            except RuntimeError:  # Object has been deleted
-                pass
-        self._parent.highlighted = self
+        if hovered:
+            self.action_icon.paint(painter, button_rect)
+        painter.restore()
 
 
-class HistoryListWidget(QListWidget):
+class HistoryListView(QListView):
     def __init__(
         self, gateway: Tahoe, deduplicate: bool = True, max_items: int = 30
     ) -> None:
         super().__init__()
         self.gateway = gateway
-        self.deduplicate = deduplicate
-        self.max_items = max_items
 
         palette = self.palette()
         self.base_color = palette.base().color()
         self.highlighted_color = BlendedColor(
             self.base_color, palette.highlight().color(), 0.88
         )  # Was #E6F1F7
-        self.highlighted: Optional[HistoryItemWidget] = None
 
-        self.action_icon = QIcon(resource("dots-horizontal-triple.png"))
+        self.history_model = HistoryModel(
+            deduplicate, max_items, self, get_thumbnail_service()
+        )
+        self.setModel(self.history_model)
+        self.delegate = HistoryItemDelegate(self)
+        self.setItemDelegate(self.delegate)
 
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.setFocusPolicy(Qt.NoFocus)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        # self.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.setSelectionMode(QAbstractItemView.NoSelection)
-        # self.setStyleSheet("QListWidget::item:hover { background: #E6F1F7 }")
         self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+
+        # Refresh the visible rows once a burst of insertions has finished,
+        # rather than after every one
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(50)
+        self._update_timer.timeout.connect(self.update_visible_items)
+        self.history_model.rowsInserted.connect(
+            lambda *args: self._update_timer.start()
+        )
 
         self.sb = self.verticalScrollBar()
 
-        self.sb.valueChanged.connect(self.update_visible_widgets)
-        self.itemDoubleClicked.connect(self.on_double_click)
+        self.sb.valueChanged.connect(self.update_visible_items)
+        self.doubleClicked.connect(self.on_double_click)
         self.customContextMenuRequested.connect(self.on_right_click)
 
-        self.gateway.monitor.check_finished.connect(
-            self.update_visible_widgets
-        )
+        self.gateway.monitor.check_finished.connect(self.update_visible_items)
 
         mf_monitor = self.gateway.magic_folder.monitor
         mf_monitor.file_added.connect(self._on_file_added)
         mf_monitor.file_modified.connect(self._on_file_modified)
         mf_monitor.file_removed.connect(self._on_file_removed)
 
-    def on_double_click(self, item: QListWidgetItem) -> None:
-        w = self.itemWidget(item)
-        if isinstance(w, HistoryItemWidget):
-            open_enclosing_folder(w.path)
+    def on_double_click(self, index: QModelIndex) -> None:
+        item = index.data(HISTORY_ITEM_ROLE)
+        if isinstance(item, HistoryItem):
+            open_enclosing_folder(item.path)
 
-    def on_right_click(self, position: QPoint) -> None:
+    def on_right_click(self, position: Optional[QPoint]) -> None:
         if not position:
             position = self.viewport().mapFromGlobal(QCursor.pos())
-        item = cast(QListWidgetItem, self.itemAt(position))
-        if not item:
-            return
-        widget = cast(HistoryItemWidget, self.itemWidget(item))
-        if not isinstance(widget, HistoryItemWidget):
+        index = self.indexAt(position)
+        item = index.data(HISTORY_ITEM_ROLE)
+        if not isinstance(item, HistoryItem):
             return
         menu = QMenu(self)
         open_file_action = QAction("Open file")
-        open_file_action.triggered.connect(lambda: open_path(widget.path))
+        open_file_action.triggered.connect(lambda: open_path(item.path))
         menu.addAction(open_file_action)
         open_folder_action = QAction("Open enclosing folder")
         open_folder_action.triggered.connect(
-            lambda: self.on_double_click(item)
+            lambda: self.on_double_click(index)
         )
         menu.addAction(open_folder_action)
         menu.exec_(self.viewport().mapToGlobal(position))
 
+    def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+        position = event.pos()
+        index = self.indexAt(position)
+        if index.isValid() and self.delegate.button_rect(
+            self.visualRect(index)
+        ).contains(position):
+            self.on_right_click(position)
+            return
+        super().mouseReleaseEvent(event)
+
     def add_item(self, data: dict) -> None:
-        duplicate = None
-        if self.deduplicate:
-            for i in range(self.count()):
-                widget = self.itemWidget(self.item(i))
-                if (
-                    widget
-                    and isinstance(widget, HistoryItemWidget)
-                    and widget.data["path"] == data["path"]
-                    and widget.data.get("member") == data.get("member")  # XXX
-                ):
-                    duplicate = i
-                    break
-        if duplicate is not None:
-            item = self.takeItem(duplicate)
-            if not item:
-                return  # Otherwise, mypy interprets item as an Optional below
-        else:
-            self.takeItem(self.max_items)
-            item = QListWidgetItem()
-        mtime = int(data.get("last-updated", data.get("mtime")))
-        self.insertItem(1 - mtime, item)  # Newest on top
-        custom_widget = HistoryItemWidget(self.gateway, data, self)
-        item.setSizeHint(custom_widget.sizeHint())
-        self.setItemWidget(item, custom_widget)
-        item.setText(str(mtime))
-        self.sortItems(Qt.DescendingOrder)  # Sort by mtime; newest on top
+        self.history_model.add_item(data)
 
     def _on_file_added(self, _: str, data: dict) -> None:
         # data["action"] = "added"  # XXX
@@ -240,23 +416,24 @@ class HistoryListWidget(QListWidget):
         # data["action"] = "removed"  # XXX
         self.add_item(data)
 
-    def update_visible_widgets(self) -> None:
+    def update_visible_items(self) -> None:
         if not self.isVisible():
             return
         rect = self.viewport().contentsRect()
         top = self.indexAt(rect.topLeft())
         if top.isValid():
             bottom = self.indexAt(rect.bottomLeft())
-            if not bottom.isValid():
-                bottom = self.model().index(self.count() - 1, 0)
-            for index in range(top.row(), bottom.row() + 1):
-                widget = self.itemWidget(self.item(index))
-                if widget and isinstance(widget, HistoryItemWidget):
-                    widget.update_text()
-                    widget.load_thumbnail()
+            last = (
+                bottom.row()
+                if bottom.isValid()
+                else self.history_model.rowCount() - 1
+            )
+            self.history_model.refresh(top.row(), last)
+            for row in range(top.row(), last + 1):
+                self.history_model.load_thumbnail(row)
 
     def showEvent(self, _: QShowEvent) -> None:
-        self.update_visible_widgets()
+        self.update_visible_items()
 
 
 class HistoryView(QWidget):
@@ -270,6 +447,6 @@ class HistoryView(QWidget):
         super().__init__()
         layout = QGridLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(HistoryListWidget(gateway, deduplicate, max_items))
+        layout.addWidget(HistoryListView(gateway, deduplicate, max_items))
         self.status_panel = StatusPanel(gateway, gui)
         layout.addWidget(self.status_panel)
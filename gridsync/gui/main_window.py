@@ -9,13 +9,21 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Coroutine, Generator, Optional, Union, cast
 
 from qtpy.QtCore import (
+    QEvent,
     QItemSelectionModel,
     QPropertyAnimation,
     QSize,
     Qt,
     QTimer,
 )
-from qtpy.QtGui import QCloseEvent, QIcon, QKeyEvent, QKeySequence, QShowEvent
+from qtpy.QtGui import (
+    QCloseEvent,
+    QHideEvent,
+    QIcon,
+    QKeyEvent,
+    QKeySequence,
+    QShowEvent,
+)
 from qtpy.QtWidgets import (
     QFileDialog,
     QGridLayout,
@@ -257,6 +265,7 @@ class MainWindow(QMainWindow):
                 self.central_widget.add_gateway(gateway)
                 self.combo_box.add_gateway(gateway)
                 self.gateways.append(gateway)
+                gateway.monitor.set_idle(not self.isVisible())
                 if gateway not in self.gui.core.gateways:
                     self.gui.core.gateways.append(gateway)  # XXX
                 gateway.newscap_checker.message_received.connect(
@@ -599,7 +608,22 @@ class MainWindow(QMainWindow):
             event.ignore()
             self.confirm_quit()
 
+    def _set_monitors_idle(self, idle: bool) -> None:
+        # Check for changes less frequently while nobody is looking
+        for gateway in self.gateways:
+            gateway.monitor.set_idle(idle)
+
+    def hideEvent(self, _: QHideEvent) -> None:
+        self._set_monitors_idle(True)
+
+    def changeEvent(self, event: QEvent) -> None:
+        if event.type() == QEvent.ActivationChange and self.isActiveWindow():
+            for gateway in self.gateways:
+                gateway.monitor.wake()
+        super().changeEvent(event)
+
     def showEvent(self, _: QShowEvent) -> None:
+        self._set_monitors_idle(False)
         if self.pending_news_message:
             gateway, title, message = self.pending_news_message
             self.pending_news_message = ()
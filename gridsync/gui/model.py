@@ -10,9 +10,9 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
 from humanize import naturalsize, naturaltime
-from qtpy.QtCore import QFileInfo, QSize, Qt, Slot
+from qtpy.QtCore import QSize, Qt, Slot
 from qtpy.QtGui import QColor, QIcon, QStandardItem, QStandardItemModel
-from qtpy.QtWidgets import QAction, QFileIconProvider, QToolBar
+from qtpy.QtWidgets import QAction, QToolBar
 
 if TYPE_CHECKING:
     from typing import Any
@@ -20,8 +20,8 @@ if TYPE_CHECKING:
     from gridsync.view import View
 
 from gridsync import config_dir, resource
-from gridsync.gui.pixmap import CompositePixmap
-from gridsync.magic_folder import MagicFolderStatus
+from gridsync.gui.pixmap import icon_cache
+from gridsync.magic_folder_monitor import MagicFolderStatus
 from gridsync.preferences import get_preference
 from gridsync.util import humanized_list
 
@@ -45,11 +45,10 @@ class Model(QStandardItemModel):
         self.icon_blank = QIcon()
         self.icon_up_to_date = QIcon(resource("checkmark.png"))
         self.icon_user = QIcon(resource("user.png"))
-        self.icon_folder = QFileIconProvider().icon(QFileInfo(config_dir))
-        composite_pixmap = CompositePixmap(
-            self.icon_folder.pixmap(256, 256), overlay=None, grayout=True
+        self.icon_folder = icon_cache.file_icon(config_dir)
+        self.icon_folder_gray = icon_cache.composite_icon(
+            config_dir, grayout=True
         )
-        self.icon_folder_gray = QIcon(composite_pixmap)
         self.icon_cloud = QIcon(resource("cloud-icon.png"))
         self.icon_action = QIcon(resource("dots-horizontal-triple.png"))
         self.icon_error = QIcon(resource("alert-circle-red.png"))
@@ -127,8 +126,7 @@ class Model(QStandardItemModel):
                 "Tried to add a folder (%s) that already exists", basename
             )
             return
-        composite_pixmap = CompositePixmap(self.icon_folder.pixmap(256, 256))
-        name = QStandardItem(QIcon(composite_pixmap), basename)
+        name = QStandardItem(icon_cache.composite_icon(config_dir), basename)
         name.setToolTip(path)
         status = QStandardItem()
         mtime = QStandardItem()
@@ -164,16 +162,14 @@ class Model(QStandardItemModel):
         items = self.findItems(folder_name)
         if items:
             folder_path = self.gateway.magic_folder.get_directory(folder_name)
+            overlay = resource(overlay_file) if overlay_file else None
             if folder_path:
-                folder_icon = QFileIconProvider().icon(QFileInfo(folder_path))
+                icon = icon_cache.composite_icon(folder_path, overlay)
             else:
-                folder_icon = self.icon_folder_gray
-            folder_pixmap = folder_icon.pixmap(256, 256)
-            if overlay_file:
-                pixmap = CompositePixmap(folder_pixmap, resource(overlay_file))
-            else:
-                pixmap = CompositePixmap(folder_pixmap)
-            items[0].setIcon(QIcon(pixmap))
+                icon = icon_cache.composite_icon(
+                    config_dir, overlay, grayout=True
+                )
+            items[0].setIcon(icon)
 
     def set_status_private(self, folder_name: str) -> None:
         self.update_folder_icon(folder_name)
@@ -298,9 +294,11 @@ class Model(QStandardItemModel):
         except IndexError:
             return
         if overlay_file:
-            folder_pixmap = self.icon_folder_gray.pixmap(256, 256)
-            pixmap = CompositePixmap(folder_pixmap, resource(overlay_file))
-            folder_item.setIcon(QIcon(pixmap))
+            folder_item.setIcon(
+                icon_cache.composite_icon(
+                    config_dir, resource(overlay_file), grayout=True
+                )
+            )
         else:
             folder_item.setIcon(self.icon_folder_gray)
         row = folder_item.row()
@@ -1,10 +1,26 @@
 # -*- coding: utf-8 -*-
+from __future__ import annotations
 
-from qtpy.QtCore import QRect, Qt
-from qtpy.QtGui import QBrush, QColor, QPainter, QPen, QPixmap
+import os
+from collections import OrderedDict
+from typing import Optional
+
+import attr
+from qtpy.QtCore import QFileInfo, QRect, Qt
+from qtpy.QtGui import QBrush, QColor, QIcon, QPainter, QPen, QPixmap
+from qtpy.QtWidgets import QFileIconProvider
 
 from gridsync import resource
 
+# The maximum number of icons (and, separately, of composited icons) to keep
+# in an IconCache
+ICON_CACHE_SIZE = 256
+
+# The suffixes of files whose icons can differ from those of other files
+# of the same type (e.g., because they're embedded in the file itself) and
+# which, therefore, must be looked up (and cached) individually.
+PER_FILE_ICON_SUFFIXES = frozenset({"app", "exe", "ico", "icns", "lnk", "url"})
+
 
 class Pixmap(QPixmap):
     def __init__(self, resource_filename: str, size: int = 0) -> None:
@@ -19,7 +35,10 @@ class Pixmap(QPixmap):
 
 class CompositePixmap(QPixmap):
     def __init__(
-        self, pixmap: QPixmap, overlay: str = None, grayout: bool = False
+        self,
+        pixmap: QPixmap,
+        overlay: Optional[str] = None,
+        grayout: bool = False,
     ) -> None:
         super().__init__()
         base_pixmap = QPixmap(pixmap)
@@ -88,3 +107,102 @@ class BadgedPixmap(QPixmap):
 
         painter.end()
         self.swap(base_pixmap)
+
+
+@attr.s
+class IconCacheStats:
+    """
+    :ivar hits: The number of lookups answered from the cache.
+
+    :ivar misses: The number of lookups that required an icon to be looked
+        up (with QFileIconProvider) or composited.
+    """
+
+    hits: int = attr.ib(default=0)
+    misses: int = attr.ib(default=0)
+
+
+class IconCache:
+    """
+    Memoize QFileIconProvider lookups, keyed by the suffix of the file
+    rather than by its path (except for directories, which can have icons
+    of their own, and the types in PER_FILE_ICON_SUFFIXES), as well as
+    icons composited from them with ``CompositePixmap``, keyed by their
+    base icon, overlay, grayout and size. Each kind of entry is bounded in
+    number, with the least-recently used ones evicted first.
+    """
+
+    def __init__(self, max_entries: int = ICON_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self.stats = IconCacheStats()
+        self._provider: Optional[QFileIconProvider] = None
+        self._icons: OrderedDict[tuple[str, str], QIcon] = OrderedDict()
+        self._composites: OrderedDict[
+            tuple[tuple[str, str], str, bool, int], QIcon
+        ] = OrderedDict()
+
+    @staticmethod
+    def _file_key(path: str) -> tuple[str, str]:
+        if os.path.isdir(path):
+            return ("dir", path)
+        suffix = os.path.splitext(path)[1].lstrip(".").lower()
+        if suffix in PER_FILE_ICON_SUFFIXES:
+            return ("path", path)
+        return ("suffix", suffix)
+
+    def _get(self, cache: OrderedDict, key: object) -> Optional[QIcon]:
+        icon = cache.get(key)
+        if icon is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        cache.move_to_end(key)
+        return icon
+
+    def _put(self, cache: OrderedDict, key: object, icon: QIcon) -> None:
+        cache[key] = icon
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    def file_icon(self, path: str) -> QIcon:
+        """
+        Return the icon (as provided by QFileIconProvider) for the file or
+        directory at ``path``.
+        """
+        key = self._file_key(path)
+        icon = self._get(self._icons, key)
+        if icon is None:
+            if self._provider is None:
+                self._provider = QFileIconProvider()
+            icon = self._provider.icon(QFileInfo(path))
+            self._put(self._icons, key, icon)
+        return icon
+
+    def composite_icon(
+        self,
+        path: str,
+        overlay: Optional[str] = None,
+        grayout: bool = False,
+        size: int = 256,
+    ) -> QIcon:
+        """
+        Return an icon made (with CompositePixmap) of the icon of the file or
+        directory at ``path``, rendered at ``size`` pixels, with the given
+        overlay (the path of an image) and/or grayout.
+        """
+        key = (self._file_key(path), overlay or "", grayout, size)
+        icon = self._get(self._composites, key)
+        if icon is None:
+            pixmap = self.file_icon(path).pixmap(size, size)
+            icon = QIcon(CompositePixmap(pixmap, overlay, grayout))
+            self._put(self._composites, key, icon)
+        return icon
+
+    def clear(self) -> None:
+        self._icons.clear()
+        self._composites.clear()
+
+
+# Shared by all views (so that, e.g., each gateway's Model and History view
+# don't each look up the same icons)
+icon_cache = IconCache()
@@ -20,7 +20,7 @@ from gridsync.gui.font import Font
 from gridsync.gui.menu import Menu
 from gridsync.gui.pixmap import Pixmap
 from gridsync.gui.widgets import HSpacer
-from gridsync.magic_folder import MagicFolderStatus
+from gridsync.magic_folder_monitor import MagicFolderStatus
 from gridsync.util import future_date
 
 
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from threading import Lock, get_ident
+from typing import Optional
+
+import attr
+from qtpy.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, Signal
+from qtpy.QtGui import QImage, QImageReader
+
+from gridsync import config_dir
+
+# The (width and height) of thumbnails, in pixels
+THUMBNAIL_SIZE = 48
+
+# The maximum total size of the thumbnails kept on disk. When exceeded, the
+# least-recently used thumbnails are removed until the total is below
+# THUMBNAIL_CACHE_LOW_WATER of this.
+THUMBNAIL_CACHE_MAX_BYTES = 50_000_000
+THUMBNAIL_CACHE_LOW_WATER = 0.8
+
+# The number of threads with which to generate thumbnails
+THUMBNAIL_THREADS = 2
+
+
+@attr.s
+class ThumbnailCacheStats:
+    """
+    :ivar hits: The number of thumbnails read from the on-disk cache.
+
+    :ivar misses: The number of thumbnails generated from source images.
+
+    :ivar evicted: The number of thumbnails removed from the on-disk cache.
+    """
+
+    hits: int = attr.ib(default=0)
+    misses: int = attr.ib(default=0)
+    evicted: int = attr.ib(default=0)
+
+
+class ThumbnailCache:
+    """
+    Thumbnails, stored as PNG files in ``directory`` and named after a hash
+    of the (path, size, mtime) of their source image (so that a modified
+    image gets a new thumbnail), with least-recently-used eviction once
+    their total size exceeds ``max_bytes``. Safe to use from multiple
+    threads.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        thumbnail_size: int = THUMBNAIL_SIZE,
+        max_bytes: int = THUMBNAIL_CACHE_MAX_BYTES,
+    ) -> None:
+        self.directory = directory
+        self.thumbnail_size = thumbnail_size
+        self.max_bytes = max_bytes
+        self.stats = ThumbnailCacheStats()
+        self._lock = Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _cache_path(self, path: str, st: os.stat_result) -> str:
+        key = f"{path}\0{st.st_size}\0{st.st_mtime_ns}\0{self.thumbnail_size}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.png")
+
+    def _entries(self) -> list[os.DirEntry]:
+        try:
+            with os.scandir(self.directory) as it:
+                return [e for e in it if e.name.endswith(".png")]
+        except OSError:
+            return []
+
+    def _add_bytes(self, num_bytes: int) -> bool:
+        # Returns True if the cache is now over budget
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(
+                    e.stat().st_size for e in self._entries()
+                )
+            else:
+                self._total_bytes += num_bytes
+            return self._total_bytes > self.max_bytes
+
+    def evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in self._entries():
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * THUMBNAIL_CACHE_LOW_WATER
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.stats.evicted += 1
+            self._total_bytes = total
+
+    def _generate(self, path: str) -> Optional[QImage]:
+        reader = QImageReader(path)
+        if not reader.canRead():
+            return None
+        # Let the decoder scale the image while reading it, where it can
+        # (e.g., for JPEGs), rather than decoding it at full size first.
+        reader.setScaledSize(QSize(self.thumbnail_size, self.thumbnail_size))
+        image = reader.read()
+        if image.isNull():
+            return None
+        if image.size() != QSize(self.thumbnail_size, self.thumbnail_size):
+            image = image.scaled(
+                self.thumbnail_size,
+                self.thumbnail_size,
+                Qt.IgnoreAspectRatio,
+                Qt.SmoothTransformation,
+            )
+        return image
+
+    def get(self, path: str) -> Optional[QImage]:
+        """
+        Return the thumbnail of the image at ``path``, reading it from the
+        cache if possible, or ``None`` if it isn't a (readable) image.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        cache_path = self._cache_path(path, st)
+        cached = QImage(cache_path)
+        if not cached.isNull():
+            with self._lock:
+                self.stats.hits += 1
+            try:
+                os.utime(cache_path)  # Mark as recently used
+            except OSError:
+                pass
+            return cached
+        image = self._generate(path)
+        if image is None:
+            return None
+        with self._lock:
+            self.stats.misses += 1
+        self._store(cache_path, image)
+        return image
+
+    def _store(self, cache_path: str, image: QImage) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{cache_path}.{get_ident()}.tmp"
+            if image.save(tmp_path, "PNG"):
+                os.replace(tmp_path, cache_path)
+                if self._add_bytes(os.path.getsize(cache_path)):
+                    self.evict()
+        except OSError as e:
+            logging.warning("Error caching thumbnail: %s", str(e))
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, service: ThumbnailService, path: str) -> None:
+        super().__init__()
+        self._service = service
+        self._path = path
+
+    def run(self) -> None:
+        try:
+            image = self._service.cache.get(self._path)
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning("Error generating thumbnail: %s", str(e))
+            image = None
+        self._service.on_task_finished(self._path, image)
+
+
+class ThumbnailService(QObject):
+    """
+    Generate (or read from a ThumbnailCache) thumbnails in a pool of worker
+    threads, emitting ``thumbnail_ready`` (with the path of the source image
+    and the thumbnail, as a QImage) in the main thread for each one.
+
+    Concurrent requests for the same path are only processed once, and
+    paths which turn out not to be images are remembered (for the lifetime
+    of the service) so that they aren't read again.
+    """
+
+    thumbnail_ready = Signal(str, QImage)
+
+    def __init__(
+        self, cache: ThumbnailCache, max_threads: int = THUMBNAIL_THREADS
+    ) -> None:
+        super().__init__()
+        self.cache = cache
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._lock = Lock()
+        self._pending: set[str] = set()
+        self._not_images: set[str] = set()
+
+    def request(self, path: str) -> None:
+        with self._lock:
+            if path in self._pending or path in self._not_images:
+                return
+            self._pending.add(path)
+        self._pool.start(_ThumbnailTask(self, path))
+
+    def on_task_finished(self, path: str, image: Optional[QImage]) -> None:
+        # Called from a worker thread
+        with self._lock:
+            self._pending.discard(path)
+            if image is None:
+                self._not_images.add(path)
+        if image is not None:
+            self.thumbnail_ready.emit(path, image)
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self._pool.waitForDone(msecs)
+
+
+_thumbnail_service: Optional[ThumbnailService] = None
+
+
+def get_thumbnail_service() -> ThumbnailService:
+    """
+    Return the ThumbnailService shared by all views, caching thumbnails in
+    the "thumbnails" directory of the config dir.
+    """
+    global _thumbnail_service  # pylint: disable=global-statement
+    if _thumbnail_service is None:
+        _thumbnail_service = ThumbnailService(
+            ThumbnailCache(os.path.join(config_dir, "thumbnails"))
+        )
+    return _thumbnail_service
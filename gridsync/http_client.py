@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING, Hashable, Optional, cast
+
+import attr
+import treq
+from twisted.internet.defer import Deferred, inlineCallbacks
+from twisted.internet.interfaces import IReactorTime
+from twisted.web.client import HTTPConnectionPool
+
+if TYPE_CHECKING:
+    from twisted.internet.interfaces import IStreamClientEndpoint
+    from twisted.web.iweb import IResponse
+
+    from gridsync.types import TwistedDeferred
+
+# Both the Tahoe-LAFS node and the Magic-Folder daemon listen on 127.0.0.1,
+# so each "host" here is one of the local APIs of a single gateway. Several
+# requests to the same API can be in flight at once (e.g., one file-status
+# request per magic-folder), so allow more idle connections than Twisted's
+# default of 2 and keep them around for a while since the Monitor polls
+# these APIs every few seconds.
+MAX_PERSISTENT_PER_HOST = 8
+CACHED_CONNECTION_TIMEOUT = 120
+
+
+@attr.s
+class HTTPClientStats:
+    """
+    :ivar requests: The number of requests that have been made.
+
+    :ivar failures: The number of requests that failed to produce a response
+        (e.g., because the connection was refused).
+
+    :ivar connections_created: The number of new connections that were
+        opened in order to make a request.
+
+    :ivar connections_reused: The number of requests that were made over an
+        already-established (idle, persistent) connection.
+
+    :ivar total_latency: The total number of seconds spent waiting for the
+        responses to all requests.
+    """
+
+    requests: int = attr.ib(default=0)
+    failures: int = attr.ib(default=0)
+    connections_created: int = attr.ib(default=0)
+    connections_reused: int = attr.ib(default=0)
+    total_latency: float = attr.ib(default=0.0)
+
+    @property
+    def average_latency(self) -> float:
+        if not self.requests:
+            return 0.0
+        return self.total_latency / self.requests
+
+
+class _CountingConnectionPool(HTTPConnectionPool):
+    def __init__(self, reactor: IReactorTime, stats: HTTPClientStats) -> None:
+        super().__init__(reactor, persistent=True)
+        self.stats = stats
+
+    def getConnection(
+        self, key: Hashable, endpoint: IStreamClientEndpoint
+    ) -> Deferred:
+        if self._connections.get(key):
+            self.stats.connections_reused += 1
+        else:
+            self.stats.connections_created += 1
+        return super().getConnection(key, endpoint)
+
+
+class HTTPClient:
+    """
+    A client for the local HTTP APIs of a single gateway (i.e., those of its
+    Tahoe-LAFS node and Magic-Folder daemon) that keeps connections alive
+    between requests in a persistent connection pool.
+
+    The ``get``, ``post``, ``put``, and ``request`` methods accept the same
+    arguments as the equivalently-named ``treq`` functions.
+    """
+
+    def __init__(
+        self,
+        reactor: Optional[IReactorTime] = None,
+        max_persistent_per_host: int = MAX_PERSISTENT_PER_HOST,
+        cached_connection_timeout: int = CACHED_CONNECTION_TIMEOUT,
+    ) -> None:
+        if reactor is None:
+            from twisted.internet import reactor as reactor_
+
+            reactor = cast(IReactorTime, reactor_)
+        self.stats = HTTPClientStats()
+        self.pool = _CountingConnectionPool(reactor, self.stats)
+        self.pool.maxPersistentPerHost = max_persistent_per_host
+        self.pool.cachedConnectionTimeout = cached_connection_timeout
+
+    @inlineCallbacks
+    def _timed(
+        self, method: str, *args: object, **kwargs: object
+    ) -> TwistedDeferred[IResponse]:
+        self.stats.requests += 1
+        start = monotonic()
+        try:
+            resp = yield getattr(treq, method)(*args, pool=self.pool, **kwargs)
+        except Exception:
+            self.stats.failures += 1
+            raise
+        finally:
+            self.stats.total_latency += monotonic() - start
+        return resp
+
+    def request(
+        self, method: str, url: str, *args: object, **kwargs: object
+    ) -> Deferred[IResponse]:
+        return self._timed("request", method, url, *args, **kwargs)
+
+    def get(
+        self, url: str, *args: object, **kwargs: object
+    ) -> Deferred[IResponse]:
+        return self._timed("get", url, *args, **kwargs)
+
+    def post(
+        self, url: str, *args: object, **kwargs: object
+    ) -> Deferred[IResponse]:
+        return self._timed("post", url, *args, **kwargs)
+
+    def put(
+        self, url: str, *args: object, **kwargs: object
+    ) -> Deferred[IResponse]:
+        return self._timed("put", url, *args, **kwargs)
+
+    @inlineCallbacks
+    def close(self) -> TwistedDeferred[None]:
+        """
+        Close all of the idle connections in the pool.
+        """
+        logging.debug("Closing HTTP connections; %s", self.stats)
+        yield self.pool.closeCachedConnections()
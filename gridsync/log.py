@@ -1,10 +1,16 @@
+import atexit
+import json
 import logging
 import sys
+import threading
 from datetime import datetime, timezone
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Optional, Union
+from queue import Empty, Full, Queue
+from time import monotonic
+from typing import Iterator, Optional, Union
 
+import attr
 from twisted.python.log import PythonLoggingObserver, startLogging
 
 from gridsync import APP_NAME, config_dir, settings
@@ -21,6 +27,17 @@ else:
 LOGGING_ENABLED = to_bool(_logging_settings.get("enabled", "false"))
 LOGGING_MAX_BYTES = int(_logging_settings.get("max_bytes", 10_000_000))
 LOGGING_BACKUP_COUNT = int(_logging_settings.get("backup_count", 1))
+# The stdout, stderr, and eliot logs of the Tahoe-LAFS and Magic-Folder
+# processes are written from a background thread in batches; at most
+# LOGGING_QUEUE_SIZE lines may be waiting to be written at once (any more
+# are dropped), and queued lines are written (and flushed to disk) after at
+# most LOGGING_FLUSH_INTERVAL seconds or LOGGING_BATCH_SIZE lines.
+LOGGING_QUEUE_SIZE = int(_logging_settings.get("queue_size", 100_000))
+LOGGING_BATCH_SIZE = int(_logging_settings.get("batch_size", 1000))
+LOGGING_FLUSH_INTERVAL = float(_logging_settings.get("flush_interval", 1.0))
+# The (approximate) number of bytes to read at a time when reading logs in
+# chunks (e.g., to filter and export them).
+LOG_CHUNK_SIZE = 1_000_000
 
 
 class LogFormatter(logging.Formatter):
@@ -30,12 +47,28 @@ class LogFormatter(logging.Formatter):
         return datetime.now(timezone.utc).isoformat()
 
 
+class BatchingRotatingFileHandler(RotatingFileHandler):
+    """
+    A ``RotatingFileHandler`` that doesn't flush its stream after every
+    record but only when ``flush_batch`` is called (i.e., by the
+    ``LogWriter``, after writing each batch of records).
+    """
+
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+
 def make_file_logger(
     name: Optional[str] = None,
     max_bytes: int = LOGGING_MAX_BYTES,
     backup_count: int = LOGGING_BACKUP_COUNT,
     fmt: Optional[str] = "%(asctime)s %(levelname)s %(funcName)s %(message)s",
     use_null_handler: bool = False,
+    *,
+    batching: bool = False,
 ) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
@@ -49,6 +82,12 @@ def make_file_logger(
     handler: Union[logging.NullHandler, RotatingFileHandler]
     if use_null_handler or not LOGGING_ENABLED:
         handler = logging.NullHandler()
+    elif batching:
+        handler = BatchingRotatingFileHandler(
+            Path(LOGS_PATH, f"{name}.log"),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+        )
     else:
         handler = RotatingFileHandler(
             Path(LOGS_PATH, f"{name}.log"),
@@ -89,13 +128,266 @@ def read_log(path: Optional[Path] = None) -> str:
         return ""
 
 
+def log_size(path: Optional[Path] = None) -> int:
+    if path is None:
+        path = Path(LOGS_PATH, f"{APP_NAME}.log")
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def iter_log(
+    path: Optional[Path] = None, chunk_size: int = LOG_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Yield the contents of the log at ``path`` in chunks of (approximately)
+    ``chunk_size`` bytes, each of which consists only of whole lines.
+    """
+    if path is None:
+        path = Path(LOGS_PATH, f"{APP_NAME}.log")
+    try:
+        with path.open(encoding="utf-8") as f:
+            while True:
+                lines = f.readlines(chunk_size)
+                if not lines:
+                    return
+                yield "".join(lines)
+    except FileNotFoundError:
+        return
+
+
+def canonicalize_json(message: str) -> Optional[str]:
+    """
+    Return the given JSON-encoded message re-encoded with sorted keys, or
+    ``None`` if it isn't valid JSON.
+    """
+    try:
+        return json.dumps(json.loads(message), sort_keys=True)
+    except json.decoder.JSONDecodeError:
+        logging.warning("Error decoding JSON message: %s", message)
+        return None
+
+
+@attr.s
+class LogWriterStats:
+    """
+    :ivar queued: The number of lines that have been queued for writing.
+
+    :ivar dropped: The number of lines that were discarded because too many
+        lines were already waiting to be written.
+
+    :ivar written: The number of lines that have been written.
+
+    :ivar invalid: The number of lines that were discarded because they were
+        supposed to contain JSON but didn't.
+
+    :ivar batches: The number of batches in which lines have been written.
+    """
+
+    queued: int = attr.ib(default=0)
+    dropped: int = attr.ib(default=0)
+    written: int = attr.ib(default=0)
+    invalid: int = attr.ib(default=0)
+    batches: int = attr.ib(default=0)
+
+
+# A queued line: the logger to which to write it, the line itself, and
+# whether or not the line should be canonicalized as JSON first.
+_Record = tuple[logging.Logger, str, bool]
+
+
+class LogWriter:
+    """
+    Write lines to loggers from a background thread so that the (possibly
+    very large number of) lines emitted by the Tahoe-LAFS and Magic-Folder
+    processes don't block the reactor/Qt thread on file I/O and JSON
+    re-encoding.
+
+    Lines are written in batches of up to ``batch_size`` lines, with each
+    batch being flushed to disk at once, after which the thread waits for at
+    most ``flush_interval`` seconds for the next batch to fill up.
+
+    Once stopped, a LogWriter drops any further lines.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = LOGGING_QUEUE_SIZE,
+        batch_size: int = LOGGING_BATCH_SIZE,
+        flush_interval: float = LOGGING_FLUSH_INTERVAL,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = LogWriterStats()
+        self._queue: Queue[Union[_Record, threading.Event, None]] = Queue(
+            queue_size
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._lock = threading.Lock()
+        # Guards self.stats, which both the writing thread and the threads
+        # calling ``write`` update.
+        self._stats_lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of lines currently waiting to be written.
+        """
+        return self._queue.qsize()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._stopped:
+                thread = threading.Thread(
+                    target=self._run, name="LogWriter", daemon=True
+                )
+                thread.start()
+                self._thread = thread
+
+    def write(
+        self, logger: logging.Logger, message: str, is_json: bool = False
+    ) -> None:
+        """
+        Queue ``message`` to be written to ``logger``, dropping it if the
+        queue is full. If ``is_json`` is ``True``, the message will be
+        re-encoded (in the background) with sorted keys.
+        """
+        if self._stopped:
+            with self._stats_lock:
+                self.stats.dropped += 1
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((logger, message, is_json))
+        except Full:
+            with self._stats_lock:
+                self.stats.dropped += 1
+            return
+        with self._stats_lock:
+            self.stats.queued += 1
+
+    def _next_batch(self) -> list[Union[_Record, threading.Event, None]]:
+        item = self._queue.get()
+        batch = [item]
+        deadline = monotonic() + self.flush_interval
+        while isinstance(item, tuple) and len(batch) < self.batch_size:
+            timeout = deadline - monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _write_batch(
+        self, batch: list[Union[_Record, threading.Event, None]]
+    ) -> bool:
+        handlers: set[logging.Handler] = set()
+        stop = False
+        written = 0
+        invalid = 0
+        for item in batch:
+            if item is None:
+                stop = True
+            elif isinstance(item, threading.Event):
+                continue
+            else:
+                logger, message, is_json = item
+                if is_json:
+                    canonical = canonicalize_json(message)
+                    if canonical is None:
+                        invalid += 1
+                        continue
+                    message = canonical
+                logger.debug(message)
+                handlers.update(logger.handlers)
+                written += 1
+        for handler in handlers:
+            if isinstance(handler, BatchingRotatingFileHandler):
+                handler.flush_batch()
+        with self._stats_lock:
+            self.stats.written += written
+            self.stats.invalid += invalid
+            self.stats.batches += 1
+        for item in batch:
+            if isinstance(item, threading.Event):
+                item.set()
+        return stop
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                stop = self._write_batch(batch)
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("Error writing log batch")
+                stop = False
+            if stop:
+                return
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Block until all of the lines queued so far have been written, or
+        until ``timeout`` seconds have passed. Return whether or not the
+        lines were written.
+
+        Since this may block, it shouldn't be called from the reactor/Qt
+        thread.
+        """
+        if self._thread is None:
+            return True
+        if self._stopped:
+            return self.pending == 0
+        event = threading.Event()
+        try:
+            self._queue.put(event, timeout=timeout)
+        except Full:
+            return False
+        return event.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Write any queued lines and stop the background thread.
+        """
+        with self._lock:
+            if self._stopped:
+                return
+            # Set before the thread is told to stop so that a concurrent
+            # call to ``write`` can't start another thread.
+            self._stopped = True
+            thread = self._thread
+        if thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except Full:
+            return
+        thread.join(timeout)
+        logging.debug("Stopped log writer; %s", self.stats)
+
+
+log_writer = LogWriter()
+atexit.register(log_writer.stop)
+
+
 class MultiFileLogger:
-    def __init__(self, basename: str) -> None:
+    def __init__(self, basename: str, writer: LogWriter = log_writer) -> None:
         self.basename = basename
+        self.writer = writer
         self._loggers: dict[str, logging.Logger] = {}
 
     def log(
-        self, logger_name: str, message: str, omit_fmt: bool = False
+        self,
+        logger_name: str,
+        message: str,
+        omit_fmt: bool = False,
+        is_json: bool = False,
     ) -> None:
         if not LOGGING_ENABLED:
             return
@@ -103,23 +395,56 @@ class MultiFileLogger:
         logger = self._loggers.get(name)
         if not logger:
             if omit_fmt:
-                logger = make_file_logger(name, fmt=None)
+                logger = make_file_logger(name, fmt=None, batching=True)
             else:
-                logger = make_file_logger(name)
+                logger = make_file_logger(name, batching=True)
             self._loggers[name] = logger
-        logger.debug(message)
+        self.writer.write(logger, message, is_json)
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    # The following read the logs as written so far, without waiting for
+    # queued lines to be written (see ``flush``).
 
     def read_log(self, logger_name: str) -> str:
         return read_log(Path(LOGS_PATH, f"{self.basename}.{logger_name}.log"))
 
+    def log_size(self, logger_name: str) -> int:
+        return log_size(Path(LOGS_PATH, f"{self.basename}.{logger_name}.log"))
+
+    def iter_log(
+        self, logger_name: str, chunk_size: int = LOG_CHUNK_SIZE
+    ) -> Iterator[str]:
+        return iter_log(
+            Path(LOGS_PATH, f"{self.basename}.{logger_name}.log"), chunk_size
+        )
+
 
 class NullLogger:
     def log(
-        self, logger_name: str, message: str, omit_fmt: bool = False
+        self,
+        logger_name: str,
+        message: str,
+        omit_fmt: bool = False,
+        is_json: bool = False,
     ) -> None:
         pass
 
+    def flush(self) -> None:
+        pass
+
     def read_log(  # pylint: disable=unused-argument
         self, logger_name: str
     ) -> str:
         return ""
+
+    def log_size(  # pylint: disable=unused-argument
+        self, logger_name: str
+    ) -> int:
+        return 0
+
+    def iter_log(  # pylint: disable=unused-argument
+        self, logger_name: str, chunk_size: int = LOG_CHUNK_SIZE
+    ) -> Iterator[str]:
+        return iter(())
@@ -0,0 +1,535 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from enum import Enum, auto
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import attr
+from qtpy.QtCore import QObject, Signal
+from twisted.internet.defer import Deferred, DeferredList, DeferredLock
+
+if TYPE_CHECKING:
+    from qtpy.QtCore import SignalInstance
+
+    from gridsync.magic_folder import (  # pylint: disable=cyclic-import
+        MagicFolder,
+    )
+
+from gridsync.scheduler import CoalescingScheduler
+from gridsync.watchdog import Watchdog
+from gridsync.websocket import WebSocketReaderService
+
+# The number of seconds for which filesystem events for a folder must stop
+# before that folder is scanned, and the maximum number of seconds by which
+# a continuous stream of events (e.g., while a large file is being copied
+# into the folder) can delay that scan.
+SCAN_DELAY = 0.25
+SCAN_MAX_WAIT = 2.0
+
+# The number of seconds to wait before polling a folder that has never been
+# polled (repeated requests in the meantime are coalesced into one poll).
+POLL_DELAY = 1.0
+
+
+class MagicFolderStatus(Enum):
+    LOADING = auto()
+    SYNCING = auto()
+    UP_TO_DATE = auto()
+    ERROR = auto()
+    STORED_REMOTELY = auto()
+    WAITING = auto()
+
+
+@attr.s
+class _OperationIndex:
+    """
+    The (upload or download) operations in progress, by folder and relpath,
+    along with the signals to emit as operations start and finish.
+    """
+
+    operations: dict[str, dict[str, dict]] = attr.ib()
+    started: SignalInstance = attr.ib()
+    finished: SignalInstance = attr.ib()
+
+
+class MagicFolderMonitor(QObject):
+
+    status_message_received = Signal(dict)
+
+    sync_progress_updated = Signal(str, object, object)  # folder, cur, total
+
+    upload_started = Signal(str, str, dict)  # folder_name, relpath, data
+    upload_finished = Signal(str, str, dict)  # folder_name, relpath, data
+    download_started = Signal(str, str, dict)  # folder_name, relpath, data
+    download_finished = Signal(str, str, dict)  # folder_name, relpath, data
+    files_updated = Signal(str, list)  # folder_name, relpaths
+
+    error_occurred = Signal(str, str, int)  # folder_name, summary, timestamp
+
+    folder_added = Signal(str)  # folder_name
+    folder_removed = Signal(str)  # folder_name
+    folder_mtime_updated = Signal(str, int)  # folder_name, mtime
+    folder_size_updated = Signal(str, object)  # folder_name, size
+    folder_status_changed = Signal(str, object)  # folder_name, status
+
+    backup_added = Signal(str)  # folder_name
+    backup_removed = Signal(str)  # folder_name
+
+    file_added = Signal(str, dict)  # folder_name, status
+    file_removed = Signal(str, dict)  # folder_name, status
+    file_mtime_updated = Signal(str, dict)  # folder_name, status
+    file_size_updated = Signal(str, dict)  # folder_name, status
+    file_modified = Signal(str, dict)  # folder_name, status
+
+    overall_status_changed = Signal(object)  # MagicFolderStatus
+    total_folders_size_updated = Signal(object)  # "object" avoids overflows
+
+    def __init__(self, magic_folder: MagicFolder) -> None:
+        super().__init__()
+        self.magic_folder = magic_folder
+
+        self._ws_reader: Optional[WebSocketReaderService] = None
+        self.running: bool = False
+        self.errors: list = []
+
+        self._prev_state: dict = {}
+        self._known_folders: dict[str, dict] = {}
+        self._known_backups: list[str] = []
+
+        self._file_index: dict[str, dict[str, dict]] = {}
+        self._file_index_locks: dict[str, DeferredLock] = {}
+        self._folder_sizes: dict[str, int] = {}
+        self._folder_mtimes: dict[str, int] = {}
+        self._folder_statuses: dict[str, MagicFolderStatus] = {}
+        self._total_folders_size: int = 0
+
+        self._uploads: dict[str, dict[str, dict]] = {}
+        self._downloads: dict[str, dict[str, dict]] = {}
+        self._operations_queued: defaultdict[str, set] = defaultdict(set)
+        self._operations_completed: defaultdict[str, dict] = defaultdict(dict)
+        self._upload_index = _OperationIndex(
+            self._uploads, self.upload_started, self.upload_finished
+        )
+        self._download_index = _OperationIndex(
+            self._downloads, self.download_started, self.download_finished
+        )
+
+        self._watchdog = Watchdog()
+        self._watchdog.path_modified.connect(self._schedule_magic_folder_scan)
+        # Watchdog emits the root passed to ``add_watch``, so the folder can
+        # be found without classifying the path again.
+        self._folder_paths: dict[str, str] = {}
+        self._scan_scheduler: CoalescingScheduler[str] = CoalescingScheduler(
+            self._do_scan, SCAN_DELAY, SCAN_MAX_WAIT
+        )
+        self._poll_scheduler: CoalescingScheduler[str] = CoalescingScheduler(
+            self._do_poll, POLL_DELAY
+        )
+
+        self._overall_status: MagicFolderStatus = MagicFolderStatus.LOADING
+
+    @property
+    def overall_status(self) -> MagicFolderStatus:
+        return self._overall_status
+
+    def _do_scan(self, folder_name: str) -> None:
+        # XXX Something should handle errors
+        Deferred.fromCoroutine(self.magic_folder.scan(folder_name))
+
+    def _schedule_magic_folder_scan(self, path: str) -> None:
+        folder_name = self._folder_paths.get(path)
+        if folder_name is None:
+            logging.debug("Ignoring event for unknown folder path %s", path)
+            return
+        self._scan_scheduler.schedule(folder_name)
+
+    def _do_poll(self, folder_name: str) -> None:
+        # XXX Something should handle errors
+        Deferred.fromCoroutine(self.magic_folder.poll(folder_name))
+
+    def _schedule_magic_folder_poll(self, folder_name: str) -> None:
+        self._poll_scheduler.schedule(folder_name)
+
+    def _check_folder_errors(
+        self, folder: str, current_errors: list, prev_errors: list
+    ) -> None:
+        for error in current_errors:
+            if error not in prev_errors:
+                summary = error.get("summary", "")
+                timestamp = error.get("timestamp", 0)
+                self.error_occurred.emit(folder, summary, timestamp)
+                # XXX There is presently no way to "clear" (or
+                # acknowledge the receipt of) Magic-Folder errors
+                # so this will persist indefinitely...
+                # (Copied, so that the error still compares equal to
+                # the same error in the next status message.)
+                self.errors.append(dict(error, folder=folder))
+
+    def _update_operations(
+        self, folder: str, operations: list[dict], index: _OperationIndex
+    ) -> bool:
+        """
+        Apply the given list of (upload or download) operations for a single
+        folder to the indexed operations for that folder, emitting the
+        index's started/finished signals for any operations that were added
+        or removed since the last update.
+
+        :return: ``True`` if any operations started or finished.
+        """
+        current = {op["relpath"]: op for op in operations}
+        previous = index.operations.get(folder, {})
+        changed = False
+        for relpath, data in current.items():
+            if relpath not in previous:
+                changed = True
+                self._operations_queued[folder].add(relpath)
+                index.started.emit(folder, relpath, data)
+        for relpath, data in previous.items():
+            if relpath not in current:
+                changed = True
+                # XXX: Confirm in "recent" list?
+                self._operations_completed[folder][relpath] = data
+                index.finished.emit(folder, relpath, data)
+        if current:
+            index.operations[folder] = current
+        else:
+            index.operations.pop(folder, None)
+        return changed
+
+    def _check_sync_progress(self, folder: str) -> None:
+        current = len(self._operations_completed[folder])
+        total = len(self._operations_queued[folder])
+        self.sync_progress_updated.emit(folder, current, total)
+        if folder not in self._uploads and folder not in self._downloads:
+            updated_files = list(self._operations_completed[folder])
+            try:
+                del self._operations_completed[folder]
+            except KeyError:
+                pass
+            try:
+                del self._operations_queued[folder]
+            except KeyError:
+                pass
+            self.files_updated.emit(folder, updated_files)
+
+    def _parse_folder_status(self, data: dict) -> MagicFolderStatus:
+        if data.get("uploads") or data.get("downloads"):
+            return MagicFolderStatus.SYNCING
+        if data.get("errors"):
+            return MagicFolderStatus.ERROR
+        last_poll = data.get("poller", {}).get("last-poll") or 0
+        last_scan = data.get("scanner", {}).get("last-scan") or 0
+        time_started = self.magic_folder.supervisor.time_started
+        if time_started and min(last_poll, last_scan) >= time_started:
+            return MagicFolderStatus.UP_TO_DATE
+        return MagicFolderStatus.WAITING
+
+    def _check_folder_status(self, folder: str, data: dict) -> None:
+        status = self._parse_folder_status(data)
+        if status != self._folder_statuses.get(folder):
+            self.folder_status_changed.emit(folder, status)
+        self._folder_statuses[folder] = status
+
+    def _check_overall_status(self, folder_statuses: dict) -> None:
+        statuses = set(folder_statuses.values())
+        if MagicFolderStatus.SYNCING in statuses:  # At least one is syncing
+            status = MagicFolderStatus.SYNCING
+        elif MagicFolderStatus.ERROR in statuses:  # At least one has an error
+            status = MagicFolderStatus.ERROR
+        elif statuses == {MagicFolderStatus.UP_TO_DATE}:  # All are up to date
+            status = MagicFolderStatus.UP_TO_DATE
+        else:
+            status = MagicFolderStatus.WAITING
+        if status != self._overall_status:
+            self._overall_status = status
+            self.overall_status_changed.emit(status)
+            # XXX Something should wait on the result
+            Deferred.fromCoroutine(
+                self.do_check()
+            )  # Update folder sizes, mtimes
+
+    def _compare_folder_states(
+        self, folder: str, current: dict, previous: dict
+    ) -> None:
+        current_errors = current.get("errors", [])
+        prev_errors = previous.get("errors", [])
+        if current_errors and current_errors != prev_errors:
+            self._check_folder_errors(folder, current_errors, prev_errors)
+
+        changed = False
+        uploads = current.get("uploads", [])
+        if uploads != previous.get("uploads", []):
+            changed |= self._update_operations(
+                folder, uploads, self._upload_index
+            )
+        downloads = current.get("downloads", [])
+        if downloads != previous.get("downloads", []):
+            changed |= self._update_operations(
+                folder, downloads, self._download_index
+            )
+        if changed:
+            self._check_sync_progress(folder)
+
+    def compare_states(
+        self, current_state: dict, previous_state: dict
+    ) -> None:
+        """
+        Compare the given Magic-Folder status against the previous one,
+        emitting signals for anything that changed in between.
+
+        Only the fields that the comparison actually uses (errors, uploads,
+        and downloads) are compared -- rather than each folder's status as a
+        whole -- and only those that differ are re-examined against the
+        indexed per-folder operations, so the cost of handling a status
+        update is proportional to what changed rather than to the size of
+        the overall state.
+        """
+        current_folders = current_state.get("folders", {})
+        previous_folders = previous_state.get("folders", {})
+        for folder, data in current_folders.items():
+            previous = previous_folders.get(folder, {})
+            self._compare_folder_states(folder, data, previous)
+            self._check_folder_status(folder, data)
+        for folder, data in previous_folders.items():
+            if folder not in current_folders:
+                self._compare_folder_states(folder, {}, data)
+                self._folder_statuses.pop(folder, None)
+        self._check_overall_status(self._folder_statuses)
+
+    def compare_folders(
+        self,
+        current_folders: dict[str, dict],
+        previous_folders: dict[str, dict],
+    ) -> None:
+        for folder, data in current_folders.items():
+            if folder not in previous_folders:
+                self.folder_added.emit(folder)
+                magic_path = data.get("magic_path", "")
+                if magic_path:
+                    self._folder_paths[magic_path] = folder
+                try:
+                    self._watchdog.add_watch(magic_path)
+                except Exception as exc:  # pylint: disable=broad-except
+                    logging.warning(
+                        "Error adding watch for %s: %s", magic_path, str(exc)
+                    )
+        for folder, data in previous_folders.items():
+            if folder not in current_folders:
+                self.folder_removed.emit(folder)
+                magic_path = data.get("magic_path", "")
+                self._folder_paths.pop(magic_path, None)
+                self._scan_scheduler.cancel(folder)
+                self._poll_scheduler.cancel(folder)
+                try:
+                    self._watchdog.remove_watch(magic_path)
+                except Exception as exc:  # pylint: disable=broad-except
+                    logging.warning(
+                        "Error removing watch for %s: %s", magic_path, str(exc)
+                    )
+
+    def compare_backups(
+        self, current_backups: list[str], previous_backups: list[str]
+    ) -> None:
+        for backup in current_backups:
+            if (
+                backup not in previous_backups
+                and backup not in self._known_folders  # XXX
+            ):
+                self.backup_added.emit(backup)
+        for backup in previous_backups:
+            if backup not in current_backups:
+                self.backup_removed.emit(backup)
+
+    def _check_file_modified(
+        self, folder_name: str, status: dict, prev_status: dict
+    ) -> None:
+        modified = False
+        if status.get("mtime") != prev_status.get("mtime", 0):
+            modified = True
+            self.file_mtime_updated.emit(folder_name, status)
+        if status.get("size") != prev_status.get("size", 0):
+            modified = True
+            self.file_size_updated.emit(folder_name, status)
+        if modified:
+            self.file_modified.emit(folder_name, status)
+
+    def _update_file_index(
+        self,
+        folder_name: str,
+        magic_path: str,
+        file_status: list[dict],
+        seen: set[str],
+    ) -> None:
+        """
+        Apply (a batch of) the given file status of a folder to that
+        folder's file index, emitting signals for any files that were added
+        or modified since the previous check and adding their relpaths to
+        ``seen``.
+
+        Entries are keyed by relpath and retain their already-resolved
+        "path" (so that the filesystem is only consulted for newly-seen
+        files) while the folder's total size and latest mtime are kept as
+        running aggregates.
+        """
+        index = self._file_index.setdefault(folder_name, {})
+        total_size = self._folder_sizes.get(folder_name, 0)
+        latest_mtime = self._folder_mtimes.get(folder_name, 0)
+        for item in file_status:
+            relpath = item.get("relpath", "")
+            seen.add(relpath)
+            size = int(item.get("size") or 0)  # XXX "size" is None if deleted
+            last_updated = item.get("last-updated", 0)
+            if last_updated > latest_mtime:
+                latest_mtime = last_updated
+            prev_status = index.get(relpath)
+            if prev_status is None:
+                item["path"] = str(Path(magic_path, relpath).resolve())
+                index[relpath] = item
+                total_size += size
+                self.file_added.emit(folder_name, item)
+                continue
+            item["path"] = prev_status["path"]
+            if item == prev_status:
+                continue
+            index[relpath] = item
+            total_size += size - int(prev_status.get("size") or 0)
+            self._check_file_modified(folder_name, item, prev_status)
+        self._folder_sizes[folder_name] = total_size
+        self._folder_mtimes[folder_name] = latest_mtime
+
+    def _remove_unseen_files(self, folder_name: str, seen: set[str]) -> None:
+        index = self._file_index.get(folder_name, {})
+        if len(index) <= len(seen):
+            return
+        total_size = self._folder_sizes.get(folder_name, 0)
+        for relpath in [r for r in index if r not in seen]:
+            status = index.pop(relpath)
+            total_size -= int(status.get("size") or 0)
+            self.file_removed.emit(folder_name, status)
+        self._folder_sizes[folder_name] = total_size
+        self._folder_mtimes[folder_name] = max(
+            (s.get("last-updated", 0) for s in index.values()), default=0
+        )
+
+    def _check_folder_aggregates(
+        self, folder_name: str, prev_total_size: int, prev_latest_mtime: int
+    ) -> None:
+        total_size = self._folder_sizes.get(folder_name, 0)
+        if total_size != prev_total_size:
+            self.folder_size_updated.emit(folder_name, total_size)
+        latest_mtime = self._folder_mtimes.get(folder_name, 0)
+        if latest_mtime != prev_latest_mtime:
+            self.folder_mtime_updated.emit(folder_name, latest_mtime)
+
+    async def _check_file_status(
+        self, folder_name: str, magic_path: str
+    ) -> None:
+        # Checks of the same folder (e.g., by overlapping calls to do_check)
+        # must not stream into its file index at the same time, lest an
+        # older check remove the files that a newer one has just added.
+        lock = self._file_index_locks.setdefault(folder_name, DeferredLock())
+        await lock.acquire()
+        prev_total_size = self._folder_sizes.get(folder_name, 0)
+        prev_latest_mtime = self._folder_mtimes.get(folder_name, 0)
+        seen: set[str] = set()
+        try:
+            await self.magic_folder.stream_file_status(
+                folder_name,
+                lambda batch: self._update_file_index(
+                    folder_name, magic_path, batch, seen
+                ),
+            )
+            # Files can only be known to have been removed once the full
+            # file status has been received.
+            self._remove_unseen_files(folder_name, seen)
+        finally:
+            self._check_folder_aggregates(
+                folder_name, prev_total_size, prev_latest_mtime
+            )
+            lock.release()
+
+    def _check_total_folders_size(self) -> None:
+        total = sum(self._folder_sizes.values())
+        if total != self._total_folders_size:
+            self._total_folders_size = total
+            self.total_folders_size_updated.emit(total)
+
+    def compare_files(
+        self, current_folders: dict, previous_folders: dict
+    ) -> None:
+        for folder_name in previous_folders:
+            if folder_name not in current_folders:
+                self._file_index.pop(folder_name, None)
+                self._file_index_locks.pop(folder_name, None)
+                self._folder_sizes.pop(folder_name, None)
+                self._folder_mtimes.pop(folder_name, None)
+        self._check_total_folders_size()
+
+    def _check_last_polls(self, state: dict) -> None:
+        for folder_name, data in state.get("folders", {}).items():
+            if not (data.get("poller", {}).get("last-poll") or 0):
+                self._schedule_magic_folder_poll(folder_name)
+
+    def on_status_message_received(self, msg: str) -> None:
+        data = json.loads(msg)
+        self.status_message_received.emit(data)
+        state = data.get("state")
+        self.compare_states(state, self._prev_state)
+        self._check_last_polls(state)
+        self._prev_state = state
+
+    async def do_check(self) -> None:
+        folders = await self.magic_folder.get_folders()
+        current_folders = dict(folders)
+        previous_folders = dict(self._known_folders)
+        self.compare_folders(current_folders, previous_folders)
+        self._known_folders = current_folders
+
+        backups = await self.magic_folder.get_folder_backups()
+        if backups is None:
+            logging.warning("Could not read Magic-Folder backups during check")
+        else:
+            current_backups = list(backups)
+            previous_backups = list(self._known_backups)
+            self.compare_backups(current_backups, previous_backups)
+            self._known_backups = current_backups
+
+        await DeferredList(
+            [
+                Deferred.fromCoroutine(
+                    self._check_file_status(
+                        folder_name, data.get("magic_path", "")
+                    )
+                )
+                for folder_name, data in current_folders.items()
+            ],
+            consumeErrors=True,  # XXX
+        )
+        self.compare_files(current_folders, previous_folders)
+
+    def start(self) -> None:
+        if self._ws_reader is not None:
+            self._ws_reader.stop()
+            self._ws_reader = None
+        self._ws_reader = WebSocketReaderService(
+            f"ws://127.0.0.1:{self.magic_folder.api_port}/v1/status",
+            headers={"Authorization": f"Bearer {self.magic_folder.api_token}"},
+            collector=self.on_status_message_received,
+        )
+        self._ws_reader.start()
+        self._watchdog.start()
+        self.running = True
+        # XXX Something should wait on the result
+        Deferred.fromCoroutine(self.do_check())
+
+    def stop(self) -> None:
+        self.running = False
+        self._watchdog.stop()
+        self._scan_scheduler.cancel_all()
+        self._poll_scheduler.cancel_all()
+        if self._ws_reader:
+            self._ws_reader.stop()
+            self._ws_reader = None
@@ -8,12 +8,19 @@ from typing import TYPE_CHECKING, Optional
 
 import attr
 from qtpy.QtCore import QObject, Signal
-from twisted.internet.defer import Deferred, inlineCallbacks
+from twisted.internet.defer import (
+    Deferred,
+    gatherResults,
+    inlineCallbacks,
+    maybeDeferred,
+)
 from twisted.internet.error import ConnectError
 from twisted.internet.task import LoopingCall
 
 from gridsync.errors import TahoeWebError
+from gridsync.magic_folder_monitor import MagicFolderStatus
 from gridsync.types import TwistedDeferred
+from gridsync.util import unwrap_first_error
 
 if TYPE_CHECKING:
     from gridsync.tahoe import Tahoe
@@ -377,6 +384,17 @@ class Monitor(QObject):
 
     :ivar bool _started: Whether or not ``start`` has already been called.
 
+    :ivar float min_interval: The number of seconds between checks while the
+        node is connecting, while folders are syncing, while vouchers are
+        awaiting payment or redemption, or just after something changed.
+
+    :ivar float max_interval: The maximum number of seconds between checks
+        while the main window is visible. The interval doubles (up to this
+        limit) after each check that finds nothing changed.
+
+    :ivar float idle_interval: The number of seconds between checks while
+        the main window is not visible (and nothing is in progress).
+
     :ivar Signal zkaps_updated: A signal that is emitted periodically when
         we notice that the number of available or total ZKAPs has changed.  Is
         it emitted near startup?  I don't know.
@@ -406,10 +424,25 @@ class Monitor(QObject):
     redeeming_vouchers_updated = Signal(list)
     low_zkaps_warning = Signal()
 
-    def __init__(self, gateway: Tahoe) -> None:
+    def __init__(
+        self,
+        gateway: Tahoe,
+        min_interval: float = 2,
+        max_interval: float = 60,
+        idle_interval: float = 300,
+    ) -> None:
         super().__init__()
         self.gateway = gateway
         self.timer = LoopingCall(self.do_checks)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_interval = idle_interval
+        self.interval = min_interval
+        self.idle = False
+        self._last_state: Optional[tuple] = None
+        self._checking = False
+        # The interval with which the timer was most recently started
+        self._timer_interval = min_interval
 
         self.grid_checker = GridChecker(self.gateway)
         self.grid_checker.connected.connect(self.connected.emit)
@@ -440,11 +473,104 @@ class Monitor(QObject):
 
     @inlineCallbacks
     def do_checks(self) -> TwistedDeferred[None]:
-        yield self.zkap_checker.do_check()
-        yield self.grid_checker.do_check()
+        self._checking = True
+        try:
+            # The ZKAPAuthorizer and grid checks are independent of each other
+            yield gatherResults(
+                [
+                    maybeDeferred(self.zkap_checker.do_check),
+                    maybeDeferred(self.grid_checker.do_check),
+                ],
+                consumeErrors=True,
+            ).addErrback(unwrap_first_error)
+        finally:
+            self._checking = False
         self.check_finished.emit()
+        # The timer can only be restarted (with a new interval) once the
+        # LoopingCall has finished with this check, i.e., after this returns.
+        self.timer.clock.callLater(0, self._update_interval)  # type: ignore
+
+    def _state(self) -> tuple:
+        grid = self.grid_checker
+        zkaps = self.zkap_checker
+        return (
+            grid.num_connected,
+            grid.num_known,
+            grid.available_space,
+            zkaps.zkaps_remaining,
+            zkaps.zkaps_total,
+            zkaps.zkaps_renewal_cost,
+        )
+
+    def _is_busy(self) -> bool:
+        if self.gateway.shares_happy and not self.gateway.ready:
+            return True  # Still connecting to storage servers
+        if self.zkap_checker.unpaid_vouchers:
+            return True  # Waiting for the user to pay
+        if self.zkap_checker.redeeming_vouchers:
+            return True
+        status = self.gateway.magic_folder.monitor.overall_status
+        return status == MagicFolderStatus.SYNCING
+
+    def _next_interval(self) -> float:
+        state = self._state()
+        changed = state != self._last_state
+        self._last_state = state
+        if self._is_busy() or (changed and not self.idle):
+            return self.min_interval
+        if self.idle:
+            return self.idle_interval
+        return min(self.interval * 2, self.max_interval)
+
+    def _set_interval(self, interval: float) -> None:
+        if interval != self.interval:
+            logging.debug(
+                "Changing %s check interval from %ss to %ss",
+                self.gateway.name,
+                self.interval,
+                interval,
+            )
+            self.interval = interval
+        if self._checking:
+            return  # The interval is updated once the check has finished
+        if self.timer.running and self._timer_interval != interval:
+            # Restart the timer so that the next check is scheduled relative
+            # to now (rather than to the time at which it was first started).
+            self.timer.stop()
+            self._start_timer(now=False)
+
+    def _start_timer(self, now: bool) -> None:
+        self._timer_interval = self.interval
+        self.timer.start(self.interval, now=now)
+
+    def _update_interval(self) -> None:
+        self._set_interval(self._next_interval())
+
+    def wake(self) -> None:
+        """
+        Return to checking at the fastest rate, re-scheduling the next check
+        if it would otherwise be more than ``min_interval`` seconds away.
+        Called on user interaction and on activity (e.g., a status message
+        from the Magic-Folder WebSocket) that suggests state is changing.
+        """
+        self._set_interval(self.min_interval)
+
+    def set_idle(self, idle: bool) -> None:
+        """
+        Set whether or not the user is looking at the application (i.e.,
+        whether the main window is visible). While idle, checks occur every
+        ``idle_interval`` seconds unless something is in progress.
+        """
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if not idle:
+            self.wake()
 
-    def start(self, interval: int = 2) -> None:
+    def start(self, interval: Optional[float] = None) -> None:
         if not self._started:
             self._started = True
-            self.timer.start(interval, now=True)
+            if interval is not None:
+                self.min_interval = interval
+            self.interval = self.min_interval
+            self._start_timer(now=True)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import json
+import os
+from contextlib import contextmanager
+from time import monotonic
+from typing import Callable, Iterator, Optional
+
+import attr
+
+
+@attr.s
+class Span:
+    """
+    :ivar name: The name of the phase (e.g., "Tahoe.start").
+
+    :ivar track: The name of the timeline on which to display the span. Spans
+        of concurrent activities (e.g., the starting of different gateways)
+        should be given different tracks.
+
+    :ivar start: The monotonic time at which the span began.
+
+    :ivar end: The monotonic time at which the span ended, or ``None`` if it
+        hasn't ended yet.
+
+    :ivar args: Additional information to include with the span.
+    """
+
+    name: str = attr.ib()
+    track: str = attr.ib()
+    start: float = attr.ib()
+    end: Optional[float] = attr.ib(default=None)
+    args: dict = attr.ib(default=attr.Factory(dict))
+
+    @property
+    def duration(self) -> float:
+        if self.end is None:
+            return 0.0
+        return self.end - self.start
+
+
+class StartupProfiler:
+    """
+    Record the spans of time taken by the various phases of startup, for
+    export in the Chrome "Trace Event" format (which can be viewed with
+    chrome://tracing or https://ui.perfetto.dev).
+
+    Spans are recorded until ``finish`` is called, after which any further
+    spans are ignored (so that, e.g., restarts of supervised processes later
+    on don't grow the timeline indefinitely).
+    """
+
+    def __init__(self, clock: Callable[[], float] = monotonic) -> None:
+        self._clock = clock
+        self.origin = clock()
+        self.spans: list[Span] = []
+        self.finished = False
+
+    def begin(self, name: str, track: str = "main", **args: object) -> Span:
+        span = Span(name, track, self._clock(), args=args)
+        if not self.finished:
+            self.spans.append(span)
+        return span
+
+    def end(self, span: Span) -> None:
+        if span.end is None:
+            span.end = self._clock()
+
+    @contextmanager
+    def span(
+        self, name: str, track: str = "main", **args: object
+    ) -> Iterator[Span]:
+        span = self.begin(name, track, **args)
+        try:
+            yield span
+        finally:
+            self.end(span)
+
+    def finish(self) -> None:
+        self.finished = True
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Return the recorded spans as a Chrome "Trace Event" document with
+        one "thread" per track.
+        """
+        tids: dict[str, int] = {}
+        events = []
+        pid = os.getpid()
+        for span in self.spans:
+            if span.end is None:
+                continue
+            tid = tids.setdefault(span.track, len(tids) + 1)
+            events.append(
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "pid": pid,
+                    "tid": tid,
+                    "ts": round((span.start - self.origin) * 1_000_000),
+                    "dur": round(span.duration * 1_000_000),
+                    "args": {k: str(v) for k, v in span.args.items()},
+                }
+            )
+        for track, tid in tids.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": track},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def summary(self) -> str:
+        """
+        Return a human-readable table of the recorded spans, ordered by the
+        time at which they began.
+        """
+        lines = []
+        for span in sorted(self.spans, key=lambda s: s.start):
+            offset = span.start - self.origin
+            if span.end is None:
+                duration = "(unfinished)"
+            else:
+                duration = f"{span.duration * 1000:10.1f}ms"
+            lines.append(
+                f"{offset * 1000:10.1f}ms {duration:>12}  "
+                f"[{span.track}] {span.name}"
+            )
+        return "\n".join(lines)
+
+
+# Since this is imported by gridsync/__init__.py, the origin of this profiler
+# is very close to the time at which the process started.
+startup_profiler = StartupProfiler()
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import logging
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 from atomicwrites import atomic_write
-from twisted.internet.defer import DeferredLock
+from twisted.internet.defer import Deferred, DeferredLock, gatherResults
 
 from gridsync import APP_NAME
 from gridsync.errors import UpgradeRequiredError
+from gridsync.util import gather_limited, unwrap_first_error
 
 if TYPE_CHECKING:
     from gridsync.tahoe import Tahoe  # pylint: disable=cyclic-import
@@ -47,6 +49,7 @@ class RootcapManager:
         self._rootcap: str = ""
         self._basedircap = ""
         self._backup_caps: dict = {}
+        self.import_concurrency: int = 4
 
     def get_rootcap(self) -> str:
         if self._rootcap:
@@ -156,6 +159,20 @@ class RootcapManager:
         finally:
             self.lock.release()
 
+    async def add_backups(self, dirname: str, backups: dict[str, str]) -> None:
+        """
+        Add several backups to the backup directory ``dirname`` at once.
+
+        :param backups: A mapping of names to capabilities, each having the
+            same meaning as the ``name`` and ``cap`` arguments to add_backup
+        """
+        backup_cap = await self.get_backup_cap(dirname)
+        await self.lock.acquire()
+        try:
+            await self.gateway.link_many(backup_cap, backups)
+        finally:
+            self.lock.release()
+
     async def get_backup(self, dirname: str, name: str) -> str:
         """
         Retrieve a backup previously added with `add_backup`.
@@ -185,7 +202,52 @@ class RootcapManager:
         finally:
             self.lock.release()
 
-    async def import_rootcap(self, source_dircap: str) -> None:
+    async def _import_backups(
+        self, dirname: str, children: dict[str, str], basedircap: str
+    ) -> None:
+        backup_cap = self._backup_caps.get(dirname)
+        if backup_cap:
+            await self.add_backups(dirname, children)
+            return
+        # The backup directory doesn't exist yet, so create it with all of
+        # its children at once (thereby making only a single write to it)
+        await self.lock.acquire()
+        try:
+            backup_cap = await self.gateway.mkdir(
+                basedircap, dirname, children=children
+            )
+        finally:
+            self.lock.release()
+        self._backup_caps[dirname] = backup_cap
+
+    async def _import_backupdir(
+        self, dirname: str, source_dircap: str, basedircap: str
+    ) -> None:
+        dir_contents = await self.gateway.ls(source_dircap)
+        if not dir_contents:
+            logging.warning(
+                'Backup directory "%s" is empty; not restoring', dirname
+            )
+            return
+        children = {name: data["cap"] for name, data in dir_contents.items()}
+        await self._import_backups(dirname, children, basedircap)
+
+    async def import_rootcap(
+        self,
+        source_dircap: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """
+        Import (i.e., link) all of the backups contained in the rootcap
+        ``source_dircap`` into this rootcap.
+
+        Up to ``import_concurrency`` backup directories are read from the
+        source rootcap at a time.
+
+        :param progress_callback: A callable to which the number of backup
+            directories that have been imported so far and the total number
+            of backup directories will be passed as each one is completed.
+        """
         src_dirs = await self.gateway.ls(source_dircap, exclude_filenodes=True)
         if src_dirs is None:
             raise ValueError("Failed to list source directory contents")
@@ -197,19 +259,40 @@ class RootcapManager:
                 "incompatible with the current version of the software."
             )
         src_basedircap = src_dirs[self.basedir]["cap"]
-        src_backupdirs = await self.gateway.ls(
-            src_basedircap, exclude_filenodes=True
-        )
+        results: list = await gatherResults(
+            [
+                Deferred.fromCoroutine(
+                    self.gateway.ls(src_basedircap, exclude_filenodes=True)
+                ),
+                Deferred.fromCoroutine(self._get_basedircap()),
+            ],
+            consumeErrors=True,
+        ).addErrback(unwrap_first_error)
+        src_backupdirs: Optional[dict] = results[0]
+        basedircap: str = results[1]
         if not src_backupdirs:
             logging.warning("No backups found in imported rootcap")
             return
-        for backupdir_name, backupdir_data in src_backupdirs.items():
-            dir_contents = await self.gateway.ls(backupdir_data["cap"])
-            if not dir_contents:
-                logging.warning(
-                    'Backup directory "%s" is empty; not restoring',
-                    backupdir_name,
-                )
-                continue
-            for name, data in dir_contents.items():
-                await self.add_backup(backupdir_name, name, data["cap"])
+        ls_output = await self.gateway.ls(basedircap, exclude_filenodes=True)
+        if ls_output is None:
+            raise ValueError("Failed to list backup contents")
+        for dirname, data in ls_output.items():
+            self._backup_caps[dirname] = data.get("cap", "")
+
+        total = len(src_backupdirs)
+        completed = 0
+
+        async def import_backupdir(dirname: str, data: dict) -> None:
+            nonlocal completed
+            await self._import_backupdir(dirname, data["cap"], basedircap)
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, total)
+
+        await gather_limited(
+            [
+                partial(import_backupdir, dirname, data)
+                for dirname, data in src_backupdirs.items()
+            ],
+            self.import_concurrency,
+        )
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Generic,
+    Hashable,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+import attr
+
+if TYPE_CHECKING:
+    from twisted.internet.interfaces import IDelayedCall, IReactorTime
+
+_K = TypeVar("_K", bound=Hashable)
+
+
+@attr.s
+class CoalescingSchedulerStats:
+    """
+    :ivar requests: The number of times that a call has been requested.
+
+    :ivar calls: The number of calls that have actually been made.
+
+    :ivar coalesced: The number of requests that were folded into a call
+        that was already pending (i.e., ``requests - calls``, not counting
+        any calls that are still pending or were cancelled).
+    """
+
+    requests: int = attr.ib(default=0)
+    calls: int = attr.ib(default=0)
+    coalesced: int = attr.ib(default=0)
+
+
+class CoalescingScheduler(Generic[_K]):
+    """
+    Debounce requests to call ``function`` with a given key (e.g., the name
+    of a magic-folder), so that a burst of requests for the same key results
+    in a single call.
+
+    A call is made ``delay`` seconds after the most recent request for its
+    key (i.e., on the "trailing edge" of a burst) but, if requests keep
+    arriving, no more than ``max_wait`` seconds after the first request of
+    the burst. Each key has at most one pending ``DelayedCall`` at a time.
+
+    :param function: The function to call with each key.
+
+    :param delay: The number of seconds for which requests must stop before
+        a call is made.
+
+    :param max_wait: The maximum number of seconds that a call can be
+        delayed by continuing requests, or ``None`` to wait indefinitely.
+
+    :param clock: The provider of ``IReactorTime`` with which to schedule
+        calls (defaulting to the global reactor).
+    """
+
+    def __init__(
+        self,
+        function: Callable[[_K], object],
+        delay: float,
+        max_wait: Optional[float] = None,
+        clock: Optional[IReactorTime] = None,
+    ) -> None:
+        if clock is None:
+            from twisted.internet import reactor
+
+            clock = cast("IReactorTime", reactor)
+        self._function = function
+        self._clock = clock
+        self.delay = delay
+        self.max_wait = max_wait
+        self.stats = CoalescingSchedulerStats()
+        # key -> (DelayedCall, time of first request, number of requests)
+        self._pending: dict[_K, tuple[IDelayedCall, float, int]] = {}
+
+    def is_pending(self, key: _K) -> bool:
+        return key in self._pending
+
+    def schedule(self, key: _K) -> None:
+        self.stats.requests += 1
+        now = self._clock.seconds()  # type: ignore
+        pending = self._pending.get(key)
+        if pending is None:
+            call = self._clock.callLater(self.delay, self._call, key)  # type: ignore
+            self._pending[key] = (call, now, 1)
+            return
+        call, first, count = pending
+        self._pending[key] = (call, first, count + 1)
+        delay = self.delay
+        if self.max_wait is not None:
+            delay = max(0, min(delay, first + self.max_wait - now))
+        call.reset(delay)  # type: ignore
+
+    def _call(self, key: _K) -> None:
+        _, _, count = self._pending.pop(key)
+        self.stats.calls += 1
+        self.stats.coalesced += count - 1
+        if count > 1:
+            logging.debug("Coalesced %i requests for %s", count, key)
+        self._function(key)
+
+    def cancel(self, key: _K) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            pending[0].cancel()  # type: ignore
+
+    def cancel_all(self) -> None:
+        for key in list(self._pending):
+            self.cancel(key)
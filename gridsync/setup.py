@@ -395,7 +395,12 @@ class SetupRunner(QObject):
                         f"snapshot(s) found in recovery-capability.{help_text}"
                     )
                 await self._restore_zkaps(recovery_cap)
-            await self.gateway.rootcap_manager.import_rootcap(rootcap)
+            await self.gateway.rootcap_manager.import_rootcap(
+                rootcap,
+                lambda completed, total: self.update_progress.emit(
+                    f"Restoring from Recovery Key ({completed}/{total})..."
+                ),
+            )
             if zkapauthz:
                 # This must happen *after* the `import_rootcap` call
                 # above, since both `import_rootcap` and `backup_zkaps`
@@ -414,18 +419,15 @@ class SetupRunner(QObject):
 
     async def join_folders(self, folders_data: dict) -> None:
         folders = []
+        children = {}
         for folder, data in folders_data.items():
             self.update_progress.emit('Joining folder "{}"...'.format(folder))
             collective, personal = data["code"].split("+")
-            await self.gateway.link(
-                self.gateway.get_rootcap(),
-                folder + " (collective)",
-                collective,
-            )
-            await self.gateway.link(
-                self.gateway.get_rootcap(), folder + " (personal)", personal
-            )
+            children[folder + " (collective)"] = collective
+            children[folder + " (personal)"] = personal
             folders.append(folder)
+        if children:
+            await self.gateway.link_many(self.gateway.get_rootcap(), children)
         if folders:
             self.joined_folders.emit(folders)
 
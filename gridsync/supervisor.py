@@ -9,6 +9,7 @@ from psutil import Process
 from twisted.internet import reactor
 from twisted.internet.defer import inlineCallbacks
 
+from gridsync.profiler import startup_profiler
 from gridsync.system import (
     SubprocessProtocol,
     terminate,
@@ -39,9 +40,13 @@ class Supervisor:
         self,
         pidfile: Path,
         restart_delay: int = 1,
+        profile_track: str = "main",
     ) -> None:
         self.pidfile: Path = pidfile
         self.restart_delay: int = restart_delay
+        # The startup profile track on which to record the time taken to
+        # start the supervised process
+        self.profile_track = profile_track
         self.time_started: Optional[float] = None
         # _protocol is non-None only when we have a running subprocess
         self._protocol: Optional[SubprocessProtocol] = None
@@ -88,6 +93,14 @@ class Supervisor:
 
     @inlineCallbacks
     def _start_process(self) -> TwistedDeferred[tuple[int, str]]:
+        with startup_profiler.span(
+            "Supervisor._start_process", self.profile_track
+        ):
+            result = yield self._spawn_process()
+        return result
+
+    @inlineCallbacks
+    def _spawn_process(self) -> TwistedDeferred[tuple[int, str]]:
         self._keep_alive = True
         protocol = SubprocessProtocol(
             callback_triggers=[self._started_trigger],
@@ -155,25 +168,28 @@ class Supervisor:
         #  4. the pid is some other process
 
         lockfile = self.pidfile.with_name(self.pidfile.name + ".lock")
-        with FileLock(lockfile, timeout=2):
-            try:
-                pid, create = parse_pidfile(self.pidfile)
-            except ValueError:
-                logging.warning(
-                    "Removing invalid pidfile: %s",
-                    self.pidfile,
-                )
-                self.pidfile.unlink()
-            except OSError:
-                # 1. no pidfile
-                pass
-            else:
-                # the pidfile exists: if it's a leftover one, kill it
-                # (which is case 3)
-                yield terminate_if_matching(pid, create, kill_after=5)
-                # we're either case 3 or 4 here, and either way want
-                # to remove the file so our subprocess can start
-                self.pidfile.unlink()
+        with startup_profiler.span(
+            "Supervisor pidfile check", self.profile_track
+        ):
+            with FileLock(lockfile, timeout=2):
+                try:
+                    pid, create = parse_pidfile(self.pidfile)
+                except ValueError:
+                    logging.warning(
+                        "Removing invalid pidfile: %s",
+                        self.pidfile,
+                    )
+                    self.pidfile.unlink()
+                except OSError:
+                    # 1. no pidfile
+                    pass
+                else:
+                    # the pidfile exists: if it's a leftover one, kill it
+                    # (which is case 3)
+                    yield terminate_if_matching(pid, create, kill_after=5)
+                    # we're either case 3 or 4 here, and either way want
+                    # to remove the file so our subprocess can start
+                    self.pidfile.unlink()
 
         logging.debug("Starting supervised process: %s", " ".join(self._args))
         result = yield self._start_process()
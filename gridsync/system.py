@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import json
 import logging
+import os
+import re
 import shutil
 import time
-from io import BytesIO
-from typing import TYPE_CHECKING, Callable, Optional, Union
+from collections import deque
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Union
 
+from atomicwrites import atomic_write
 from psutil import NoSuchProcess, Process, TimeoutExpired
 from twisted.internet import reactor
 from twisted.internet.defer import Deferred, DeferredList, inlineCallbacks
@@ -40,6 +44,76 @@ def which(cmd: str) -> str:
     return path
 
 
+class ExecutableVersionCache:
+    """
+    A persistent record of the versions reported by executables (e.g., by
+    "tahoe --version"), so that the (comparatively slow) process of running
+    them in order to find out can be skipped when they haven't changed.
+
+    Entries are keyed by the executable's path and are only considered
+    valid while its modification time and size remain the same.
+
+    :param path: The path of the JSON file in which to store the versions.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._versions: Optional[dict[str, dict]] = None
+
+    @staticmethod
+    def _stat(executable: str) -> Optional[list]:
+        try:
+            st = os.stat(executable)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def _load(self) -> dict[str, dict]:
+        if self._versions is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    versions = json.load(f)
+            except (OSError, ValueError):
+                versions = {}
+            self._versions = versions if isinstance(versions, dict) else {}
+        return self._versions
+
+    def get(self, executable: str) -> Optional[str]:
+        entry = self._load().get(executable)
+        if not entry or entry.get("stat") != self._stat(executable):
+            return None
+        return entry.get("version")
+
+    def set(self, executable: str, version: str) -> None:
+        stat = self._stat(executable)
+        if stat is None:
+            return
+        versions = self._load()
+        versions[executable] = {"stat": stat, "version": version}
+        try:
+            with atomic_write(self.path, mode="w", overwrite=True) as f:
+                json.dump(versions, f)
+        except OSError as e:
+            logging.warning("Error saving executable versions: %s", str(e))
+
+    async def get_version(
+        self, executable: str, probe: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Return the version of ``executable``, calling (and awaiting)
+        ``probe`` to determine it if there isn't a valid cached version.
+        """
+        version = self.get(executable)
+        if version:
+            logging.debug(
+                "Using cached version of %s: %s", executable, version
+            )
+            return version
+        version = await probe()
+        self.set(executable, version)
+        return version
+
+
 @inlineCallbacks
 def terminate_if_matching(  # noqa: max-complexity
     pid: int,
@@ -115,6 +189,39 @@ class SubprocessError(Exception):
     pass
 
 
+# The maximum number of lines of a subprocess's output to retain (in order to
+# fire SubprocessProtocol.done with, or to include in the resulting error).
+# Older lines are discarded so that the output of long-running processes
+# doesn't accumulate indefinitely.
+SUBPROCESS_OUTPUT_MAX_LINES = 1000
+
+
+def _compile_triggers(
+    callback_triggers: Optional[list[str]],
+    errback_triggers: Optional[list[tuple[str, type[Exception]]]],
+) -> tuple[Optional[re.Pattern], dict[str, Optional[type[Exception]]]]:
+    """
+    Compile the given triggers into a single pattern that matches any of
+    them, along with a mapping of each trigger to the exception with which
+    to errback (or ``None``, to callback).
+    """
+    triggers: dict[str, Optional[type[Exception]]] = {}
+    for pair in errback_triggers or []:
+        if not pair:
+            continue
+        text, exception = pair
+        if text and exception:
+            triggers.setdefault(text, exception)
+    for text in callback_triggers or []:
+        if text:
+            triggers[text] = None
+    if not triggers:
+        return None, triggers
+    # Longest first, so that a trigger that contains another takes priority
+    texts = sorted(triggers, key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, texts))), triggers
+
+
 class SubprocessProtocol(ProcessProtocol):
     def __init__(  # pylint: disable=too-many-arguments
         self,
@@ -129,40 +236,63 @@ class SubprocessProtocol(ProcessProtocol):
         self.stdout_line_collector = stdout_line_collector
         self.stderr_line_collector = stderr_line_collector
         self._on_process_ended = on_process_ended
-        self._output = BytesIO()
+        self._trigger_pattern, self._triggers = _compile_triggers(
+            callback_triggers, errback_triggers
+        )
+        # Incomplete (i.e., not yet newline-terminated) lines, by childFD
+        self._partial_lines: dict[int, bytes] = {}
+        self._output: deque[str] = deque(maxlen=SUBPROCESS_OUTPUT_MAX_LINES)
         self.done: Deferred = Deferred()
         # becomes None once we've exited
         self._awaiting_ended: Optional[list[Deferred]] = []
 
+    @property
+    def output(self) -> str:
+        return "\n".join(self._output).strip()
+
     def _check_triggers(self, line: str) -> None:
-        if self.callback_triggers:
-            for text in self.callback_triggers:
-                if text and text in line:
-                    self.done.callback(
-                        self._output.getvalue().decode("utf-8").strip()
-                    )
-        if self.errback_triggers:
-            for pair in self.errback_triggers:
-                if not pair:
-                    continue
-                text, exception = pair
-                if text and exception and text in line:
-                    self.done.errback(
-                        exception(
-                            self._output.getvalue().decode("utf-8").strip()
-                        )
-                    )
+        if self._trigger_pattern is None:
+            return
+        match = self._trigger_pattern.search(line)
+        if match is None:
+            return
+        exception = self._triggers[match.group()]
+        if exception is None:
+            self.done.callback(self.output)
+        else:
+            self.done.errback(exception(self.output))
 
-    def childDataReceived(self, childFD: int, data: bytes) -> None:
+    def _line_received(self, childFD: int, data: bytes) -> None:
+        line = data.decode("utf-8", errors="replace").rstrip("\r")
+        if not self.done.called:
+            self._output.append(line)
+        if not line.strip():
+            return
+        if self.stdout_line_collector and childFD == 1:
+            self.stdout_line_collector(line)
+        elif self.stderr_line_collector and childFD == 2:
+            self.stderr_line_collector(line)
         if not self.done.called:
-            self._output.write(data)
-        for line in data.decode("utf-8").strip().split("\n"):
-            if self.stdout_line_collector and childFD == 1:
-                self.stdout_line_collector(line)
-            elif self.stderr_line_collector and childFD == 2:
-                self.stderr_line_collector(line)
-            if not self.done.called:
-                self._check_triggers(line)
+            self._check_triggers(line)
+
+    def childDataReceived(self, childFD: int, data: bytes) -> None:
+        partial = self._partial_lines.pop(childFD, b"")
+        if partial:
+            data = partial + data
+        start = 0
+        end = data.find(b"\n")
+        while end != -1:
+            self._line_received(childFD, data[start:end])
+            start = end + 1
+            end = data.find(b"\n", start)
+        if start < len(data):
+            self._partial_lines[childFD] = data[start:]
+
+    def _flush_partial_lines(self) -> None:
+        partial_lines = self._partial_lines
+        self._partial_lines = {}
+        for childFD, data in sorted(partial_lines.items()):
+            self._line_received(childFD, data)
 
     def when_exited(self) -> Deferred[None]:
         """
@@ -177,12 +307,12 @@ class SubprocessProtocol(ProcessProtocol):
         return d
 
     def processEnded(self, reason: Failure) -> None:
+        self._flush_partial_lines()
         if not self.done.called:
-            output = self._output.getvalue().decode("utf-8").strip()
             if isinstance(reason.value, ProcessDone):
-                self.done.callback(output)
+                self.done.callback(self.output)
             else:
-                self.done.errback(SubprocessError(output))
+                self.done.errback(SubprocessError(self.output))
         if self._on_process_ended:
             self._on_process_ended(reason)
         if self._awaiting_ended:
@@ -5,31 +5,41 @@ import logging as log
 import os
 import re
 import shutil
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional, Union, cast
+from typing import Iterator, Optional, Union, cast
 
 import treq
 import yaml
 from atomicwrites import atomic_write
-from twisted.internet.defer import Deferred
+from twisted.internet.defer import Deferred, succeed
 from twisted.internet.error import ConnectError
 from twisted.internet.interfaces import IReactorTime
 
 from gridsync import APP_NAME, grid_settings
 from gridsync import settings as global_settings
-from gridsync.capabilities import diminish
+from gridsync.capabilities import children_json, diminish
 from gridsync.config import Config
 from gridsync.crypto import trunchash
+from gridsync.dircache import DirectoryCache
 from gridsync.errors import (
     TahoeCommandError,
     TahoeWebError,
     UpgradeRequiredError,
 )
+from gridsync.grid_status import (
+    GRID_STATUS_MAX_AGE,
+    GridStatus,
+    GridStatusFeed,
+    fetch_grid_status,
+)
+from gridsync.http_client import HTTPClient
 from gridsync.log import MultiFileLogger, NullLogger
 from gridsync.magic_folder import MagicFolder
 from gridsync.monitor import Monitor
 from gridsync.msg import critical
 from gridsync.news import NewscapChecker
+from gridsync.profiler import startup_profiler
 from gridsync.rootcap import RootcapManager
 from gridsync.supervisor import Supervisor
 from gridsync.system import SubprocessProtocol, which
@@ -105,6 +115,8 @@ class Tahoe:
             reactor = cast(IReactorTime, reactor_)
         self._reactor = reactor
         self.executable = executable
+        self.http_client = HTTPClient(reactor)
+        self.dircache = DirectoryCache()
         if nodedir:
             self.nodedir = os.path.expanduser(nodedir)
         else:
@@ -117,6 +129,12 @@ class Tahoe:
         self.nodeurl: str = ""
         self.api_token: str = ""
         self.shares_happy = 0
+        # Whether the node was connected to enough storage servers to store
+        # files the last time this was checked.
+        self.ready = False
+        self.grid_status_feed = GridStatusFeed(
+            lambda: fetch_grid_status(self.http_client, self.nodeurl)
+        )
         self.name = os.path.basename(self.nodedir)
         self.use_tor = False
         self.monitor = Monitor(self)
@@ -132,8 +150,15 @@ class Tahoe:
         self.storage_furl: str = ""
         self.rootcap_manager = RootcapManager(self)
         self.magic_folder = MagicFolder(self)
+        # Status messages from the Magic-Folder WebSocket indicate that
+        # something is happening, so check the grid and ZKAPs promptly.
+        self.magic_folder.monitor.status_message_received.connect(
+            lambda _: self.monitor.wake()
+        )
 
-        self.supervisor = Supervisor(Path(self.pidfile))
+        self.supervisor = Supervisor(
+            Path(self.pidfile), profile_track=f"{self.name} Tahoe-LAFS"
+        )
 
         # TODO: Replace with "readiness" API?
         # https://tahoe-lafs.org/trac/tahoe-lafs/ticket/2844
@@ -145,7 +170,13 @@ class Tahoe:
                 log.debug('Connecting to "%s"...', self.name)
             return ready
 
-        self._ready_poller = Poller(reactor, poll, 0.2)
+        self._ready_poller = Poller(
+            reactor,
+            poll,
+            0.2,
+            name="Tahoe.await_ready",
+            track=f"{self.name} Tahoe-LAFS",
+        )
 
         self.logger: Union[MultiFileLogger, NullLogger]
         if enable_logging:
@@ -162,12 +193,8 @@ class Tahoe:
         self.logger.log("stderr", message)
 
     def _log_eliot_message(self, message: str) -> None:
-        try:
-            message = json.dumps(json.loads(message), sort_keys=True)
-        except json.decoder.JSONDecodeError:
-            log.warning("Error decoding JSON message: %s", message)
-            return
-        self.logger.log("eliot", message, omit_fmt=True)
+        # The message is re-encoded (with sorted keys) by the log writer
+        self.logger.log("eliot", message, omit_fmt=True, is_json=True)
 
     def load_newscap(self) -> None:
         news_settings = global_settings.get("news:{}".format(self.name))
@@ -458,6 +485,7 @@ class Tahoe:
     async def stop(self) -> None:
         log.debug('Stopping "%s" tahoe client...', self.name)
         self.state = Tahoe.STOPPING
+        self.ready = False
         if self._ws_reader:
             self._ws_reader.stop()
             self._ws_reader = None
@@ -472,12 +500,20 @@ class Tahoe:
         if not self.is_storage_node():
             await self.magic_folder.stop()
         await self.supervisor.stop()
+        await self.http_client.close()
+        log.debug("Directory cache: %s", self.dircache.stats)
         self.state = Tahoe.STOPPED
         log.debug('Finished stopping "%s" tahoe client', self.name)
 
     def get_log(self, name: str) -> str:
         return self.logger.read_log(name)
 
+    def get_log_size(self, name: str) -> int:
+        return self.logger.log_size(name)
+
+    def iter_log(self, name: str) -> Iterator[str]:
+        return self.logger.iter_log(name)
+
     def _on_started(self) -> None:
         self.load_settings()
 
@@ -539,27 +575,30 @@ class Tahoe:
         tahoe_cfg_tmp = os.path.join(self.nodedir, "tahoe.cfg.tmp")
         shutil.copy2(tahoe_cfg, tahoe_cfg_tmp)
 
-        config = Config(tahoe_cfg_tmp)
+        options: defaultdict[str, dict[str, str]] = defaultdict(dict)
 
         hide_ip = settings.get("hide-ip")
         if hide_ip:
-            config.set("node", "reveal-ip-address", "false")
+            options["node"]["reveal-ip-address"] = "false"
 
         introducer_furl = settings.get("introducer")
         if introducer_furl:
-            config.set("client", "introducer.furl", introducer_furl)
+            options["client"]["introducer.furl"] = introducer_furl
 
         shares_needed = settings.get("shares-needed", settings.get("needed"))
         if shares_needed:
-            config.set("client", "shares.needed", shares_needed)
+            options["client"]["shares.needed"] = shares_needed
 
         shares_happy = settings.get("shares-happy", settings.get("happy"))
         if shares_happy:
-            config.set("client", "shares.happy", shares_happy)
+            options["client"]["shares.happy"] = shares_happy
 
         shares_total = settings.get("shares-total", settings.get("total"))
         if shares_total:
-            config.set("client", "shares.total", shares_total)
+            options["client"]["shares.total"] = shares_total
+
+        if options:
+            Config(tahoe_cfg_tmp).save(options)
 
         servers_yaml = os.path.join(self.nodedir, "private", "servers.yaml")
         servers_yaml_tmp = os.path.join(
@@ -595,6 +634,10 @@ class Tahoe:
             self.apply_connection_settings(settings)
 
     async def start(self) -> None:
+        with startup_profiler.span("Tahoe.start", f"{self.name} Tahoe-LAFS"):
+            await self._start()
+
+    async def _start(self) -> None:
         self._verify_configuration()
         log.debug('Starting "%s" tahoe client...', self.name)
         self.state = Tahoe.STARTING
@@ -649,66 +692,70 @@ class Tahoe:
         self.nodeurl = nodeurl
 
     async def get_grid_status(
-        self,
-    ) -> Optional[tuple[int, int, int]]:
-        if not self.nodeurl:
-            return None
-        try:
-            resp = await treq.get(self.nodeurl + "?t=json")
-        except ConnectError:
-            return None
-        if resp.code == 200:
-            content = await treq.content(resp)
-            content = json.loads(content.decode("utf-8"))
-            servers_connected = 0
-            servers_known = 0
-            available_space = 0
-            if "servers" in content:
-                servers = content["servers"]
-                servers_known = len(servers)
-                for server in servers:
-                    if server["connection_status"].startswith("Connected"):
-                        servers_connected += 1
-                        if server["available_space"]:
-                            available_space += server["available_space"]
-            return servers_connected, servers_known, available_space
-        return None
+        self, max_age: float = GRID_STATUS_MAX_AGE
+    ) -> Optional[GridStatus]:
+        """
+        Return the number of storage servers to which the node is connected,
+        the number of storage servers it knows about, and the total amount
+        of space available on the connected servers (or ``None`` if the
+        node couldn't be reached), updating the cached readiness state.
 
-    async def get_connected_servers(self) -> Optional[int]:
-        if not self.nodeurl:
-            return None
-        try:
-            resp = await treq.get(self.nodeurl)
-        except ConnectError:
-            return None
-        if resp.code == 200:
-            html = await treq.content(resp)
-            match = re.search(
-                "Connected to <span>(.+?)</span>", html.decode("utf-8")
-            )
-            if match:
-                return int(match.group(1))
-        return None
+        Requests are shared by all of the gateway's consumers of grid status
+        (i.e., the Monitor's GridChecker and the readiness poller).
+        """
+        grid_status = await self.grid_status_feed.get(max_age)
+        self.update_ready_state(grid_status[0] if grid_status else 0)
+        return grid_status
+
+    def update_ready_state(self, num_connected: int) -> bool:
+        """
+        Update (and return) the cached readiness state of the node given the
+        number of storage servers to which it is currently connected (e.g.,
+        as most recently determined by the Monitor's GridChecker).
+        """
+        self.ready = bool(
+            self.shares_happy and num_connected >= self.shares_happy
+        )
+        return self.ready
 
     async def is_ready(self) -> bool:
         if not self.shares_happy:
             return False
-        connected_servers = await self.get_connected_servers()
-        return bool(
-            connected_servers and connected_servers >= self.shares_happy
-        )
+        grid_status = await self.get_grid_status()
+        return self.update_ready_state(grid_status[0] if grid_status else 0)
 
     def await_ready(self) -> Deferred[bool]:
+        if self.ready:
+            return succeed(True)
         return self._ready_poller.wait_for_completion()
 
-    async def mkdir(self, parentcap: str = None, childname: str = None) -> str:
+    async def mkdir(
+        self,
+        parentcap: str = None,
+        childname: str = None,
+        children: Optional[dict[str, str]] = None,
+    ) -> str:
+        """
+        Create a new directory -- optionally linking it into ``parentcap``
+        as ``childname`` -- and return its capability.
+
+        :param children: A mapping of names to capabilities with which to
+            populate the new directory. These are all added in the same
+            request that creates the directory.
+        """
         await self.await_ready()
         url = self.nodeurl + "uri"
         params = {"t": "mkdir"}
+        data = b""
         if parentcap and childname:
             url += "/" + parentcap
             params["name"] = childname
-        resp = await treq.post(url, params=params)
+        if children:
+            params["t"] = "mkdir-with-children"
+            data = json.dumps(children_json(children)).encode("utf-8")
+        resp = await self.http_client.post(url, params=params, data=data)
+        if parentcap and childname:
+            self.dircache.invalidate(parentcap)
         content = await treq.content(resp)
         content = content.decode("utf-8").strip()
         if resp.code == 200:
@@ -733,7 +780,9 @@ class Tahoe:
         log.debug("Uploading %s...", local_path)
         await self.await_ready()
         with open(local_path, "rb") as f:
-            resp = await treq.put(url, f)
+            resp = await self.http_client.put(url, f)
+        if dircap:
+            self.dircache.invalidate(dircap)
         if resp.code in (200, 201):
             content = await treq.content(resp)
             log.debug("Successfully uploaded %s", local_path)
@@ -744,7 +793,7 @@ class Tahoe:
     async def download(self, cap: str, local_path: str) -> None:
         log.debug("Downloading %s...", local_path)
         await self.await_ready()
-        resp = await treq.get("{}uri/{}".format(self.nodeurl, cap))
+        resp = await self.http_client.get("{}uri/{}".format(self.nodeurl, cap))
         if resp.code == 200:
             with atomic_write(local_path, mode="wb", overwrite=True) as f:
                 await treq.collect(resp, f.write)
@@ -763,11 +812,12 @@ class Tahoe:
             dircap_hash,
         )
         await self.await_ready()
-        resp = await treq.post(
+        resp = await self.http_client.post(
             "{}uri/{}/?t=uri&name={}&uri={}".format(
                 self.nodeurl, dircap, childname, childcap
             )
         )
+        self.dircache.invalidate(dircap)
         if resp.code != 200:
             content = await treq.content(resp)
             raise TahoeWebError(content.decode("utf-8"))
@@ -778,17 +828,48 @@ class Tahoe:
             dircap_hash,
         )
 
+    async def link_many(self, dircap: str, children: dict[str, str]) -> None:
+        """
+        Link several children into ``dircap`` at once.
+
+        Since every modification of a mutable directory requires it to be
+        re-published in its entirety, this performs only a single update to
+        ``dircap`` (via "t=set_children") rather than one per child.
+
+        :param children: A mapping of child names to the capabilities to be
+            linked under those names. Existing children with the same names
+            are replaced.
+        """
+        if not children:
+            return
+        dircap_hash = trunchash(dircap)
+        log.debug("Linking %i children into %s...", len(children), dircap_hash)
+        await self.await_ready()
+        resp = await self.http_client.post(
+            f"{self.nodeurl}uri/{dircap}/",
+            params={"t": "set_children"},
+            data=json.dumps(children_json(children)).encode("utf-8"),
+        )
+        self.dircache.invalidate(dircap)
+        if resp.code != 200:
+            content = await treq.content(resp)
+            raise TahoeWebError(content.decode("utf-8"))
+        log.debug(
+            "Done linking %i children into %s", len(children), dircap_hash
+        )
+
     async def unlink(
         self, dircap: str, childname: str, missing_ok: bool = False
     ) -> None:
         dircap_hash = trunchash(dircap)
         log.debug('Unlinking "%s" from %s...', childname, dircap_hash)
         await self.await_ready()
-        resp = await treq.post(
+        resp = await self.http_client.post(
             "{}uri/{}/?t=unlink&name={}".format(
                 self.nodeurl, dircap, childname
             )
         )
+        self.dircache.invalidate(dircap)
         if resp.code == 404 and missing_ok:
             pass
         elif resp.code != 200:
@@ -796,19 +877,34 @@ class Tahoe:
             raise TahoeWebError(content.decode("utf-8"))
         log.debug('Done unlinking "%s" from %s', childname, dircap_hash)
 
-    async def get_json(self, cap: str) -> Optional[Union[dict, list]]:
-        if not cap or not self.nodeurl:
-            return None
+    async def _fetch_json_content(self, cap: str) -> Optional[bytes]:
         uri = "{}uri/{}/?t=json".format(self.nodeurl, cap)
         try:
-            resp = await treq.get(uri)
+            resp = await self.http_client.get(uri)
         except ConnectError:
             return None
         if resp.code == 200:
-            content = await treq.content(resp)
-            return json.loads(content.decode("utf-8"))
+            return await treq.content(resp)
         return None
 
+    async def get_json_content(self, cap: str) -> Optional[bytes]:
+        """
+        Return the (raw, undecoded) JSON representation of ``cap`` -- as
+        returned by the "?t=json" web API -- or ``None`` if it couldn't be
+        read. Results are served from ``dircache`` where possible.
+        """
+        if not cap or not self.nodeurl:
+            return None
+        return await self.dircache.get(
+            cap, lambda: self._fetch_json_content(cap)
+        )
+
+    async def get_json(self, cap: str) -> Optional[Union[dict, list]]:
+        content = await self.get_json_content(cap)
+        if content is None:
+            return None
+        return json.loads(content.decode("utf-8"))
+
     async def get_cap(self, path: str) -> Optional[str]:
         json_output = await self.get_json(path)
         if not json_output:
@@ -1,25 +1,45 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import codecs
+import json
 from binascii import hexlify, unhexlify
 from datetime import datetime, timedelta
 from html.parser import HTMLParser
 from time import time
-from typing import TYPE_CHECKING, Callable, Coroutine, Optional, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Coroutine,
+    Iterable,
+    NoReturn,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 import attr
-from twisted.internet.defer import Deferred, ensureDeferred, inlineCallbacks
+from twisted.internet.defer import (
+    Deferred,
+    DeferredSemaphore,
+    FirstError,
+    ensureDeferred,
+    gatherResults,
+    inlineCallbacks,
+)
 from twisted.internet.interfaces import IReactorTime
 from twisted.internet.task import deferLater
 from twisted.python.failure import Failure
 
+from gridsync.profiler import Span, startup_profiler
+
 _T = TypeVar("_T")
 
 B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
 
 
 if TYPE_CHECKING:
-    from gridsync.types import TwistedDeferred
+    from gridsync.types import JSON, TwistedDeferred
 
 
 def b58encode(b: bytes) -> str:  # Adapted from python-bitcoinlib
@@ -121,6 +141,127 @@ def strip_html_tags(s: str) -> str:
     return ts.get_data()
 
 
+class JSONArrayParser:
+    """
+    Incrementally parse a (top-level) JSON array from a sequence of chunks
+    of bytes -- e.g., as they are received over the network -- returning
+    each element of the array as soon as it has been received in full.
+
+    Only the not-yet-parsed remainder of the document is buffered, so memory
+    use is bounded by the size of the chunks and of the individual elements
+    rather than by that of the array as a whole.
+    """
+
+    _START = 0
+    _FIRST_VALUE = 1
+    _VALUE = 2
+    _SEPARATOR = 3
+    _DONE = 4
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer: str = ""
+        self._state: int = self._START
+
+    def _parse_punctuation(self, char: str) -> None:
+        if self._state == self._START:
+            if char != "[":
+                raise ValueError("Expected a JSON array")
+            self._state = self._FIRST_VALUE
+        elif char == "]" and self._state != self._VALUE:
+            self._state = self._DONE
+        elif char == "," and self._state == self._SEPARATOR:
+            self._state = self._VALUE
+        else:
+            raise ValueError(f"Unexpected {char!r} in JSON array")
+
+    def _parse_value(self, buffer: str, pos: int) -> Optional[tuple]:
+        try:
+            item, end = self._decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            return None  # The value hasn't been received in full yet
+        if isinstance(item, (int, float)) and (
+            end == len(buffer) or buffer[end] not in ",] \t\n\r"
+        ):
+            return None  # The rest of this number may yet follow
+        return item, end
+
+    def _parse(self) -> list[JSON]:
+        items: list[JSON] = []
+        buffer = self._buffer
+        pos = 0
+        while self._state != self._DONE:
+            while pos < len(buffer) and buffer[pos] in " \t\n\r":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if self._state == self._VALUE or (
+                self._state == self._FIRST_VALUE and buffer[pos] != "]"
+            ):
+                result = self._parse_value(buffer, pos)
+                if result is None:
+                    break
+                item, pos = result
+                items.append(item)
+                self._state = self._SEPARATOR
+            else:
+                self._parse_punctuation(buffer[pos])
+                pos += 1
+        self._buffer = buffer[pos:]
+        return items
+
+    def feed(self, data: bytes) -> list[JSON]:
+        """
+        Parse the next chunk of data.
+
+        :return: The elements of the array that were completed by ``data``.
+        """
+        self._buffer += self._text_decoder.decode(data)
+        items = self._parse()
+        if self._state == self._DONE and self._buffer.strip():
+            raise ValueError("Unexpected data after end of JSON array")
+        return items
+
+    def close(self) -> None:
+        """
+        Signal that no more data will be received.
+
+        :raises ValueError: if the array was incomplete.
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        if self._state != self._DONE:
+            raise ValueError("Incomplete JSON array")
+
+
+def unwrap_first_error(failure: Failure) -> NoReturn:
+    """
+    Re-raise the original exception wrapped by a ``FirstError`` (as raised
+    by ``gatherResults``) so that callers see the same exceptions that they
+    would have seen had the operations been performed sequentially.
+    """
+    failure.trap(FirstError)
+    failure.value.subFailure.raiseException()
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+def gather_limited(
+    functions: Iterable[Callable[[], Coroutine[Deferred, object, _T]]],
+    limit: int,
+) -> Deferred[list[_T]]:
+    """
+    Call each of the given async ``functions``, running no more than
+    ``limit`` of them at a time, and return a Deferred that fires with a
+    list of their results (in the same order as ``functions``) or with the
+    first exception raised by any of them.
+    """
+    semaphore = DeferredSemaphore(limit)
+    return gatherResults(
+        [semaphore.run(function) for function in functions],
+        consumeErrors=True,
+    ).addErrback(unwrap_first_error)
+
+
 @inlineCallbacks
 def until(
     predicate: Callable,
@@ -151,6 +292,9 @@ class Poller:
     :ivar clock: The reactor to use to schedule the polling.
     :ivar target: The asynchronous function to repeatedly call.
     :ivar interval: The minimum time, in seconds, between polling attempts.
+    :ivar name: If given, the name with which to record the time taken by
+        each polling effort in the startup profile.
+    :ivar track: The startup profile track on which to record that time.
 
     :ivar _idle: ``True`` if no code is waiting for completion notification,
         ``False`` if any code is.  This does not necessarily mean the
@@ -172,8 +316,11 @@ class Poller:
     ] = attr.ib()
 
     interval: float = attr.ib()
+    name: str = attr.ib(default="")
+    track: str = attr.ib(default="main")
     _idle: bool = attr.ib(default=True)
     _waiting: list[Deferred[None]] = attr.ib(default=attr.Factory(list))
+    _span: Optional[Span] = attr.ib(default=None)
 
     def wait_for_completion(self) -> Deferred:
         """
@@ -189,6 +336,8 @@ class Poller:
 
         if self._idle:
             self._idle = False
+            if self.name:
+                self._span = startup_profiler.begin(self.name, self.track)
             self._iterate_poll()
 
         return waiting
@@ -221,6 +370,9 @@ class Poller:
         """
         Fire all waiting ``Deferred`` instances with the given result.
         """
+        if self._span:
+            startup_profiler.end(self._span)
+            self._span = None
         waiting = self._waiting
         self._waiting = []
         for w in waiting:
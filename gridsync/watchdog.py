@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+import os
+import re
+from fnmatch import translate
+from threading import Lock
+from typing import TYPE_CHECKING, Optional
 
-from qtpy.QtCore import QObject, Signal
+import attr
+from qtpy.QtCore import QObject, Qt, Signal
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
@@ -12,34 +17,206 @@ if TYPE_CHECKING:
     from watchdog.observers.api import ObservedWatch
 
 
+class PathTrie:
+    """
+    Map directory paths to values (e.g., magic-folder roots to the names of
+    their folders) such that the value of the deepest root containing any
+    given path can be looked up in time proportional to the depth of that
+    path, rather than to the number of roots.
+    """
+
+    def __init__(self) -> None:
+        self._root: dict = {}
+        self._values: dict[str, str] = {}
+
+    @staticmethod
+    def _parts(path: str) -> list[str]:
+        return [p for p in os.path.normpath(path).split(os.sep) if p]
+
+    def add(self, path: str, value: str) -> None:
+        node = self._root
+        for part in self._parts(path):
+            node = node.setdefault(part, {})
+        node[None] = value
+        self._values[path] = value
+
+    def remove(self, path: str) -> None:
+        if self._values.pop(path, None) is None:
+            return
+        nodes = [self._root]
+        parts = self._parts(path)
+        for part in parts:
+            nodes.append(nodes[-1][part])
+        del nodes[-1][None]
+        # Prune any branches that no longer lead to a value
+        for part, node in zip(reversed(parts), reversed(nodes[:-1])):
+            if node[part]:
+                break
+            del node[part]
+
+    def lookup(self, path: str) -> Optional[str]:
+        node = self._root
+        value = node.get(None)
+        for part in self._parts(path):
+            if part not in node:
+                break
+            node = node[part]
+            value = node.get(None, value)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+# Event types that don't reflect a change to the contents of a folder
+# ("closed_no_write" and "opened" are only emitted by newer versions of
+# watchdog, hence the use of strings rather than watchdog's constants).
+IGNORED_EVENT_TYPES = frozenset({"opened", "closed_no_write"})
+
+# Filename patterns for files that magic-folder itself creates (e.g., when
+# resolving a conflict) or that are only written temporarily (e.g., by
+# editors, while saving). Changes to these files alone won't result in an
+# upload and so shouldn't trigger a scan.
+IGNORED_FILENAME_PATTERNS = (
+    "*.backup",
+    "*.conflict-*",
+    "*.tmp",
+    "*.part",
+    "*.swp",
+    "*~",
+    ".#*",
+)
+_ignored_filename = re.compile(
+    "|".join(translate(p) for p in IGNORED_FILENAME_PATTERNS)
+).match
+
+
+def is_ignored_path(path: str) -> bool:
+    return bool(_ignored_filename(os.path.basename(path)))
+
+
+def is_relevant_event(event: FileSystemEvent) -> bool:
+    """
+    Return whether ``event`` could reflect a change that a scan of its
+    magic-folder would pick up.
+    """
+    if event.event_type in IGNORED_EVENT_TYPES:
+        return False
+    if event.is_directory and event.event_type == "modified":
+        # The (mtime of the) directory changed because one of its children
+        # did, which will have been reported as an event of its own.
+        return False
+    if not is_ignored_path(os.fsdecode(event.src_path)):
+        return True
+    # A temporary file renamed to a regular one (e.g., by an "atomic" save)
+    return bool(
+        event.event_type == "moved"
+        and not is_ignored_path(os.fsdecode(getattr(event, "dest_path", "")))
+    )
+
+
+@attr.s
+class WatchdogStats:
+    """
+    :ivar events: The number of filesystem events received by the observer
+        thread.
+
+    :ivar ignored: The number of events that were discarded as irrelevant.
+
+    :ivar notified: The number of notifications sent to the main thread.
+    """
+
+    events: int = attr.ib(default=0)
+    ignored: int = attr.ib(default=0)
+    notified: int = attr.ib(default=0)
+
+
 class _WatchdogEventHandler(FileSystemEventHandler):
-    def __init__(self, watchdog: Watchdog, path: str):
+    def __init__(self, watchdog: Watchdog):
         super().__init__()
         self._watchdog = watchdog
-        self._path = path
 
     def on_any_event(self, event: FileSystemEvent) -> None:
-        self._watchdog.path_modified.emit(self._path)
+        self._watchdog.on_event(event)
 
 
 class Watchdog(QObject):
+    """
+    Watch the roots of magic-folders for changes and emit ``path_modified``
+    (with the path of the root that changed) when they happen.
+
+    Events are classified in watchdog's observer thread: irrelevant events
+    (see ``is_relevant_event``) are dropped and each remaining event is
+    attributed to the deepest watched root that contains it. A root is then
+    marked as "dirty" and, only if it wasn't already, a notification is
+    queued for the main thread; that root stays dirty (and further events
+    for it are absorbed) until the notification has been delivered. As a
+    result, a burst of thousands of events produces a handful of signals
+    rather than one per event.
+    """
 
     path_modified = Signal(str)
 
+    _root_dirtied = Signal(str)
+
     def __init__(self) -> None:
         super().__init__()
         self._observer = Observer()
         self._watches: dict[str, ObservedWatch] = {}
+        self._roots = PathTrie()
+        self._dirty: set[str] = set()
+        self._lock = Lock()
+        self.stats = WatchdogStats()
+        # Always queued so that, even if emitted from the main thread, the
+        # notification is delivered (and the root marked clean) later on.
+        self._root_dirtied.connect(  # type: ignore
+            self._on_root_dirtied, Qt.QueuedConnection
+        )
+
+    def _mark_dirty(self, path: str) -> Optional[str]:
+        # Called with self._lock held. Returns the root to notify, if any.
+        root = self._roots.lookup(path)
+        if root is None or root in self._dirty:
+            return None
+        self._dirty.add(root)
+        self.stats.notified += 1
+        return root
+
+    def on_event(self, event: FileSystemEvent) -> None:
+        # Called from the observer thread
+        paths = [os.fsdecode(event.src_path)]
+        dest_path = os.fsdecode(getattr(event, "dest_path", ""))
+        if dest_path:
+            paths.append(dest_path)
+        with self._lock:
+            self.stats.events += 1
+            if not is_relevant_event(event):
+                self.stats.ignored += 1
+                return
+            roots = [self._mark_dirty(path) for path in paths]
+        for root in roots:
+            if root is not None:
+                self._root_dirtied.emit(root)
+
+    def _on_root_dirtied(self, root: str) -> None:
+        with self._lock:
+            self._dirty.discard(root)
+        self.path_modified.emit(root)
 
     def add_watch(self, path: str) -> None:
         logging.debug("Scheduling watch for %s...", path)
         self._watches[path] = self._observer.schedule(
-            _WatchdogEventHandler(self, path), path, recursive=True
+            _WatchdogEventHandler(self), path, recursive=True
         )
+        with self._lock:
+            self._roots.add(path, path)
         logging.debug("Watch scheduled for %s", path)
 
     def remove_watch(self, path: str) -> None:
         logging.debug("Unscheduling watch for %s...", path)
+        with self._lock:
+            self._roots.remove(path)
+            self._dirty.discard(path)
         self._observer.unschedule(self._watches.get(path))
         try:
             del self._watches[path]
@@ -4,14 +4,17 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+from functools import partial
 from typing import TYPE_CHECKING, Callable, Optional
 
 import treq
 from autobahn.twisted.websocket import create_client_agent
-from twisted.internet.defer import Deferred, inlineCallbacks
+from twisted.internet.defer import Deferred, gatherResults, inlineCallbacks
 
+from gridsync.crypto import trunchash
 from gridsync.errors import TahoeWebError
 from gridsync.types import TwistedDeferred
+from gridsync.util import gather_limited, unwrap_first_error
 from gridsync.voucher import generate_voucher
 
 if TYPE_CHECKING:
@@ -31,6 +34,14 @@ class ZKAPAuthorizer:
         # Default batch-size from zkapauthorizer.resource.NUM_TOKENS
         self.zkap_batch_size: int = 2**15
         self._recovery_capability: str = ""
+        # The maximum number of directories (or magic-folders) whose sizes
+        # will be read concurrently when calculating the price
+        self.sizes_concurrency: int = 8
+        # Maps each dircap to the sizes that were last computed from its
+        # "?t=json" content, along with the version of that directory in
+        # the gateway's directory cache at the time (which changes whenever
+        # the directory is modified through this gateway)
+        self._dircap_sizes: dict[str, tuple[int, list[int]]] = {}
 
         # XXX/TODO: Move this later?
         gateway.monitor.zkaps_redeemed.connect(lambda _: self.backup_zkaps())
@@ -55,7 +66,7 @@ class ZKAPAuthorizer:
     def _request(
         self, method: str, path: str, data: Optional[bytes] = None
     ) -> TwistedDeferred[tuple[int, str]]:
-        resp = yield treq.request(
+        resp = yield self.gateway.http_client.request(
             method,
             f"{self.gateway.nodeurl}storage-plugins/{PLUGIN_NAME}{path}",
             headers={
@@ -78,12 +89,31 @@ class ZKAPAuthorizer:
 
     @inlineCallbacks
     def _get_content(self, cap: str) -> TwistedDeferred[bytes]:
-        resp = yield treq.get(f"{self.gateway.nodeurl}uri/{cap}")
+        resp = yield self.gateway.http_client.get(
+            f"{self.gateway.nodeurl}uri/{cap}"
+        )
         if resp.code == 200:
             content = yield treq.content(resp)
             return content
         raise TahoeWebError(f"Error getting cap content: {resp.code}")
 
+    async def _get_dircap_sizes(self, dircap: str) -> list[int]:
+        version = self.gateway.dircache.version(dircap)
+        cached = self._dircap_sizes.get(dircap)
+        if cached and cached[0] == version:
+            return cached[1]
+        content = await self.gateway.get_json_content(dircap)
+        if content is None:
+            raise TahoeWebError(f"Error getting sizes of {trunchash(dircap)}")
+        sizes = [len(content)]
+        dircap_data = json.loads(content.decode("utf-8"))
+        for data in dircap_data[1]["children"].values():
+            size = data[1].get("size", 0)
+            if size:
+                sizes.append(size)
+        self._dircap_sizes[dircap] = (version, sizes)
+        return sizes
+
     @inlineCallbacks
     def get_sizes(self) -> TwistedDeferred[list[Optional[int]]]:
         sizes: list = []
@@ -93,23 +123,30 @@ class ZKAPAuthorizer:
             return sizes
         sizes.append(len(rootcap_bytes))
         rootcap_data = json.loads(rootcap_bytes.decode("utf-8"))
+        dircaps = []
         if rootcap_data:
-            dircaps = []
             for data in rootcap_data[1]["children"].values():
                 rw_uri = data[1].get("rw_uri", "")
                 if rw_uri:  # Only care about dirs the user can write to
                     dircaps.append(rw_uri)
-            for dircap in dircaps:
-                dircap_bytes = yield self._get_content(f"{dircap}/?t=json")
-                sizes.append(len(dircap_bytes))
-                dircap_data = json.loads(dircap_bytes.decode("utf-8"))
-                for data in dircap_data[1]["children"].values():
-                    size = data[1].get("size", 0)
-                    if size:
-                        sizes.append(size)
-        mf_sizes = yield Deferred.fromCoroutine(
-            self.gateway.magic_folder.get_all_object_sizes()
-        )
+        for dircap in set(self._dircap_sizes) - set(dircaps):
+            del self._dircap_sizes[dircap]
+        dircap_sizes, mf_sizes = yield gatherResults(
+            [
+                gather_limited(
+                    [partial(self._get_dircap_sizes, d) for d in dircaps],
+                    self.sizes_concurrency,
+                ),
+                Deferred.fromCoroutine(
+                    self.gateway.magic_folder.get_all_object_sizes(
+                        self.sizes_concurrency
+                    )
+                ),
+            ],
+            consumeErrors=True,
+        ).addErrback(unwrap_first_error)
+        for dircap_size in dircap_sizes:
+            sizes.extend(dircap_size)
         sizes.extend(mf_sizes)
         return sizes
 
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Measure the throughput (in lines per second) of filtering an eliot log
+sequentially and in parallel, across a pool of worker processes.
+
+Usage: bench_eliot_filters.py [NUM_LINES] [NUM_WORKERS]
+
+A synthetic eliot log of NUM_LINES lines (default: 500000) is generated,
+split into chunks of (approximately) gridsync.log.LOG_CHUNK_SIZE bytes,
+and filtered with ``gridsync.filter.apply_eliot_filters_chunked``, first
+without and then with a pool of NUM_WORKERS processes (default:
+gridsync.filter.ELIOT_FILTER_WORKERS).
+"""
+
+import io
+import json
+import sys
+import time
+
+from gridsync.filter import (
+    ELIOT_FILTER_WORKERS,
+    apply_eliot_filters_chunked,
+    json_loads,
+    make_eliot_filter_executor,
+)
+from gridsync.log import LOG_CHUNK_SIZE
+
+ACTIONS = [
+    {"action_type": "magic-folder:notified", "path": "/home/alice/Cats/{}"},
+    {"action_type": "magic-folder:process-item", "item": {"relpath": "{}"}},
+    {"message_type": "magic-folder:maybe-upload", "relpath": "Cats/{}"},
+    {"action_type": "dirnode:add-file", "name": "{}.jpg"},
+    {"message_type": "processing", "info": "uploading {}"},
+]
+
+
+def make_log(num_lines):
+    lines = []
+    for i in range(num_lines):
+        template = ACTIONS[i % len(ACTIONS)]
+        msg = json.loads(json.dumps(template).replace("{}", str(i)))
+        msg.update(
+            {
+                "timestamp": 1640995200.0 + i,
+                "task_uuid": f"{i:032x}",
+                "task_level": [1, 2],
+                "action_status": "started",
+            }
+        )
+        lines.append(json.dumps(msg))
+    return "\n".join(lines) + "\n"
+
+
+def chunk(log):
+    f = io.StringIO(log)
+    while True:
+        lines = f.readlines(LOG_CHUNK_SIZE)
+        if not lines:
+            return
+        yield "".join(lines)
+
+
+def run(log, num_lines, executor=None):
+    start = time.perf_counter()
+    results = list(apply_eliot_filters_chunked(chunk(log), "1", executor))
+    elapsed = time.perf_counter() - start
+    return results, elapsed, num_lines / elapsed
+
+
+def main():
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    num_workers = num_workers or ELIOT_FILTER_WORKERS
+    print(f"JSON decoder: {json_loads.__module__}")
+    print(f"Generating {num_lines} lines...")
+    log = make_log(num_lines)
+    print(f"{len(log) / 1_000_000:.1f}MB")
+
+    sequential, elapsed, rate = run(log, num_lines)
+    print(f"Sequential:           {elapsed:.3f}s ({rate:,.0f} lines/s)")
+
+    with make_eliot_filter_executor(num_workers) as executor:
+        # Start the worker processes before timing
+        list(executor.map(abs, range(num_workers * 4)))
+        parallel, elapsed, rate = run(log, num_lines, executor)
+    print(
+        f"Parallel ({num_workers} workers): {elapsed:.3f}s "
+        f"({rate:,.0f} lines/s)"
+    )
+    print(f"Outputs identical: {sequential == parallel}")
+
+
+if __name__ == "__main__":
+    main()
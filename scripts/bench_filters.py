@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Compare the time taken to mask secrets in a large log with
+``gridsync.filter.apply_filters`` against that taken by the previous
+implementation (one ``str.replace`` call per filter).
+
+Usage: bench_filters.py [SIZE_MB] [NUM_GATEWAYS] [NUM_FOLDERS]
+
+A synthetic log of SIZE_MB megabytes (default: 100) is generated in which
+roughly one line in ten contains a secret. The filter list mirrors that
+returned by ``get_filters`` for NUM_GATEWAYS gateways (default: 3), each
+with 10 storage servers and NUM_FOLDERS magic-folders (default: 20).
+"""
+
+import random
+import string
+import sys
+import time
+
+from gridsync.filter import _compile_filters, apply_filters
+
+
+def apply_filters_sequentially(in_str, filters):
+    filtered = in_str
+    for s, mask in filters:
+        if s and mask:
+            filtered = filtered.replace(s, "<Filtered:{}>".format(mask))
+    return filtered
+
+
+def _random_str(length):
+    return "".join(random.choices(string.ascii_lowercase, k=length))
+
+
+def _cap(kind):
+    return f"URI:{kind}:{_random_str(26)}:{_random_str(52)}"
+
+
+def make_filters(num_gateways, num_folders):
+    filters = [
+        ("/opt/Gridsync/lib", "PkgDir"),
+        ("/home/alice/.config/gridsync", "ConfigDir"),
+        (
+            "/home/alice/.config/autostart/Gridsync.desktop",
+            "AutostartFilePath",
+        ),
+    ]
+    for g in range(1, num_gateways + 1):
+        filters.append((f"Grid{g}", f"GatewayName:{g}"))
+        filters.append((_cap("NEWS"), f"Newscap:{g}"))
+        filters.append(("/opt/Gridsync/tahoe", "TahoeExecutablePath"))
+        filters.append((_cap("DIR2"), f"Rootcap:{g}"))
+        filters.append((f"pb://{_random_str(32)}@intro", f"Introducer:{g}"))
+        for s in range(1, 11):
+            filters.append(
+                (f"pb://{_random_str(32)}@storage{s}", f"Furl:{g}:{s}")
+            )
+            filters.append((f"v0-{_random_str(52)}", f"Server:{g}:{s}"))
+        for f in range(1, num_folders + 1):
+            filters.append((_cap("DIR2"), f"Folder:{g}:{f}:Collective"))
+            filters.append((_cap("DIR2"), f"Folder:{g}:{f}:Upload"))
+            filters.append((f"/home/alice/Folder{g}-{f}", f"Folder:{g}:{f}"))
+            filters.append((f"Folder{g}-{f}", f"Folder:{g}:{f}:Name"))
+            filters.append((f"Author{g}-{f}", f"Folder:{g}:{f}:Author"))
+            filters.append((_random_str(44) + "=", f"Folder:{g}:{f}:Sign"))
+            filters.append((_random_str(44) + "=", f"Folder:{g}:{f}:Verify"))
+    filters.append(("/home/alice", "HomeDir"))
+    return filters
+
+
+def make_log(size, filters):
+    secrets = [s for s, _ in filters]
+    lines = []
+    total = 0
+    while total < size:
+        line = f"2022-01-01T00:00:00 DEBUG func {_random_str(80)}"
+        if random.random() < 0.1:
+            line += " " + random.choice(secrets)
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+def _time(f, *args):
+    start = time.perf_counter()
+    result = f(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    num_gateways = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    num_folders = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    random.seed(0)
+    filters = make_filters(num_gateways, num_folders)
+    print(f"Generating {size_mb}MB log; {len(filters)} filters...")
+    log = make_log(size_mb * 1_000_000, filters)
+
+    old, old_elapsed = _time(apply_filters_sequentially, log, filters)
+    print(f"str.replace per filter:  {old_elapsed:.3f}s")
+
+    _compile_filters.cache_clear()
+    _, compile_elapsed = _time(_compile_filters, tuple(filters))
+    print(f"Compiling pattern:       {compile_elapsed:.3f}s")
+    new, new_elapsed = _time(apply_filters, log, filters)
+    print(f"Single-pass (cached):    {new_elapsed:.3f}s")
+    print(f"Speedup: {old_elapsed / new_elapsed:.1f}x")
+    # The outputs can legitimately differ where one secret contains another
+    # (e.g., HomeDir and ConfigDir, or "/home/alice/Folder1-1" and
+    # "/home/alice/Folder1-10"): the sequential implementation masks
+    # whichever comes first in the filter list (possibly leaving part of the
+    # other unmasked), the single-pass one masks the longer of the two.
+    print(f"Outputs identical: {old == new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Replay a stream of Magic-Folder ``/v1/status`` messages through
+``MagicFolderMonitor`` and report how long it takes to process them.
+
+Usage: bench_magic_folder_monitor.py [STREAM_FILE]
+
+STREAM_FILE should contain one recorded status message (as received over
+the WebSocket) per line. If it is omitted, a synthetic stream simulating a
+bulk upload across several folders is generated instead.
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gridsync.magic_folder import MagicFolder
+from gridsync.tahoe import Tahoe
+
+NUM_FOLDERS = 24
+NUM_FILES = 1000
+BATCH_SIZE = 100
+
+
+def _folder_state(uploads):
+    return {
+        "uploads": [
+            {"relpath": relpath, "queued-at": 1.0, "started-at": 2.0}
+            for relpath in uploads
+        ],
+        "downloads": [],
+        "errors": [],
+        "recent": [],
+        "tahoe": {"happy": True, "connected": 5, "desired": 5},
+        "scanner": {"last-scan": 1.0},
+        "poller": {"last-poll": 1.0},
+    }
+
+
+def synthetic_stream():
+    files = [f"file-{i:06}.dat" for i in range(NUM_FILES)]
+    folders = {f"Folder{i}": list(files) for i in range(NUM_FOLDERS)}
+    messages = []
+    # Drain the upload queues of each folder in turn, one batch per message
+    for name in folders:
+        while folders[name]:
+            folders[name] = folders[name][BATCH_SIZE:]
+            state = {
+                "synchronizing": True,
+                "folders": {n: _folder_state(u) for n, u in folders.items()},
+            }
+            messages.append(json.dumps({"state": state}))
+    return messages
+
+
+async def _noop():
+    pass
+
+
+def main():
+    if len(sys.argv) > 1:
+        messages = Path(sys.argv[1]).read_text("utf-8").splitlines()
+    else:
+        messages = synthetic_stream()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gateway = Tahoe(str(Path(tmpdir, "nodedir")))
+        monitor = MagicFolder(gateway, enable_logging=False).monitor
+        monitor.do_check = _noop
+        start = time.perf_counter()
+        for message in messages:
+            monitor.on_status_message_received(message)
+        elapsed = time.perf_counter() - start
+    print(
+        f"Replayed {len(messages)} messages in {elapsed:.3f}s "
+        f"({len(messages) / elapsed:.1f} messages/s, "
+        f"{elapsed / len(messages) * 1000:.3f}ms/message)"
+    )
+
+
+if __name__ == "__main__":
+    main()
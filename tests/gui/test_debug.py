@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from io import BytesIO
 from unittest.mock import Mock
 
 import pytest
@@ -20,25 +21,100 @@ def core():
     fake_gateway.name = "TestGridOne"
     fake_gateway.newscap = "URI:NEWSCAP"
     fake_gateway.magic_folder = Mock()
-    fake_gateway.magic_folder.get_log = Mock(return_value='{"test": 123}')
+    fake_gateway.magic_folder.iter_log = Mock(
+        side_effect=lambda name: iter(['{"test": 123}'])
+    )
     fake_gateway.magic_folder.magic_folders = {}
-    fake_gateway.get_log = Mock(return_value='{"test": 123}')
+    fake_gateway.magic_folder.get_log_size = Mock(return_value=13)
+    fake_gateway.get_log_size = Mock(return_value=13)
+    fake_gateway.iter_log = Mock(
+        side_effect=lambda name: iter(['{"test": 123}'])
+    )
     fake_gateway.get_settings = Mock(return_value={})
     fake_core.gateways = [fake_gateway]
     fake_core.gui.main_window.gateways = fake_core.gateways
     return fake_core
 
 
+def set_content(log_loader, content, filtered_content):
+    content = content.encode("utf-8")
+    filtered_content = filtered_content.encode("utf-8")
+    log_loader._files = {
+        False: BytesIO(content),
+        True: BytesIO(filtered_content),
+    }
+    log_loader._sizes = {False: len(content), True: len(filtered_content)}
+
+
+def load(log_loader):
+    log_loader.load()
+    log_loader.swap_files()
+
+
 def test_log_loader_load_content(core):
     log_loader = LogLoader(core)
-    log_loader.load()
-    assert core.gateways[0].name in log_loader.content
+    load(log_loader)
+    assert core.gateways[0].name in log_loader.read_page(False)[0]
 
 
 def test_log_loader_load_filtered_content(core):
     log_loader = LogLoader(core)
-    log_loader.load()
-    assert core.gateways[0].name not in log_loader.filtered_content
+    load(log_loader)
+    assert core.gateways[0].name not in log_loader.read_page(True)[0]
+
+
+def test_log_loader_load_omits_empty_logs(core):
+    core.gateways[0].iter_log = Mock(side_effect=lambda name: iter(()))
+    log_loader = LogLoader(core)
+    load(log_loader)
+    content = log_loader.read_page(False)[0]
+    assert "Tahoe-LAFS stdout log" not in content
+    assert "Magic-Folder stdout log" in content
+
+
+def test_log_loader_load_filters_each_chunk(core):
+    def iter_log(name):
+        if name == "eliot":
+            return iter(['{"test": 123}\n', '{"test": 456}'])
+        return iter(["TestGridOne\n", "x"])
+
+    core.gateways[0].iter_log = Mock(side_effect=iter_log)
+    log_loader = LogLoader(core)
+    load(log_loader)
+    content = log_loader.read_page(True)[0]
+    assert "<Filtered:GatewayName:1>\nx\n---" in content
+    assert '{"test": 123}\n{"test": 456}\n---' in content
+
+
+def test_log_loader_load_filters_eliot_chunks_in_order(core):
+    def iter_log(name):
+        if name == "eliot":
+            return iter([f'{{"test": {i}}}\n' for i in range(5)])
+        return iter(())
+
+    core.gateways[0].iter_log = Mock(side_effect=iter_log)
+    log_loader = LogLoader(core, eliot_filter_workers=2)
+    load(log_loader)
+    content = log_loader.read_page(True)[0]
+    expected = "".join(f'{{"test": {i}}}\n' for i in range(5))
+    assert f"Tahoe-LAFS eliot log {'-' * 20}\n{expected}---" in content
+
+
+def test_log_loader_read_page_ends_on_line_boundary():
+    log_loader = LogLoader(None)
+    set_content(log_loader, "aaa\nbbb\nccc\n", "")
+    text, offset = log_loader.read_page(False, 0, page_size=5)
+    assert (text, offset) == ("aaa\nbbb\n", 8)
+    assert log_loader.read_page(False, offset, page_size=5) == ("ccc\n", 12)
+
+
+def test_log_loader_export(tmpdir):
+    log_loader = LogLoader(None, chunk_size=3)
+    set_content(log_loader, "unfiltered" * 10, "filtered" * 10)
+    dest = str(tmpdir.join("log.txt"))
+    log_loader.export(dest, True)
+    with open(dest) as f:
+        assert f.read() == "filtered" * 10
 
 
 @pytest.mark.parametrize(
@@ -53,8 +129,7 @@ def test_debug_exporter_on_checkbox_state_changed_toggle_content(
     checkbox_state, expected_content
 ):
     de = DebugExporter(None)
-    de.log_loader.content = "unfiltered"
-    de.log_loader.filtered_content = "filtered"
+    set_content(de.log_loader, "unfiltered", "filtered")
     de.on_checkbox_state_changed(checkbox_state)
     assert de.plaintextedit.toPlainText() == expected_content
 
@@ -130,7 +205,7 @@ def test_debug_exporter_export_to_file_no_dest_return(monkeypatch, tmpdir):
 def test_debug_exporter_export_to_file_success(monkeypatch, tmpdir):
     de = DebugExporter(None)
     expected_content = "EXPECTED_CONTENT"
-    de.plaintextedit.setPlainText(expected_content)
+    set_content(de.log_loader, "UNFILTERED_CONTENT", expected_content)
     dest = str(tmpdir.join("log.txt"))
     fake_get_save_file_name = Mock(return_value=(dest, None))
     monkeypatch.setattr(
@@ -151,11 +226,175 @@ def test_debug_exporter_export_to_file_failure(monkeypatch, tmpdir):
         "gridsync.gui.debug.QFileDialog.getSaveFileName", fake_getSaveFileName
     )
     error_message = "Something Bad Happened"
-    fake_to_plain_text = Mock(side_effect=OSError(error_message))
-    monkeypatch.setattr(
-        "gridsync.gui.debug.QPlainTextEdit.toPlainText", fake_to_plain_text
-    )
+    fake_atomic_write = Mock(side_effect=OSError(error_message))
+    monkeypatch.setattr("gridsync.gui.debug.atomic_write", fake_atomic_write)
     fake_error = Mock()
     monkeypatch.setattr("gridsync.gui.debug.error", fake_error)
     de.export_to_file()
     assert fake_error.call_args[0][2] == error_message
+
+
+def test_debug_exporter_shows_first_page_only(monkeypatch):
+    monkeypatch.setattr("gridsync.gui.debug.PAGE_SIZE", 10)
+    de = DebugExporter(None)
+    set_content(de.log_loader, "", "".join(f"line {i}\n" for i in range(9)))
+    de.on_checkbox_state_changed(Qt.Checked)
+    assert de.plaintextedit.toPlainText() == "line 0\nline 1\n"
+
+
+def test_debug_exporter_loads_next_page_when_scrolled_to_bottom(monkeypatch):
+    monkeypatch.setattr("gridsync.gui.debug.PAGE_SIZE", 10)
+    de = DebugExporter(None)
+    set_content(de.log_loader, "", "".join(f"line {i}\n" for i in range(9)))
+    de.on_checkbox_state_changed(Qt.Checked)
+    de.on_scrollbar_value_changed(de.scrollbar.maximum())
+    assert de.plaintextedit.toPlainText() == "line 0\nline 1\nline 2\nline 3\n"
+
+
+def test_debug_exporter_copy_to_clipboard_copies_all_pages(monkeypatch):
+    monkeypatch.setattr("gridsync.gui.debug.PAGE_SIZE", 10)
+    de = DebugExporter(None)
+    content = "".join(f"line {i}\n" for i in range(9))
+    set_content(de.log_loader, "", content)
+    de.on_checkbox_state_changed(Qt.Checked)
+    fake_set_clipboard_text = Mock()
+    monkeypatch.setattr(
+        "gridsync.gui.debug.set_clipboard_text", fake_set_clipboard_text
+    )
+    monkeypatch.setattr("gridsync.gui.debug.get_clipboard_modes", lambda: [1])
+    de.copy_to_clipboard()
+    assert fake_set_clipboard_text.call_args[0] == (content, 1)
+
+
+def test_log_loader_load_emits_progress_updated(core, qtbot):
+    log_loader = LogLoader(core)
+    progress = []
+    log_loader.progress_updated.connect(lambda *args: progress.append(args))
+    log_loader.load()
+    processed, total = progress[-1]
+    assert processed == total and total > 0
+
+
+def test_log_loader_cancel_emits_cancelled(core, qtbot):
+    log_loader = LogLoader(core)
+    log_loader.progress_updated.connect(lambda *args: log_loader.cancel())
+    done = []
+    log_loader.done.connect(lambda: done.append(True))
+    with qtbot.wait_signal(log_loader.cancelled):
+        log_loader.load()
+    assert not done
+
+
+def test_log_loader_cancel_keeps_previous_content(core):
+    log_loader = LogLoader(core)
+    set_content(log_loader, "previous", "previous")
+    log_loader.progress_updated.connect(lambda *args: log_loader.cancel())
+    log_loader.load()
+    assert log_loader.read_page(False)[0] == "previous"
+
+
+def test_log_loader_load_keeps_previous_content_until_swapped(core):
+    log_loader = LogLoader(core)
+    set_content(log_loader, "previous", "previous")
+    log_loader.load()
+    previous = log_loader.read_page(False)[0]
+    log_loader.swap_files()
+    assert previous == "previous"
+    assert core.gateways[0].name in log_loader.read_page(False)[0]
+
+
+def test_log_loader_load_reports_progress_in_bytes(core, monkeypatch):
+    monkeypatch.setattr("gridsync.gui.debug.log_size", lambda: 0)
+    monkeypatch.setattr(
+        "gridsync.gui.debug.iter_log", lambda chunk_size: iter(())
+    )
+    core.gateways[0].iter_log = Mock(
+        side_effect=lambda name: iter([] if name == "eliot" else ["é\n"])
+    )
+    core.gateways[0].get_log_size = Mock(
+        side_effect=lambda name: 0 if name == "eliot" else 3
+    )
+    core.gateways[0].magic_folder.iter_log = Mock(
+        side_effect=lambda name: iter(())
+    )
+    core.gateways[0].magic_folder.get_log_size = Mock(return_value=0)
+    log_loader = LogLoader(core)
+    progress = []
+    log_loader.progress_updated.connect(lambda *args: progress.append(args))
+    log_loader.load()
+    assert progress[-1] == (6, 6)
+
+
+def test_log_loader_load_emits_failed_on_error(core, qtbot):
+    core.gateways[0].iter_log = Mock(side_effect=OSError("Bad log"))
+    log_loader = LogLoader(core)
+    with qtbot.wait_signal(log_loader.failed) as blocker:
+        log_loader.load()
+    assert blocker.args == ["OSError: Bad log"]
+
+
+def test_debug_exporter_load_disables_buttons_while_loading(core):
+    de = DebugExporter(core)
+    de.log_loader_thread = Mock()
+    de.log_loader_thread.isRunning.return_value = False
+    de.load()
+    assert (
+        de.reload_button.isEnabled(),
+        de.copy_button.isEnabled(),
+        de.export_button.isEnabled(),
+        de.cancel_button.isHidden(),
+    ) == (False, False, False, False)
+
+
+def test_debug_exporter_on_progress_updated_sets_progress_bar():
+    de = DebugExporter(None)
+    de.on_progress_updated(25, 100)
+    assert de.progress_bar.value() == 25
+
+
+def test_debug_exporter_on_cancelled_shows_message():
+    de = DebugExporter(None)
+    de.log_loader_thread = Mock()
+    de.on_cancelled()
+    assert de.plaintextedit.toPlainText() == "Loading cancelled."
+    assert not de.export_button.isEnabled()
+
+
+def test_debug_exporter_on_cancelled_keeps_previous_content():
+    de = DebugExporter(None)
+    de.log_loader_thread = Mock()
+    set_content(de.log_loader, "previous", "previous")
+    de.on_checkbox_state_changed(Qt.Checked)
+    de.on_cancelled()
+    assert de.plaintextedit.toPlainText() == "previous"
+    assert de.export_button.isEnabled()
+
+
+def test_debug_exporter_on_failed_shows_message():
+    de = DebugExporter(None)
+    de.log_loader_thread = Mock()
+    de.on_failed("OSError: Bad log")
+    assert de.plaintextedit.toPlainText() == (
+        "Error loading logs: OSError: Bad log"
+    )
+
+
+def test_debug_exporter_reject_cancels_loading():
+    de = DebugExporter(None)
+    de.log_loader_thread = Mock()
+    de.log_loader_thread.isRunning.return_value = True
+    de.log_loader = Mock()
+    de.reject()
+    assert de.log_loader.cancel.called
+
+
+def test_debug_exporter_load_cancel(core, qtbot):
+    de = DebugExporter(core)
+    # Cancel from the loader's thread so that loading can't finish first
+    de.log_loader.progress_updated.connect(
+        de.log_loader.cancel, Qt.DirectConnection
+    )
+    with qtbot.wait_signal(de.log_loader.cancelled):
+        de.load()
+    qtbot.wait_until(lambda: not de.log_loader_thread.isRunning())
+    assert de.reload_button.isEnabled()
@@ -5,218 +5,276 @@ import shutil
 from unittest.mock import MagicMock, call
 
 import pytest
+from qtpy.QtCore import QPoint, Qt
+from qtpy.QtGui import QIcon, QImage, QPixmap
 
 from gridsync.gui.history import (
-    HistoryItemWidget,
-    HistoryListWidget,
+    HISTORY_ITEM_ROLE,
+    HistoryItem,
+    HistoryListView,
+    HistoryModel,
     HistoryView,
 )
+from gridsync.gui.thumbnail import ThumbnailCache, ThumbnailService
 
 
-@pytest.fixture(scope="function")
-def hiw(tmpdir_factory):
+def _data(path="pixel.png", mtime=123456789, member="admin", **kwargs):
+    data = {
+        "action": "added",
+        "member": member,
+        "mtime": mtime,
+        "path": path,
+        "size": 0,
+    }
+    data.update(kwargs)
+    return data
+
+
+@pytest.fixture()
+def thumbnail_service(tmp_path):
+    service = ThumbnailService(ThumbnailCache(str(tmp_path / "thumbnails")))
+    yield service
+    service.wait()
+
+
+@pytest.fixture(autouse=True)
+def _thumbnail_service(thumbnail_service, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.gui.history.get_thumbnail_service",
+        lambda: thumbnail_service,
+    )
+
+
+@pytest.fixture()
+def pixel(tmp_path):
     src = os.path.join(os.getcwd(), "gridsync", "resources", "pixel.png")
-    dst = str(tmpdir_factory.mktemp("test-magic-folder"))
+    dst = str(tmp_path / "pixel.png")
     shutil.copy(src, dst)
-    gateway = MagicMock()
-    gateway.get_magic_folder_directory.return_value = dst
-    return HistoryItemWidget(
-        gateway,
-        {
-            "action": "added",
-            "member": "admin",
-            "mtime": 123456789,
-            "path": "pixel.png",
-            "size": 0,
-        },
-        HistoryListWidget(gateway),
-    )
+    return dst
 
 
-def test_history_item_widget_init(hiw):
-    assert hiw
+def _paths(model):
+    return [model.item(row).path for row in range(model.rowCount())]
 
 
-def test_history_item_widget__do_load_thumbnail(hiw):
-    hiw._do_load_thumbnail()
-    assert hiw.icon.pixmap() is not None
+def test_history_item_deleted_if_size_is_none():
+    item = HistoryItem(_data(size=None))
+    assert (item.action, item.size) == ("Deleted", 0)
 
 
-def test_history_item_widget_load_thumbnail(hiw, monkeypatch):
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryItemWidget.isVisible", lambda _: True
-    )
-    hiw.load_thumbnail()
-    assert hiw._thumbnail_loaded is True
+def test_history_item_details():
+    item = HistoryItem(_data(action="updated"))
+    assert item.details().startswith("Updated ")
 
 
-def test_history_item_widget_unhilight(hiw):
-    hiw.button.show()
-    hiw.unhighlight()
-    assert hiw.button.isHidden()
+def test_history_model_add_item():
+    model = HistoryModel()
+    model.add_item(_data())
+    assert model.rowCount() == 1
 
 
-def test_history_item_widget_enter_event(hiw):
-    hiw.enterEvent(None)
-    assert hiw.parent().highlighted == hiw
+def test_history_model_add_item_deduplicate():
+    model = HistoryModel()
+    model.add_item(_data(mtime=123456788))
+    model.add_item(_data(mtime=123456789))
+    assert (model.rowCount(), model.item(0).mtime) == (1, 123456789)
 
 
-def test_history_item_widget_enter_event_call_unhighlight(hiw):
-    m = MagicMock()
-    hiw.parent().highlighted = m
-    hiw.enterEvent(None)
-    assert m.method_calls == [call.unhighlight()]
+def test_history_model_add_item_keeps_different_members():
+    model = HistoryModel()
+    model.add_item(_data(member="alice"))
+    model.add_item(_data(member="bob"))
+    assert model.rowCount() == 2
+
+
+def test_history_model_add_item_without_deduplicate():
+    model = HistoryModel(deduplicate=False)
+    model.add_item(_data(mtime=1))
+    model.add_item(_data(mtime=2))
+    assert model.rowCount() == 2
+
+
+def test_history_model_orders_items_newest_first():
+    model = HistoryModel()
+    for path, mtime in [("b", 2), ("d", 4), ("a", 1), ("c", 3)]:
+        model.add_item(_data(path=path, mtime=mtime))
+    assert _paths(model) == ["d", "c", "b", "a"]
+
+
+def test_history_model_inserts_ties_on_top():
+    model = HistoryModel()
+    model.add_item(_data(path="a", mtime=1))
+    model.add_item(_data(path="b", mtime=1))
+    assert _paths(model) == ["b", "a"]
+
+
+def test_history_model_reorders_deduplicated_item():
+    model = HistoryModel()
+    for path, mtime in [("a", 1), ("b", 2), ("c", 3)]:
+        model.add_item(_data(path=path, mtime=mtime))
+    model.add_item(_data(path="a", mtime=4))
+    assert _paths(model) == ["a", "c", "b"]
+
+
+def test_history_model_drops_oldest_items_beyond_max_items():
+    model = HistoryModel(max_items=3)
+    for mtime in range(10):
+        model.add_item(_data(path=str(mtime), mtime=mtime))
+    assert _paths(model) == ["9", "8", "7"]
+
+
+def test_history_model_ignores_items_older_than_retained_items():
+    model = HistoryModel(max_items=2)
+    model.add_item(_data(path="b", mtime=2))
+    model.add_item(_data(path="c", mtime=3))
+    model.add_item(_data(path="a", mtime=1))
+    assert _paths(model) == ["c", "b"]
+
+
+def test_history_model_forgets_dropped_items():
+    model = HistoryModel(max_items=1)
+    model.add_item(_data(path="a", mtime=1))
+    model.add_item(_data(path="b", mtime=2))
+    assert list(model._index) == [("b", "admin")]
+
+
+def test_history_model_data_roles():
+    model = HistoryModel()
+    model.add_item(_data(path="/Folder/pixel.png"))
+    index = model.index(0)
+    assert (
+        index.data(Qt.DisplayRole),
+        index.data(Qt.ToolTipRole).startswith("/Folder/pixel.png"),
+        isinstance(index.data(Qt.DecorationRole), QIcon),
+        index.data(HISTORY_ITEM_ROLE) is model.item(0),
+    ) == ("pixel.png", True, True, True)
+
+
+def test_history_model_data_invalid_index_returns_none():
+    assert HistoryModel().data(HistoryModel().index(5)) is None
+
+
+def test_history_model_load_thumbnail(pixel, thumbnail_service, qtbot):
+    model = HistoryModel(thumbnail_service=thumbnail_service)
+    model.add_item(_data(path=pixel))
+    with qtbot.wait_signal(model.dataChanged):
+        model.load_thumbnail(0)
+    assert isinstance(model.index(0).data(Qt.DecorationRole), QPixmap)
 
 
-def test_history_item_widget_enter_event_pass_runtime_error(hiw):
-    hiw.parent().highlighted = MagicMock()
-    hiw.parent().highlighted.unhighlight = MagicMock(side_effect=RuntimeError)
-    hiw.enterEvent(None)
-    assert hiw.parent().highlighted == hiw
+def test_history_model_load_thumbnail_only_once():
+    service = MagicMock()
+    model = HistoryModel(thumbnail_service=service)
+    model.add_item(_data())
+    model.load_thumbnail(0)
+    model.load_thumbnail(0)
+    assert service.request.mock_calls == [call("pixel.png")]
+
+
+def test_history_model_load_thumbnail_without_service():
+    model = HistoryModel()
+    model.add_item(_data())
+    model.load_thumbnail(0)
+    assert isinstance(model.index(0).data(Qt.DecorationRole), QIcon)
+
+
+def test_history_model_thumbnail_for_removed_item(pixel, thumbnail_service):
+    model = HistoryModel(max_items=1, thumbnail_service=thumbnail_service)
+    model.add_item(_data(path=pixel, mtime=1))
+    model.load_thumbnail(0)
+    model.add_item(_data(path="/Folder/file.txt", mtime=2))
+    model._on_thumbnail_ready(pixel, QImage(pixel))
+    assert model.item(0).thumbnail is None
+
+
+def test_history_model_thumbnail_for_duplicate_items(pixel):
+    model = HistoryModel(deduplicate=False, thumbnail_service=MagicMock())
+    model.add_item(_data(path=pixel, mtime=1))
+    model.add_item(_data(path=pixel, mtime=2))
+    model.load_thumbnail(0)
+    model.load_thumbnail(1)
+    model._on_thumbnail_ready(pixel, QImage(pixel))
+    assert all(model.item(row).thumbnail for row in range(2))
 
 
 @pytest.fixture(scope="function")
-def hlw(tmpdir_factory):
+def hlv(tmpdir_factory):
     directory = str(tmpdir_factory.mktemp("test-magic-folder"))
     gateway = MagicMock()
     gateway.get_magic_folder_directory.return_value = directory
-    return HistoryListWidget(gateway)
+    return HistoryListView(gateway)
+
 
+def test_history_list_view_add_item(hlv):
+    hlv.add_item(_data())
+    assert hlv.model().rowCount() == 1
 
-def test_history_list_widget_on_double_click(hlw, monkeypatch):
+
+def test_history_list_view_on_double_click(hlv, monkeypatch):
     m = MagicMock()
     monkeypatch.setattr("gridsync.gui.history.open_enclosing_folder", m)
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.itemWidget",
-        MagicMock(
-            return_value=HistoryItemWidget(
-                hlw.gateway, {}, HistoryListWidget(hlw.gateway)
-            )
-        ),
-    )
-    hlw.on_double_click(None)
-    assert m.mock_calls
+    hlv.add_item(_data(path="/Folder/pixel.png"))
+    hlv.on_double_click(hlv.model().index(0))
+    assert m.mock_calls == [call("/Folder/pixel.png")]
 
 
-def test_history_list_widget_on_right_click(hlw, monkeypatch):
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.itemAt", MagicMock()
-    )
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.itemWidget",
-        MagicMock(
-            return_value=HistoryItemWidget(
-                hlw.gateway, {}, HistoryListWidget(hlw.gateway)
-            )
-        ),
-    )
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.viewport", MagicMock()
-    )
+def test_history_list_view_on_right_click(hlv, qtbot, monkeypatch):
+    qtbot.add_widget(hlv)
+    hlv.add_item(_data())
+    hlv.show()
     m = MagicMock()
     monkeypatch.setattr("gridsync.gui.history.QMenu", m)
-    hlw.on_right_click(None)
+    hlv.on_right_click(hlv.visualRect(hlv.model().index(0)).center())
     assert m.mock_calls
 
 
-def test_history_list_widget_on_right_click_no_item_return(hlw, monkeypatch):
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.itemAt", lambda x, y: None
-    )
+def test_history_list_view_on_right_click_no_item_return(hlv, monkeypatch):
     m = MagicMock()
     monkeypatch.setattr("gridsync.gui.history.QMenu", m)
-    hlw.on_right_click(None)
+    hlv.on_right_click(QPoint(1, 1))
     assert m.mock_calls == []
 
 
-def test_history_list_widget_add_item(hlw):
-    hlw.add_item(
-        {
-            "action": "added",
-            "member": "admin",
-            "mtime": 123456789,
-            "path": "pixel.png",
-            "size": 0,
-        },
-    )
-    assert hlw.count() == 1
-
-
-def test_history_list_widget_add_item_deduplicate(hlw):
-    hlw.add_item(
-        {
-            "action": "updated",
-            "member": "admin",
-            "mtime": 123456788,
-            "path": "pixel.png",
-            "size": 0,
-        },
-    )
-    hlw.add_item(
-        {
-            "action": "updated",
-            "member": "admin",
-            "mtime": 123456789,
-            "path": "pixel.png",
-            "size": 0,
-        },
-    )
-    assert hlw.count() == 1
-
-
-def test_history_list_widget_update_visible_widgets(hlw, monkeypatch):
-    hlw.add_item(
-        {
-            "action": "added",
-            "member": "admin",
-            "mtime": 99999,
-            "path": "pixel.png",
-            "size": 0,
-        },
-    )
+def test_history_list_view_update_visible_items(hlv, qtbot, monkeypatch):
+    qtbot.add_widget(hlv)
+    hlv.add_item(_data())
+    hlv.show()
     m = MagicMock()
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryItemWidget.update_text", m
-    )
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.isVisible", lambda _: True
-    )
-    hlw.update_visible_widgets()
-    assert m.mock_calls == [call()]
+    monkeypatch.setattr(hlv.history_model, "load_thumbnail", m)
+    hlv.update_visible_items()
+    assert m.mock_calls == [call(0)]
 
 
-def test_history_list_widget_update_visible_widgets_return(hlw, monkeypatch):
-    hlw.add_item(
-        {
-            "action": "added",
-            "member": "admin",
-            "mtime": 99999,
-            "path": "pixel.png",
-            "size": 0,
-        },
-    )
+def test_history_list_view_update_visible_items_return(hlv, monkeypatch):
+    hlv.add_item(_data())
     m = MagicMock()
+    monkeypatch.setattr(hlv.history_model, "load_thumbnail", m)
     monkeypatch.setattr(
-        "gridsync.gui.history.HistoryItemWidget.update_text", m
+        "gridsync.gui.history.HistoryListView.isVisible", lambda _: False
     )
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.isVisible", lambda _: False
-    )
-    hlw.update_visible_widgets()
+    hlv.update_visible_items()
     assert m.mock_calls == []
 
 
-def test_history_list_widget_update_visible_widgets_on_show_event(
-    hlw, monkeypatch
+def test_history_list_view_update_visible_items_on_show_event(
+    hlv, monkeypatch
 ):
     m = MagicMock()
     monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.update_visible_widgets", m
+        "gridsync.gui.history.HistoryListView.update_visible_items", m
     )
-    hlw.showEvent(None)
+    hlv.showEvent(None)
     assert m.mock_calls == [call()]
 
 
+def test_history_list_view_paints_items(hlv, qtbot, pixel):
+    qtbot.add_widget(hlv)
+    hlv.add_item(_data(path=pixel))
+    hlv.add_item(_data(path="/Folder/file.txt", size=None))
+    hlv.show()
+    assert not hlv.grab().isNull()
+
+
 def test_history_view_init():
     mock_gateway = MagicMock()
     mock_gateway.shares_happy = 1
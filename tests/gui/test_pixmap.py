@@ -4,7 +4,12 @@ Tests for ``gridsync.gui.pixmap``.
 from qtpy.QtGui import QPixmap
 
 from gridsync import resource
-from gridsync.gui.pixmap import BadgedPixmap, CompositePixmap, Pixmap
+from gridsync.gui.pixmap import (
+    BadgedPixmap,
+    CompositePixmap,
+    IconCache,
+    Pixmap,
+)
 
 
 def test_pixmap():
@@ -23,3 +28,59 @@ def test_badged_pixmap(gui):
     original = QPixmap(resource("gridsync.png"))
     badged = BadgedPixmap(original, "test")
     assert badged != original
+
+
+def test_icon_cache_file_icon_keyed_by_suffix(gui, tmp_path):
+    cache = IconCache()
+    a = cache.file_icon(str(tmp_path / "a.txt"))
+    b = cache.file_icon(str(tmp_path / "B.TXT"))
+    assert (a.cacheKey() == b.cacheKey(), cache.stats.hits) == (True, 1)
+
+
+def test_icon_cache_file_icon_distinguishes_directories(gui, tmp_path):
+    cache = IconCache()
+    cache.file_icon(str(tmp_path))
+    cache.file_icon(str(tmp_path / "a"))
+    assert cache.stats.misses == 2
+
+
+def test_icon_cache_file_icon_per_directory(gui, tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    cache = IconCache()
+    cache.file_icon(str(tmp_path / "a"))
+    cache.file_icon(str(tmp_path / "b"))
+    cache.file_icon(str(tmp_path / "a"))
+    assert (cache.stats.misses, cache.stats.hits) == (2, 1)
+
+
+def test_icon_cache_file_icon_per_file_for_executables(gui, tmp_path):
+    cache = IconCache()
+    cache.file_icon(str(tmp_path / "a.exe"))
+    cache.file_icon(str(tmp_path / "b.exe"))
+    assert cache.stats.misses == 2
+
+
+def test_icon_cache_composite_icon_is_cached(gui, tmp_path):
+    cache = IconCache()
+    overlay = resource("laptop.png")
+    a = cache.composite_icon(str(tmp_path), overlay)
+    b = cache.composite_icon(str(tmp_path), overlay)
+    assert a.cacheKey() == b.cacheKey()
+
+
+def test_icon_cache_composite_icon_keyed_by_overlay_and_grayout(gui, tmp_path):
+    cache = IconCache()
+    icons = [
+        cache.composite_icon(str(tmp_path)),
+        cache.composite_icon(str(tmp_path), resource("laptop.png")),
+        cache.composite_icon(str(tmp_path), grayout=True),
+    ]
+    assert len({icon.cacheKey() for icon in icons}) == 3
+
+
+def test_icon_cache_evicts_least_recently_used(gui, tmp_path):
+    cache = IconCache(max_entries=2)
+    for suffix in ("a", "b", "a", "c"):
+        cache.file_icon(str(tmp_path / f"file.{suffix}"))
+    assert list(cache._icons) == [("suffix", "a"), ("suffix", "c")]
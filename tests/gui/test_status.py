@@ -5,7 +5,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from gridsync.gui.status import StatusPanel
-from gridsync.magic_folder import MagicFolderStatus
+from gridsync.magic_folder_monitor import MagicFolderStatus
 from gridsync.tahoe import Tahoe
 
 
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+
+import pytest
+from qtpy.QtGui import QImage
+
+from gridsync.gui.thumbnail import (
+    ThumbnailCache,
+    ThumbnailService,
+    get_thumbnail_service,
+)
+
+
+@pytest.fixture()
+def image(tmp_path):
+    path = str(tmp_path / "image.png")
+    QImage(200, 100, QImage.Format_RGB32).save(path)
+    return path
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return ThumbnailCache(str(tmp_path / "thumbnails"), 48)
+
+
+def test_thumbnail_cache_get_scales_image(cache, image):
+    thumbnail = cache.get(image)
+    assert (thumbnail.width(), thumbnail.height()) == (48, 48)
+
+
+def test_thumbnail_cache_get_stores_thumbnail(cache, image):
+    cache.get(image)
+    assert len(os.listdir(cache.directory)) == 1
+
+
+def test_thumbnail_cache_get_reads_cached_thumbnail(cache, image):
+    cache.get(image)
+    cache.get(image)
+    assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+
+def test_thumbnail_cache_get_regenerates_modified_image(cache, image):
+    cache.get(image)
+    QImage(300, 100, QImage.Format_RGB32).save(image)
+    cache.get(image)
+    assert (cache.stats.misses, len(os.listdir(cache.directory))) == (2, 2)
+
+
+def test_thumbnail_cache_get_returns_none_for_non_image(cache, tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_text("Not an image")
+    assert cache.get(str(path)) is None
+
+
+def test_thumbnail_cache_get_returns_none_for_missing_file(cache, tmp_path):
+    assert cache.get(str(tmp_path / "missing.png")) is None
+
+
+def test_thumbnail_cache_evicts_least_recently_used(tmp_path, image):
+    cache = ThumbnailCache(str(tmp_path / "thumbnails"), 48)
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"image{i}.png")
+        shutil.copy(image, path)
+        paths.append(path)
+        cache.get(path)
+        os.utime(
+            cache._cache_path(path, os.stat(path)),
+            ns=(i * 10**9, i * 10**9),
+        )
+    cache.max_bytes = sum(
+        os.path.getsize(os.path.join(cache.directory, name))
+        for name in os.listdir(cache.directory)
+    )
+    cache.get(paths[0])  # Marks the thumbnail of image0 as most recent
+    path = str(tmp_path / "image3.png")
+    shutil.copy(image, path)
+    cache.get(path)  # Over budget
+    remaining = [
+        p for p in paths if os.path.exists(cache._cache_path(p, os.stat(p)))
+    ]
+    assert (remaining, cache.stats.evicted) == ([paths[0]], 2)
+
+
+def test_thumbnail_service_emits_thumbnail_ready(cache, image, qtbot):
+    service = ThumbnailService(cache)
+    with qtbot.wait_signal(service.thumbnail_ready) as blocker:
+        service.request(image)
+    assert blocker.args[0] == image
+
+
+def test_thumbnail_service_does_not_retry_non_images(cache, tmp_path):
+    service = ThumbnailService(cache)
+    path = str(tmp_path / "file.txt")
+    service.request(path)
+    service.wait()
+    service.request(path)
+    assert service._pending == set()
+
+
+def test_get_thumbnail_service_returns_shared_service():
+    assert get_thumbnail_service() is get_thumbnail_service()
@@ -10,7 +10,8 @@ from twisted.internet.task import deferLater
 from gridsync import APP_NAME
 from gridsync.capabilities import diminish
 from gridsync.crypto import randstr
-from gridsync.magic_folder import MagicFolderStatus, MagicFolderWebError
+from gridsync.magic_folder import MagicFolderWebError
+from gridsync.magic_folder_monitor import MagicFolderStatus
 from gridsync.tahoe import Tahoe
 from gridsync.util import until
 
@@ -609,7 +610,7 @@ async def test_monitor_emits_files_updated_signal(
 
 def test_monitor_emits_error_occured_signal(magic_folder, tmp_path, qtbot):
     with qtbot.wait_signal(magic_folder.monitor.error_occurred) as blocker:
-        magic_folder.monitor._check_errors(
+        magic_folder.monitor.compare_states(
             {
                 "folders": {
                     "TestFolder": {
@@ -867,4 +868,5 @@ async def test_monitor_emits_overall_status_changed_signal(
 
 
 def test_eliot_logs_collected(magic_folder):
+    magic_folder.logger.flush()
     assert len(magic_folder.get_log("eliot")) > 0
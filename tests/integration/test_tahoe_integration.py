@@ -33,10 +33,8 @@ def test_tahoe_start_creates_pidfile(tahoe_client):
 @inlineCallbacks
 def test_tahoe_client_connected_servers(tahoe_client):
     yield tahoe_client.await_ready()
-    connected_servers = yield Deferred.fromCoroutine(
-        tahoe_client.get_connected_servers()
-    )
-    assert connected_servers == 1
+    grid_status = yield Deferred.fromCoroutine(tahoe_client.get_grid_status())
+    assert grid_status[0] == 1
 
 
 @inlineCallbacks
@@ -1,6 +1,6 @@
 import pytest
 
-from gridsync.capabilities import diminish, is_readonly
+from gridsync.capabilities import children_json, diminish, is_readonly
 
 
 @pytest.mark.parametrize(
@@ -119,3 +119,12 @@ def test_diminish_raises_value_error_if_uri_type_is_unknown():
 def test_diminish_returns_cap_if_cap_is_already_readonly():
     cap = "URI:DIR2-RO:cq4zshembnmo4bcaroimldwv4e:ixphgtnlhm3eypfcbadnh3ywzrthua4vxgldywh6nbq2ligddl3q"
     assert diminish(cap) == cap
+
+
+def test_children_json():
+    rw_dircap = "URI:DIR2:h6esoa5ca2bkwgersspqfk5gty:ixphgtnlhm3eypfcbadnh3ywzrthua4vxgldywh6nbq2ligddl3q"
+    ro_dircap = "URI:DIR2-RO:cq4zshembnmo4bcaroimldwv4e:ixphgtnlhm3eypfcbadnh3ywzrthua4vxgldywh6nbq2ligddl3q"
+    assert children_json({"rw": rw_dircap, "ro": ro_dircap}) == {
+        "rw": ["dirnode", {"rw_uri": rw_dircap}],
+        "ro": ["dirnode", {"ro_uri": ro_dircap}],
+    }
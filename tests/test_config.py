@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import os
+from unittest.mock import Mock
 
 from gridsync.config import Config
 
@@ -45,3 +46,45 @@ def test_config_load(tmpdir):
     with open(config.filename, "w") as f:
         f.write("[test_section]\ntest_option = test_value\n\n")
     assert config.load() == {"test_section": {"test_option": "test_value"}}
+
+
+def test_config_get_does_not_reparse_unchanged_file(tmpdir, monkeypatch):
+    config = Config(os.path.join(str(tmpdir), "test_cache.ini"))
+    config.save({"test_section": {"test_option": "test_value"}})
+    monkeypatch.setattr(Config, "_read", Mock(side_effect=AssertionError))
+    assert config.get("test_section", "test_option") == "test_value"
+
+
+def test_config_cache_is_shared_between_instances(tmpdir, monkeypatch):
+    filename = os.path.join(str(tmpdir), "test_cache_shared.ini")
+    with open(filename, "w") as f:
+        f.write("[test_section]\ntest_option = test_value\n\n")
+    Config(filename).get("test_section", "test_option")
+    monkeypatch.setattr(Config, "_read", Mock(side_effect=AssertionError))
+    assert Config(filename).get("test_section", "test_option") == "test_value"
+
+
+def test_config_get_rereads_file_modified_externally(tmpdir):
+    config = Config(os.path.join(str(tmpdir), "test_cache_modified.ini"))
+    config.set("test_section", "test_option", "test_value")
+    with open(config.filename, "w") as f:
+        f.write("[test_section]\ntest_option = new_value_of_new_size\n\n")
+    assert config.get("test_section", "test_option") == "new_value_of_new_size"
+
+
+def test_config_get_after_file_removed(tmpdir):
+    config = Config(os.path.join(str(tmpdir), "test_cache_removed.ini"))
+    config.set("test_section", "test_option", "test_value")
+    os.remove(config.filename)
+    assert config.get("test_section", "test_option") is None
+
+
+def test_config_save_writes_file_once(tmpdir, monkeypatch):
+    config = Config(os.path.join(str(tmpdir), "test_save_once.ini"))
+    write = Mock(wraps=config._write)
+    monkeypatch.setattr(config, "_write", write)
+    config.save({"a": {"b": "1", "c": "2"}, "d": {"e": "3"}})
+    assert (write.call_count, config.load()) == (
+        1,
+        {"a": {"b": "1", "c": "2"}, "d": {"e": "3"}},
+    )
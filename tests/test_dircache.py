@@ -0,0 +1,186 @@
+import pytest
+from pytest_twisted import ensureDeferred
+from twisted.internet.defer import Deferred
+from twisted.internet.task import Clock
+
+from gridsync.dircache import DirectoryCache
+
+
+class FakeFetcher:
+    def __init__(self, content=b"content"):
+        self.content = content
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.content
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+@pytest.fixture()
+def cache(clock):
+    return DirectoryCache(clock.seconds, ttl=60, max_entries=2)
+
+
+@ensureDeferred
+async def test_get_caches_content(cache):
+    fetch = FakeFetcher()
+    assert await cache.get("URI:DIR2:a", fetch) == b"content"
+    assert await cache.get("URI:DIR2:a", fetch) == b"content"
+    assert fetch.calls == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+@ensureDeferred
+async def test_get_does_not_cache_none(cache):
+    fetch = FakeFetcher(None)
+    await cache.get("URI:DIR2:a", fetch)
+    await cache.get("URI:DIR2:a", fetch)
+    assert fetch.calls == 2
+
+
+@ensureDeferred
+async def test_get_refetches_after_ttl(cache, clock):
+    fetch = FakeFetcher()
+    await cache.get("URI:DIR2:a", fetch)
+    clock.advance(61)
+    await cache.get("URI:DIR2:a", fetch)
+    assert fetch.calls == 2
+
+
+@ensureDeferred
+async def test_get_evicts_least_recently_used_entry(cache):
+    fetch = FakeFetcher()
+    await cache.get("URI:DIR2:a", fetch)
+    await cache.get("URI:DIR2:b", fetch)
+    await cache.get("URI:DIR2:a", fetch)
+    await cache.get("URI:DIR2:c", fetch)  # Evicts "b"
+    assert fetch.calls == 3
+    await cache.get("URI:DIR2:a", fetch)
+    assert fetch.calls == 3
+    await cache.get("URI:DIR2:b", fetch)
+    assert fetch.calls == 4
+    assert cache.stats.evictions == 2
+
+
+@ensureDeferred
+async def test_invalidate_discards_cap_and_paths_beneath_it(cache):
+    fetch = FakeFetcher()
+    await cache.get("URI:DIR2:a", fetch)
+    await cache.get("URI:DIR2:a/v1", fetch)
+    cache.invalidate("URI:DIR2:a")
+    await cache.get("URI:DIR2:a", fetch)
+    await cache.get("URI:DIR2:a/v1", fetch)
+    assert fetch.calls == 4
+    assert cache.stats.invalidations == 2
+
+
+@ensureDeferred
+async def test_concurrent_gets_share_a_single_fetch(cache):
+    d = Deferred()
+    calls = []
+
+    async def fetch():
+        calls.append(None)
+        return await d
+
+    first = Deferred.fromCoroutine(cache.get("URI:DIR2:a", fetch))
+    second = Deferred.fromCoroutine(cache.get("URI:DIR2:a", fetch))
+    d.callback(b"content")
+    assert await first == b"content"
+    assert await second == b"content"
+    assert len(calls) == 1
+
+
+@ensureDeferred
+async def test_concurrent_gets_share_a_failure(cache):
+    d = Deferred()
+
+    async def fetch():
+        return await d
+
+    first = Deferred.fromCoroutine(cache.get("URI:DIR2:a", fetch))
+    second = Deferred.fromCoroutine(cache.get("URI:DIR2:a", fetch))
+    d.errback(ValueError())
+    with pytest.raises(ValueError):
+        await first
+    with pytest.raises(ValueError):
+        await second
+
+
+@ensureDeferred
+async def test_get_does_not_cache_content_read_before_invalidation(cache):
+    d = Deferred()
+
+    async def fetch():
+        return await d
+
+    result = Deferred.fromCoroutine(cache.get("URI:DIR2:a", fetch))
+    cache.invalidate("URI:DIR2:a")
+    d.callback(b"stale")
+    assert await result == b"stale"
+    fetch_again = FakeFetcher(b"fresh")
+    assert await cache.get("URI:DIR2:a", fetch_again) == b"fresh"
+
+
+@ensureDeferred
+async def test_get_after_invalidation_does_not_join_earlier_fetch(cache):
+    d = Deferred()
+
+    async def fetch():
+        return await d
+
+    stale = Deferred.fromCoroutine(cache.get("URI:DIR2:a", fetch))
+    cache.invalidate("URI:DIR2:a")
+    fresh = Deferred.fromCoroutine(cache.get("URI:DIR2:a", FakeFetcher()))
+    d.callback(b"stale")
+    assert (await stale, await fresh) == (b"stale", b"content")
+
+
+RW_DIRCAP = (
+    "URI:DIR2:h6esoa5ca2bkwgersspqfk5gty:"
+    "ixphgtnlhm3eypfcbadnh3ywzrthua4vxgldywh6nbq2ligddl3q"
+)
+RO_DIRCAP = (
+    "URI:DIR2-RO:cq4zshembnmo4bcaroimldwv4e:"
+    "ixphgtnlhm3eypfcbadnh3ywzrthua4vxgldywh6nbq2ligddl3q"
+)
+
+
+@pytest.mark.parametrize(
+    "cached, invalidated",
+    [
+        [RO_DIRCAP, RW_DIRCAP],
+        [RW_DIRCAP, RO_DIRCAP],
+        [RO_DIRCAP + "/v1", RW_DIRCAP],
+    ],
+)
+@ensureDeferred
+async def test_invalidate_discards_other_form_of_cap(
+    cache, cached, invalidated
+):
+    fetch = FakeFetcher()
+    await cache.get(cached, fetch)
+    cache.invalidate(invalidated)
+    await cache.get(cached, fetch)
+    assert fetch.calls == 2
+
+
+def test_version_changes_when_either_form_of_cap_is_invalidated(cache):
+    before = cache.version(RW_DIRCAP)
+    cache.invalidate(RO_DIRCAP)
+    after = cache.version(RW_DIRCAP)
+    cache.invalidate("URI:DIR2:b")
+    assert (before != after, cache.version(RW_DIRCAP)) == (True, after)
+
+
+def test_version_changes_when_cache_is_cleared(cache):
+    cache.invalidate(RW_DIRCAP)
+    versions = {cache.version(RW_DIRCAP), cache.version("URI:DIR2:b")}
+    cache.clear()
+    assert cache.version(RW_DIRCAP) not in versions
+    assert cache.version("URI:DIR2:b") not in versions
@@ -3,17 +3,22 @@
 import json
 import os
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
 import pytest
 
 from gridsync import autostart_file_path, config_dir, pkgdir
 from gridsync.filter import (
+    JSONDecodeError,
+    apply_eliot_filters,
+    apply_eliot_filters_chunked,
     apply_filters,
     filter_eliot_log_message,
     filter_eliot_logs,
     get_filters,
     join_eliot_logs,
+    make_eliot_filter_executor,
 )
 
 
@@ -154,6 +159,44 @@ def test_apply_filters_filtered_string_in_result(core, string, filtered):
     assert "<Filtered:{}>".format(filtered) in result
 
 
+def test_apply_filters_prefers_longest_match():
+    filters = [("/home/alice", "HomeDir"), ("/home/alice/Cats", "MagicPath")]
+    result = apply_filters("/home/alice/Cats/a.jpg", filters)
+    assert result == "<Filtered:MagicPath>/a.jpg"
+
+
+def test_apply_filters_does_not_filter_masks():
+    filters = [("URI:abc", "Rootcap:1"), ("Rootcap", "GatewayName:1")]
+    result = apply_filters("URI:abc Rootcap", filters)
+    assert result == "<Filtered:Rootcap:1> <Filtered:GatewayName:1>"
+
+
+def test_apply_filters_uses_first_mask_for_duplicate_strings():
+    filters = [("tahoe.exe", "TahoeExecutablePath"), ("tahoe.exe", "Other")]
+    assert apply_filters("tahoe.exe", filters) == (
+        "<Filtered:TahoeExecutablePath>"
+    )
+
+
+def test_apply_filters_ignores_empty_strings_and_masks():
+    filters = [("", "Empty"), (None, "None"), ("secret", "")]
+    assert apply_filters("secret", filters) == "secret"
+
+
+def test_apply_filters_escapes_special_characters():
+    filters = [("a.b*c", "Special"), ("a", "A")]
+    assert apply_filters("a.b*c axbxc", filters) == (
+        "<Filtered:Special> <Filtered:A>xbxc"
+    )
+
+
+def test_apply_filters_matches_many_strings_with_common_prefixes():
+    filters = [(f"URI:DIR2:{i:04}", f"Cap:{i}") for i in range(1000)]
+    in_str = " ".join(f"URI:DIR2:{i:04}" for i in range(0, 1000, 7))
+    result = apply_filters(in_str, filters)
+    assert result == " ".join(f"<Filtered:Cap:{i}>" for i in range(0, 1000, 7))
+
+
 @pytest.mark.parametrize(
     "msg,keys",
     [
@@ -657,3 +700,74 @@ def test_filter_eliot_logs_apply_filter_use_identifier():
 def test_join_eliot_logs_sort_output():
     messages = ['{"C": 3, "A": 1, "B": 2}']
     assert join_eliot_logs(messages) == '{"A": 1, "B": 2, "C": 3}'
+
+
+def eliot_chunks(num_chunks, lines_per_chunk=10):
+    chunks = []
+    for c in range(num_chunks):
+        lines = []
+        for n in range(lines_per_chunk):
+            msg = {
+                "action_type": "magic-folder:notified",
+                "path": f"/tmp/{c}/{n}",
+                "nickname": "TestGrid",
+            }
+            lines.append(json.dumps(msg) + "\n")
+        chunks.append("".join(lines))
+    return chunks
+
+
+def test_apply_eliot_filters_sorts_output():
+    content = '{"C": 3, "A": 1, "B": 2}\n{"E": 5, "D": 4}\n'
+    assert apply_eliot_filters(content) == (
+        '{"A": 1, "B": 2, "C": 3}\n{"D": 4, "E": 5}'
+    )
+
+
+def test_filter_eliot_log_message_falls_back_to_json_module(monkeypatch):
+    def fake_json_loads(s):
+        raise JSONDecodeError("Integer exceeds 64-bit range", s, 0)
+
+    monkeypatch.setattr("gridsync.filter.json_loads", fake_json_loads)
+    message = '{"size": 123456789012345678901234567890, "ratio": NaN}'
+    assert filter_eliot_log_message(message) == (
+        '{"ratio": NaN, "size": 123456789012345678901234567890}'
+    )
+
+
+def test_apply_eliot_filters_chunked_without_executor():
+    chunks = eliot_chunks(3)
+    assert list(apply_eliot_filters_chunked(chunks, "1")) == [
+        apply_eliot_filters(chunk, "1") for chunk in chunks
+    ]
+
+
+def test_apply_eliot_filters_chunked_preserves_order():
+    chunks = eliot_chunks(20)
+    with ThreadPoolExecutor(4) as executor:
+        results = list(apply_eliot_filters_chunked(chunks, "1", executor))
+    assert results == [apply_eliot_filters(chunk, "1") for chunk in chunks]
+
+
+def test_apply_eliot_filters_chunked_limits_read_ahead():
+    consumed = []
+
+    def chunks():
+        for i, chunk in enumerate(eliot_chunks(20)):
+            consumed.append(i)
+            yield chunk
+
+    with ThreadPoolExecutor(4) as executor:
+        results = apply_eliot_filters_chunked(
+            chunks(), "1", executor, max_pending=3
+        )
+        next(results)
+        assert len(consumed) == 4  # 3 pending plus the one just submitted
+        list(results)
+
+
+def test_apply_eliot_filters_chunked_in_worker_processes():
+    chunks = eliot_chunks(4)
+    with make_eliot_filter_executor(2) as executor:
+        results = list(apply_eliot_filters_chunked(chunks, "1", executor))
+    assert results == [apply_eliot_filters(chunk, "1") for chunk in chunks]
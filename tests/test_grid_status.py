@@ -0,0 +1,68 @@
+from unittest.mock import Mock
+
+import pytest
+from pytest_twisted import ensureDeferred
+from twisted.internet.defer import Deferred, fail, succeed
+from twisted.internet.task import Clock
+
+from gridsync.grid_status import GridStatusFeed, parse_grid_status
+
+
+def test_parse_grid_status_without_servers():
+    assert parse_grid_status(b'{"introducers": {}}') == (0, 0, 0)
+
+
+@ensureDeferred
+async def test_grid_status_feed_reuses_recent_result():
+    clock = Clock()
+    fetch = Mock(return_value=succeed((3, 5, 1024)))
+    feed = GridStatusFeed(fetch, clock.seconds)
+    await feed.get(max_age=1)
+    clock.advance(0.5)
+    assert await feed.get(max_age=1) == (3, 5, 1024)
+    assert fetch.call_count == 1
+
+
+@ensureDeferred
+async def test_grid_status_feed_refetches_when_max_age_exceeded():
+    clock = Clock()
+    fetch = Mock(return_value=succeed((3, 5, 1024)))
+    feed = GridStatusFeed(fetch, clock.seconds)
+    await feed.get(max_age=1)
+    clock.advance(1)
+    await feed.get(max_age=1)
+    assert fetch.call_count == 2
+
+
+@ensureDeferred
+async def test_grid_status_feed_shares_concurrent_requests():
+    d = Deferred()
+    fetch = Mock(return_value=d)
+    feed = GridStatusFeed(fetch)
+    first = Deferred.fromCoroutine(feed.get())
+    second = Deferred.fromCoroutine(feed.get())
+    d.callback((3, 5, 1024))
+    assert (await first, await second) == ((3, 5, 1024), (3, 5, 1024))
+    assert fetch.call_count == 1
+
+
+@ensureDeferred
+async def test_grid_status_feed_passes_errors_to_concurrent_requests():
+    d = Deferred()
+    feed = GridStatusFeed(Mock(return_value=d))
+    first = Deferred.fromCoroutine(feed.get())
+    second = Deferred.fromCoroutine(feed.get())
+    d.errback(ValueError())
+    with pytest.raises(ValueError):
+        await first
+    with pytest.raises(ValueError):
+        await second
+
+
+@ensureDeferred
+async def test_grid_status_feed_does_not_reuse_errors():
+    fetch = Mock(side_effect=[fail(ValueError()), succeed((3, 5, 1024))])
+    feed = GridStatusFeed(fetch)
+    with pytest.raises(ValueError):
+        await feed.get()
+    assert await feed.get() == (3, 5, 1024)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import Mock
+
+import pytest
+from pytest_twisted import inlineCallbacks
+from twisted.internet.defer import Deferred, fail, succeed
+from twisted.internet.error import ConnectError
+
+from gridsync.http_client import HTTPClient
+
+
+@inlineCallbacks
+def test_http_client_uses_persistent_pool(monkeypatch):
+    fake_get = Mock(return_value=succeed(Mock(code=200)))
+    monkeypatch.setattr("treq.get", fake_get)
+    client = HTTPClient()
+    yield client.get("http://127.0.0.1:1234/")
+    assert fake_get.call_args[1]["pool"] is client.pool
+
+
+def test_http_client_pool_is_persistent():
+    client = HTTPClient(max_persistent_per_host=5, cached_connection_timeout=9)
+    pool = client.pool
+    assert (
+        pool.persistent,
+        pool.maxPersistentPerHost,
+        pool.cachedConnectionTimeout,
+    ) == (True, 5, 9)
+
+
+@inlineCallbacks
+def test_http_client_counts_requests(monkeypatch):
+    monkeypatch.setattr(
+        "treq.request", Mock(return_value=succeed(Mock(code=200)))
+    )
+    client = HTTPClient()
+    yield client.request("GET", "http://127.0.0.1:1234/")
+    yield client.request("GET", "http://127.0.0.1:1234/")
+    assert (client.stats.requests, client.stats.failures) == (2, 0)
+
+
+@inlineCallbacks
+def test_http_client_counts_failures(monkeypatch):
+    monkeypatch.setattr("treq.post", Mock(return_value=fail(ConnectError())))
+    client = HTTPClient()
+    with pytest.raises(ConnectError):
+        yield client.post("http://127.0.0.1:1234/")
+    assert (client.stats.requests, client.stats.failures) == (1, 1)
+
+
+def test_http_client_counts_connections_created():
+    client = HTTPClient()
+    endpoint = Mock()
+    endpoint.connect.return_value = Deferred()
+    client.pool.getConnection(("http", b"127.0.0.1", 1234), endpoint)
+    assert (
+        client.stats.connections_created,
+        client.stats.connections_reused,
+    ) == (1, 0)
@@ -10,8 +10,12 @@ from gridsync.log import (
     LOGGING_ENABLED,
     LOGGING_MAX_BYTES,
     LOGS_PATH,
+    LogWriter,
     MultiFileLogger,
     NullLogger,
+    canonicalize_json,
+    iter_log,
+    log_size,
     make_file_logger,
     read_log,
 )
@@ -93,11 +97,35 @@ def test_read_log_returns_empty_string_if_file_not_found():
     assert read_log(p) == ""
 
 
+def test_iter_log_yields_chunks_of_whole_lines(tmp_path):
+    p = tmp_path / "test.log"
+    p.write_text("".join(f"line {i}\n" for i in range(100)))
+    chunks = list(iter_log(p, chunk_size=20))
+    assert len(chunks) > 1
+    assert all(chunk.endswith("\n") for chunk in chunks)
+    assert "".join(chunks) == p.read_text()
+
+
+def test_iter_log_yields_nothing_if_file_not_found(tmp_path):
+    assert list(iter_log(tmp_path / "missing.log")) == []
+
+
+def test_log_size(tmp_path):
+    p = tmp_path / "test.log"
+    p.write_text("12345")
+    assert log_size(p) == 5
+
+
+def test_log_size_returns_zero_if_file_not_found(tmp_path):
+    assert log_size(tmp_path / "missing.log") == 0
+
+
 def test_multi_file_logger_write():
     basename = "test_multi_file_logger_write"
     logger_name = "writer"
     logger = MultiFileLogger(basename)
     logger.log(logger_name, "write_test_contents")
+    logger.flush()
     p = Path(LOGS_PATH, f"{basename}.{logger_name}.log")
     assert p.read_text("utf-8").strip().endswith("write_test_contents")
 
@@ -117,6 +145,7 @@ def test_multi_file_logger_omit_fmt():
     logger = MultiFileLogger(basename)
     Path(LOGS_PATH, f"{basename}.{logger_name}.log").unlink(missing_ok=True)
     logger.log(logger_name, "omit_fmt_contents", omit_fmt=True)
+    logger.flush()
     assert logger.read_log(logger_name).strip() == "omit_fmt_contents"
 
 
@@ -124,3 +153,113 @@ def test_null_logger():
     logger = NullLogger()
     logger.log("null_logger_test", "test")
     logger.read_log("null_logger_test") == ""
+
+
+def test_multi_file_logger_canonicalizes_json():
+    basename = "test_multi_file_logger_canonicalizes_json"
+    logger_name = "eliot"
+    logger = MultiFileLogger(basename)
+    Path(LOGS_PATH, f"{basename}.{logger_name}.log").unlink(missing_ok=True)
+    logger.log(logger_name, '{"b": 2, "a": 1}', omit_fmt=True, is_json=True)
+    logger.flush()
+    assert logger.read_log(logger_name).strip() == '{"a": 1, "b": 2}'
+
+
+def test_canonicalize_json_returns_none_for_invalid_json():
+    assert canonicalize_json("{not json") is None
+
+
+def make_writer_logger(name):
+    Path(LOGS_PATH, f"{name}.log").unlink(missing_ok=True)
+    return make_file_logger(name, fmt=None, batching=True)
+
+
+def test_log_writer_writes_lines_in_order():
+    name = "test_log_writer_writes_lines_in_order"
+    logger = make_writer_logger(name)
+    writer = LogWriter()
+    for i in range(100):
+        writer.write(logger, str(i))
+    writer.stop()
+    lines = read_log(Path(LOGS_PATH, f"{name}.log")).splitlines()
+    assert lines == [str(i) for i in range(100)]
+
+
+def test_log_writer_counts_queued_and_written_lines():
+    logger = make_writer_logger("test_log_writer_counts_lines")
+    writer = LogWriter()
+    writer.write(logger, "1")
+    writer.write(logger, "2")
+    writer.flush()
+    assert (writer.stats.queued, writer.stats.written) == (2, 2)
+    writer.stop()
+
+
+def test_log_writer_discards_invalid_json():
+    name = "test_log_writer_discards_invalid_json"
+    logger = make_writer_logger(name)
+    writer = LogWriter()
+    writer.write(logger, "{not json", is_json=True)
+    writer.write(logger, '{"a": 1}', is_json=True)
+    writer.stop()
+    assert read_log(Path(LOGS_PATH, f"{name}.log")).strip() == '{"a": 1}'
+    assert writer.stats.invalid == 1
+
+
+def test_log_writer_writes_lines_in_batches():
+    logger = make_writer_logger("test_log_writer_writes_lines_in_batches")
+    writer = LogWriter(batch_size=10, flush_interval=60)
+    writer._ensure_started = lambda: None  # Queue everything up front
+    for i in range(25):
+        writer.write(logger, str(i))
+    del writer._ensure_started
+    writer._ensure_started()
+    writer.stop()
+    # 10 + 10 + 5 lines; the last batch also holds the stop marker
+    assert writer.stats.batches == 3
+
+
+def test_log_writer_drops_lines_when_queue_is_full():
+    logger = make_writer_logger("test_log_writer_drops_lines")
+    writer = LogWriter(queue_size=2)
+    writer._ensure_started = lambda: None  # Don't drain the queue
+    for i in range(5):
+        writer.write(logger, str(i))
+    assert (writer.stats.queued, writer.stats.dropped) == (2, 3)
+    assert writer.pending == 2
+
+
+def test_log_writer_drops_lines_written_after_stop():
+    logger = make_writer_logger("test_log_writer_drops_lines_after_stop")
+    writer = LogWriter()
+    writer.write(logger, "1")
+    writer.stop()
+    writer.write(logger, "2")
+    assert (writer.stats.written, writer.stats.dropped) == (1, 1)
+    assert writer.pending == 0
+
+
+def test_log_writer_flush_returns_true_if_not_started():
+    assert LogWriter().flush() is True
+
+
+def test_multi_file_logger_iter_log():
+    basename = "test_multi_file_logger_iter_log"
+    logger_name = "iter"
+    logger = MultiFileLogger(basename)
+    Path(LOGS_PATH, f"{basename}.{logger_name}.log").unlink(missing_ok=True)
+    logger.log(logger_name, "iter_contents", omit_fmt=True)
+    logger.flush()
+    assert "".join(logger.iter_log(logger_name)) == "iter_contents\n"
+
+
+def test_null_logger_log_size():
+    assert NullLogger().log_size("null_logger_test") == 0
+
+
+def test_null_logger_iter_log():
+    assert list(NullLogger().iter_log("null_logger_test")) == []
+
+
+def test_null_logger_flush():
+    NullLogger().flush()
@@ -1,17 +1,30 @@
+import json
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
+import treq
+from pytest_twisted import ensureDeferred
+from twisted.internet.defer import Deferred, succeed
+from twisted.internet.task import Clock
+from twisted.web.resource import Resource
+from twisted.web.server import NOT_DONE_YET, Site
+from watchdog.events import FileModifiedEvent
 
 from gridsync.crypto import randstr
 from gridsync.magic_folder import (
     MagicFolder,
     MagicFolderConfigError,
     MagicFolderError,
-    MagicFolderStatus,
 )
+from gridsync.magic_folder_monitor import MagicFolderStatus
 from gridsync.tahoe import Tahoe
 
 
+async def fake_do_check() -> None:
+    pass
+
+
 def test__read_api_token(tmp_path):
     magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
     magic_folder.configdir.mkdir(parents=True)
@@ -137,9 +150,371 @@ def test__read_api_port_raises_magic_folder_config_error_if_not_int(tmp_path):
         ],
     ],
 )
-def test_magic_folder_monitor__parse_folder_statuses(tmp_path, state, status):
+def test_magic_folder_monitor_compare_states_emits_folder_status(
+    tmp_path, state, status
+):
     magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
     magic_folder.supervisor.time_started = 1  # XXX
     monitor = magic_folder.monitor
-    statuses = monitor._parse_folder_statuses(state)
-    assert statuses.get("TestFolder") == status
+    monitor.do_check = fake_do_check
+    statuses = []
+    monitor.folder_status_changed.connect(
+        lambda *args: statuses.append(list(args))
+    )
+    monitor.compare_states(state, {})
+    assert statuses == [["TestFolder", status]]
+
+
+def _status_message(uploads: list[str], last_scan: float = 1.0) -> str:
+    return json.dumps(
+        {
+            "state": {
+                "synchronizing": bool(uploads),
+                "folders": {
+                    "TestFolder": {
+                        "uploads": [
+                            {"relpath": relpath, "queued-at": 1.0}
+                            for relpath in uploads
+                        ],
+                        "downloads": [],
+                        "errors": [],
+                        "recent": [],
+                        "tahoe": {"happy": True, "connected": 1, "desired": 1},
+                        "scanner": {"last-scan": last_scan},
+                        "poller": {"last-poll": 1.0},
+                    },
+                },
+            }
+        }
+    )
+
+
+def test_magic_folder_monitor_emits_upload_started_once(tmp_path):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monitor.do_check = fake_do_check
+    started = []
+    monitor.upload_started.connect(lambda *args: started.append(args[1]))
+    monitor.on_status_message_received(_status_message(["A.txt"]))
+    monitor.on_status_message_received(_status_message(["A.txt", "B.txt"]))
+    monitor.on_status_message_received(_status_message(["A.txt", "B.txt"]))
+    assert started == ["A.txt", "B.txt"]
+
+
+def test_magic_folder_monitor_emits_upload_finished(tmp_path):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monitor.do_check = fake_do_check
+    finished = []
+    monitor.upload_finished.connect(lambda *args: finished.append(args[1]))
+    monitor.on_status_message_received(_status_message(["A.txt", "B.txt"]))
+    monitor.on_status_message_received(_status_message(["B.txt"]))
+    assert finished == ["A.txt"]
+
+
+def test_magic_folder_monitor_emits_files_updated_when_sync_finishes(
+    tmp_path,
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monitor.do_check = fake_do_check
+    files_updated = []
+    monitor.files_updated.connect(
+        lambda *args: files_updated.append(list(args))
+    )
+    monitor.on_status_message_received(_status_message(["A.txt"]))
+    monitor.on_status_message_received(_status_message(["A.txt", "B.txt"]))
+    monitor.on_status_message_received(_status_message([]))
+    assert files_updated == [["TestFolder", ["A.txt", "B.txt"]]]
+
+
+def test_magic_folder_monitor_skips_unchanged_operations(tmp_path):
+    """
+    ``sync_progress_updated`` is not re-emitted for status updates that do
+    not start or finish any operations.
+    """
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monitor.do_check = fake_do_check
+    progress = []
+    monitor.sync_progress_updated.connect(
+        lambda *args: progress.append(list(args))
+    )
+    monitor.on_status_message_received(_status_message(["A.txt"], 1.0))
+    monitor.on_status_message_received(_status_message(["A.txt"], 2.0))
+    monitor.on_status_message_received(_status_message(["A.txt"], 3.0))
+    assert progress == [["TestFolder", 0, 1]]
+
+
+def test_magic_folder_monitor_compare_states_emits_error_occurred_once(
+    tmp_path,
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monitor.do_check = fake_do_check
+    errors = []
+    monitor.error_occurred.connect(lambda *args: errors.append(list(args)))
+    message = json.dumps(
+        {
+            "folders": {
+                "TestFolder": {
+                    "uploads": [],
+                    "downloads": [],
+                    "errors": [{"timestamp": 1234567890, "summary": ":("}],
+                }
+            }
+        }
+    )
+    state = json.loads(message)
+    monitor.compare_states(state, {})
+    monitor.compare_states(json.loads(message), state)
+    assert errors == [["TestFolder", ":(", 1234567890]]
+
+
+def _file_status(**sizes: int) -> list[dict]:
+    return [
+        {"relpath": relpath, "size": size, "mtime": 1, "last-updated": size}
+        for relpath, size in sizes.items()
+    ]
+
+
+async def check_file_status(monitor, magic_path, file_status):
+    async def fake_stream_file_status(folder_name, collector):
+        collector(file_status)
+
+    monitor.magic_folder.stream_file_status = fake_stream_file_status
+    await monitor._check_file_status("TestFolder", magic_path)
+
+
+@ensureDeferred
+async def test_magic_folder_monitor_file_index_tracks_added_and_removed(
+    tmp_path,
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    added = []
+    removed = []
+    monitor.file_added.connect(lambda _, status: added.append(status))
+    monitor.file_removed.connect(lambda _, status: removed.append(status))
+    await check_file_status(monitor, str(tmp_path), _file_status(A=1))
+    await check_file_status(monitor, str(tmp_path), _file_status(A=1, B=2))
+    await check_file_status(monitor, str(tmp_path), _file_status(B=2))
+    assert (
+        [s["relpath"] for s in added],
+        [s["relpath"] for s in removed],
+    ) == (["A", "B"], ["A"])
+
+
+@ensureDeferred
+async def test_magic_folder_monitor_file_index_resolves_new_files_only(
+    tmp_path, monkeypatch
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    resolved = []
+    resolve = Path.resolve
+    monkeypatch.setattr(
+        Path, "resolve", lambda p: resolved.append(p) or resolve(p)
+    )
+    await check_file_status(monitor, str(tmp_path), _file_status(A=1, B=2))
+    await check_file_status(monitor, str(tmp_path), _file_status(A=1, B=3))
+    assert len(resolved) == 2
+
+
+@ensureDeferred
+async def test_magic_folder_monitor_file_index_updates_folder_aggregates(
+    tmp_path,
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    sizes = []
+    mtimes = []
+    monitor.folder_size_updated.connect(lambda _, size: sizes.append(size))
+    monitor.folder_mtime_updated.connect(lambda _, mtime: mtimes.append(mtime))
+    await check_file_status(monitor, str(tmp_path), _file_status(A=1, B=2))
+    await check_file_status(monitor, str(tmp_path), _file_status(A=1, B=5))
+    await check_file_status(monitor, str(tmp_path), _file_status(A=1))
+    assert (sizes, mtimes) == ([3, 6, 1], [2, 5, 1])
+
+
+@ensureDeferred
+async def test_magic_folder_monitor_serializes_file_status_checks(tmp_path):
+    """
+    A check of a folder's file status that started (and so received the
+    file status) before another does not remove files added by the latter.
+    """
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    first_received = Deferred()
+    streams = [
+        (first_received, _file_status(A=1)),
+        (succeed(None), _file_status(A=1, B=2)),
+    ]
+
+    async def fake_stream_file_status(folder_name, collector):
+        d, file_status = streams.pop(0)
+        await d
+        collector(file_status)
+
+    monitor.magic_folder.stream_file_status = fake_stream_file_status
+    first_check = Deferred.fromCoroutine(
+        monitor._check_file_status("TestFolder", str(tmp_path))
+    )
+    second_check = Deferred.fromCoroutine(
+        monitor._check_file_status("TestFolder", str(tmp_path))
+    )
+    first_received.callback(None)
+    await first_check
+    await second_check
+    assert sorted(monitor._file_index["TestFolder"]) == ["A", "B"]
+
+
+def test_magic_folder_monitor_coalesces_scans_per_folder(tmp_path):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    monitor._watchdog = Mock()
+    clock = Clock()
+    monitor._scan_scheduler._clock = clock
+    scanned = []
+    monitor._do_scan = scanned.append
+    monitor._scan_scheduler._function = monitor._do_scan
+    folders = {
+        "TestFolder1": {"magic_path": str(tmp_path / "TestFolder1")},
+        "TestFolder2": {"magic_path": str(tmp_path / "TestFolder2")},
+    }
+    monitor.compare_folders(folders, {})
+    for _ in range(5):
+        monitor._schedule_magic_folder_scan(str(tmp_path / "TestFolder1"))
+        monitor._schedule_magic_folder_scan(str(tmp_path / "TestFolder2"))
+    monitor._schedule_magic_folder_scan(str(tmp_path / "Unknown"))
+    clock.advance(1)
+    assert (sorted(scanned), monitor._scan_scheduler.stats.coalesced) == (
+        ["TestFolder1", "TestFolder2"],
+        8,
+    )
+
+
+def test_magic_folder_monitor_scans_folder_of_root_emitted_by_watchdog(
+    tmp_path, qtbot
+):
+    monitor = MagicFolder(Tahoe(tmp_path / "nodedir")).monitor
+    scanned = []
+    monitor._scan_scheduler.schedule = scanned.append
+    magic_path = tmp_path / "TestFolder"
+    (magic_path / "subdir").mkdir(parents=True)
+    monitor.compare_folders(
+        {"TestFolder": {"magic_path": str(magic_path)}}, {}
+    )
+    monitor._watchdog.on_event(
+        FileModifiedEvent(str(magic_path / "subdir" / "file.txt"))
+    )
+    qtbot.wait_until(lambda: scanned == ["TestFolder"])
+
+
+def fake_collect(*chunks: bytes):
+    def collect(_, collector):
+        for chunk in chunks:
+            collector(chunk)
+        return succeed(None)
+
+    return collect
+
+
+@ensureDeferred
+async def test_stream_file_status_passes_entries_in_batches(
+    tmp_path, monkeypatch
+):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+
+    async def fake_send_request(*args, **kwargs):
+        return Mock(code=200)
+
+    magic_folder._send_request = fake_send_request
+    monkeypatch.setattr(
+        "treq.collect",
+        fake_collect(b'[{"relpath": "A"}, {"rel', b'path": "B"}, {"relpa'),
+    )
+    batches = []
+    with pytest.raises(ValueError):  # The response was incomplete
+        await magic_folder.stream_file_status(
+            "TestFolder", batches.append, batch_size=1
+        )
+    assert batches == [[{"relpath": "A"}], [{"relpath": "B"}]]
+
+
+class ChunkedFileStatusResource(Resource):
+    isLeaf = True
+
+    def __init__(self, first: bytes, rest: bytes) -> None:
+        super().__init__()
+        self.first = first
+        self.rest = rest
+        self.resume: Deferred = Deferred()
+
+    def render_GET(self, request):
+        request.write(self.first)
+
+        def finish(_):
+            request.write(self.rest)
+            request.finish()
+
+        self.resume.addCallback(finish)
+        return NOT_DONE_YET
+
+
+@ensureDeferred
+async def test_stream_file_status_parses_real_response_incrementally(
+    tmp_path,
+):
+    from twisted.internet import reactor
+
+    resource = ChunkedFileStatusResource(
+        b'[{"relpath": "A"}, {"rel', b'path": "B"}]'
+    )
+    port = reactor.listenTCP(0, Site(resource), interface="127.0.0.1")
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    magic_folder.api_port = port.getHost().port
+    magic_folder.api_token = "Test-Token"
+    magic_folder.monitor.running = True
+    responses = []
+    send_request = magic_folder._send_request
+
+    async def spy_send_request(*args, **kwargs):
+        resp = await send_request(*args, **kwargs)
+        responses.append(resp)
+        return resp
+
+    magic_folder._send_request = spy_send_request
+    batches = []
+
+    def collector(batch):
+        batches.append(batch)
+        # The rest of the body is only sent once the first entry has been
+        # passed along, so the first batch can't have been buffered.
+        if not resource.resume.called:
+            resource.resume.callback(None)
+
+    try:
+        await magic_folder.stream_file_status(
+            "TestFolder", collector, batch_size=1
+        )
+    finally:
+        await magic_folder.gateway.http_client.close()
+        await port.stopListening()
+    with pytest.raises(RuntimeError):  # No copy of the body was kept
+        await treq.content(responses[0])
+    assert batches == [[{"relpath": "A"}], [{"relpath": "B"}]]
+
+
+@ensureDeferred
+async def test_magic_folder_monitor_checks_streamed_file_status(
+    tmp_path, monkeypatch
+):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+
+    async def fake_send_request(*args, **kwargs):
+        return Mock(code=200)
+
+    magic_folder._send_request = fake_send_request
+    monkeypatch.setattr(
+        "treq.collect",
+        fake_collect(
+            b'[{"relpath": "A", "size": 3}, {"relpath": "B", "si', b'ze": 4}]'
+        ),
+    )
+    sizes = []
+    magic_folder.monitor.folder_size_updated.connect(
+        lambda _, size: sizes.append(size)
+    )
+    await magic_folder.monitor._check_file_status("TestFolder", str(tmp_path))
+    assert sizes == [7]
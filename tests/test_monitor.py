@@ -6,7 +6,10 @@ from typing import Awaitable, Callable, TypeVar
 from unittest.mock import MagicMock, Mock, call
 
 from pytest_twisted import inlineCallbacks
+from twisted.internet.defer import Deferred, succeed
+from twisted.internet.task import Clock
 
+from gridsync.magic_folder_monitor import MagicFolderStatus
 from gridsync.monitor import GridChecker, Monitor, ZKAPChecker, _parse_vouchers
 
 T = TypeVar("T")
@@ -164,3 +167,111 @@ def test__update_redeeming_vouchers_emits_redeeming_vouchers_updated(tahoe):
     checker.redeeming_vouchers_updated.connect(redeeming_vouchers.extend)
     checker._update_redeeming_vouchers(parsed.redeeming_vouchers)
     assert redeeming_vouchers == ["0MH30nxh9iup727nTi3u51Ir9HcQYIM8"]
+
+
+@inlineCallbacks
+def test_monitor_do_checks_runs_checks_concurrently():
+    monitor = Monitor(MagicMock())
+    zkap_check = Deferred()
+    monitor.zkap_checker = MagicMock()
+    monitor.zkap_checker.do_check.return_value = zkap_check
+    monitor.grid_checker = MagicMock()
+    d = monitor.do_checks()
+    # The grid check starts without waiting for the ZKAP check to finish
+    monitor.grid_checker.do_check.assert_called_once()
+    zkap_check.callback(None)
+    yield d
+
+
+def adaptive_monitor(ready=True, status=MagicFolderStatus.UP_TO_DATE):
+    gateway = MagicMock(ready=ready, zkap_auth_required=False)
+    gateway.magic_folder.monitor.overall_status = status
+    monitor = Monitor(gateway, min_interval=2, max_interval=16)
+    monitor.grid_checker.do_check = lambda: succeed(None)
+    clock = Clock()
+    monitor.timer.clock = clock
+    monitor.start()
+    return monitor, clock
+
+
+def test_monitor_backs_off_while_state_is_stable():
+    monitor, clock = adaptive_monitor()
+    intervals = []
+    for _ in range(6):
+        intervals.append(monitor.interval)
+        clock.advance(monitor.interval)
+    assert intervals == [2, 4, 8, 16, 16, 16]
+
+
+def test_monitor_resets_interval_when_state_changes():
+    monitor, clock = adaptive_monitor()
+    clock.advance(2)
+    clock.advance(4)
+    assert monitor.interval == 8
+    monitor.grid_checker.num_connected = 5
+    clock.advance(8)
+    assert monitor.interval == 2
+
+
+def test_monitor_polls_quickly_while_connecting():
+    monitor, clock = adaptive_monitor(ready=False)
+    for _ in range(3):
+        clock.advance(2)
+    assert monitor.interval == 2
+
+
+def test_monitor_polls_quickly_while_syncing():
+    monitor, clock = adaptive_monitor(status=MagicFolderStatus.SYNCING)
+    for _ in range(3):
+        clock.advance(2)
+    assert monitor.interval == 2
+
+
+def test_monitor_uses_idle_interval_while_idle():
+    monitor, clock = adaptive_monitor()
+    monitor.set_idle(True)
+    clock.advance(2)
+    assert monitor.interval == monitor.idle_interval
+
+
+def test_monitor_set_idle_false_snaps_back():
+    monitor, clock = adaptive_monitor()
+    monitor.set_idle(True)
+    clock.advance(2)
+    monitor.set_idle(False)
+    assert monitor.interval == 2
+
+
+def test_monitor_wake_reschedules_next_check():
+    monitor, clock = adaptive_monitor()
+    clock.advance(2)
+    clock.advance(4)
+    assert monitor.interval == 8
+    checks = []
+    monitor.check_finished.connect(lambda: checks.append(clock.seconds()))
+    monitor.wake()
+    clock.advance(2)
+    assert checks == [8]
+
+
+def test_monitor_reschedules_after_check_finishes():
+    monitor, clock = adaptive_monitor()
+    clock.advance(2)
+    check = Deferred()
+    monitor.grid_checker.do_check = lambda: check
+    clock.advance(4)  # A check starts at 6
+    monitor.grid_checker.num_connected = 5
+    check.callback(None)  # ...and finds that something changed
+    monitor.grid_checker.do_check = lambda: succeed(None)
+    checks = []
+    monitor.check_finished.connect(lambda: checks.append(clock.seconds()))
+    clock.pump([0, 2, 4])
+    assert checks == [8, 12]
+
+
+def test_monitor_is_not_busy_when_shares_happy_is_unknown():
+    monitor, clock = adaptive_monitor(ready=False)
+    monitor.gateway.shares_happy = 0
+    for _ in range(3):
+        clock.advance(monitor.interval)
+    assert monitor.interval == 16
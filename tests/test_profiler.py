@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from twisted.internet.task import Clock
+
+from gridsync.profiler import StartupProfiler
+
+
+@pytest.fixture()
+def clock():
+    clock = Clock()
+    clock.advance(100)
+    return clock
+
+
+@pytest.fixture()
+def profiler(clock):
+    return StartupProfiler(clock.seconds)
+
+
+def test_span_records_duration(profiler, clock):
+    with profiler.span("Test") as span:
+        clock.advance(1.5)
+    assert span.duration == 1.5
+
+
+def test_end_does_not_change_ended_span(profiler, clock):
+    span = profiler.begin("Test")
+    clock.advance(1)
+    profiler.end(span)
+    clock.advance(1)
+    profiler.end(span)
+    assert span.duration == 1
+
+
+def test_spans_ignored_after_finish(profiler):
+    with profiler.span("Before"):
+        pass
+    profiler.finish()
+    with profiler.span("After"):
+        pass
+    assert [span.name for span in profiler.spans] == ["Before"]
+
+
+def test_to_chrome_trace(profiler, clock):
+    clock.advance(1)
+    with profiler.span("Tahoe.start", "TestGrid", pid=123):
+        clock.advance(2)
+    profiler.begin("Unfinished")
+    events = profiler.to_chrome_trace()["traceEvents"]
+    assert len(events) == 2
+    span_event, metadata_event = events
+    assert span_event["name"] == "Tahoe.start"
+    assert span_event["ph"] == "X"
+    assert span_event["ts"] == 1_000_000
+    assert span_event["dur"] == 2_000_000
+    assert span_event["args"] == {"pid": "123"}
+    assert metadata_event["ph"] == "M"
+    assert metadata_event["tid"] == span_event["tid"]
+    assert metadata_event["args"] == {"name": "TestGrid"}
+
+
+def test_write_chrome_trace(profiler, tmp_path):
+    with profiler.span("Test"):
+        pass
+    path = tmp_path / "trace.json"
+    profiler.write_chrome_trace(str(path))
+    assert json.loads(path.read_text())["traceEvents"][0]["name"] == "Test"
+
+
+def test_summary(profiler, clock):
+    with profiler.span("Second", "TestGrid"):
+        clock.advance(0.25)
+    profiler.spans.reverse()
+    profiler.begin("First").start = clock.seconds() - 1
+    lines = profiler.summary().split("\n")
+    assert "First" in lines[0] and "(unfinished)" in lines[0]
+    assert lines[1].endswith("[TestGrid] Second")
+    assert "250.0ms" in lines[1]
@@ -0,0 +1,132 @@
+from typing import Optional
+
+import pytest
+from pytest_twisted import ensureDeferred
+
+from gridsync.crypto import randstr
+from gridsync.errors import UpgradeRequiredError
+from gridsync.rootcap import RootcapManager
+
+
+class FakeGateway:
+    """
+    An in-memory stand-in for the parts of ``Tahoe`` used by RootcapManager
+    that records the number of writes made to each directory.
+    """
+
+    def __init__(self, nodedir: str) -> None:
+        self.nodedir = nodedir
+        self.dirs: dict[str, dict[str, str]] = {}
+        self.writes: dict[str, int] = {}
+
+    async def mkdir(
+        self,
+        parentcap: str = None,
+        childname: str = None,
+        children: Optional[dict[str, str]] = None,
+    ) -> str:
+        cap = f"URI:DIR2:{randstr(8)}"
+        self.dirs[cap] = dict(children or {})
+        if parentcap and childname:
+            await self.link(parentcap, childname, cap)
+        return cap
+
+    async def link(self, dircap: str, childname: str, childcap: str) -> None:
+        self.dirs[dircap][childname] = childcap
+        self.writes[dircap] = self.writes.get(dircap, 0) + 1
+
+    async def link_many(self, dircap: str, children: dict[str, str]) -> None:
+        self.dirs[dircap].update(children)
+        self.writes[dircap] = self.writes.get(dircap, 0) + 1
+
+    async def ls(
+        self,
+        cap: str,
+        exclude_dirnodes: bool = False,
+        exclude_filenodes: bool = False,
+    ) -> Optional[dict[str, dict]]:
+        if cap not in self.dirs:
+            return None
+        return {name: {"cap": c} for name, c in self.dirs[cap].items()}
+
+
+@pytest.fixture()
+def gateway(tmp_path):
+    (tmp_path / "private").mkdir()
+    return FakeGateway(str(tmp_path))
+
+
+async def _make_source_rootcap(gateway: FakeGateway, backups: dict) -> str:
+    rootcap = await gateway.mkdir()
+    basedircap = await gateway.mkdir(rootcap, "v1")
+    for dirname, children in backups.items():
+        await gateway.mkdir(basedircap, dirname, children=children)
+    return rootcap
+
+
+@ensureDeferred
+async def test_import_rootcap_imports_all_backups(gateway):
+    manager = RootcapManager(gateway)
+    backups = {
+        f"Backups-{i}": {f"backup-{j}": f"URI:DIR2:{i}-{j}" for j in range(3)}
+        for i in range(10)
+    }
+    await manager.import_rootcap(await _make_source_rootcap(gateway, backups))
+    imported = {name: await manager.get_backups(name) for name in backups}
+    assert {
+        dirname: {name: data["cap"] for name, data in children.items()}
+        for dirname, children in imported.items()
+    } == backups
+
+
+@ensureDeferred
+async def test_import_rootcap_creates_backup_dirs_with_children(gateway):
+    manager = RootcapManager(gateway)
+    backups = {"Backups": {f"backup-{i}": f"URI:DIR2:{i}" for i in range(5)}}
+    await manager.import_rootcap(await _make_source_rootcap(gateway, backups))
+    backup_cap = await manager.get_backup_cap("Backups")
+    assert gateway.writes.get(backup_cap, 0) == 0
+
+
+@ensureDeferred
+async def test_import_rootcap_links_into_existing_backup_dirs(gateway):
+    manager = RootcapManager(gateway)
+    await manager.add_backup("Backups", "existing", "URI:DIR2:existing")
+    backups = {"Backups": {"backup-1": "URI:DIR2:1"}}
+    await manager.import_rootcap(await _make_source_rootcap(gateway, backups))
+    assert set(await manager.get_backups("Backups")) == {
+        "existing",
+        "backup-1",
+    }
+
+
+@ensureDeferred
+async def test_import_rootcap_reports_progress(gateway):
+    manager = RootcapManager(gateway)
+    backups = {f"Backups-{i}": {"backup": f"URI:DIR2:{i}"} for i in range(3)}
+    progress = []
+    await manager.import_rootcap(
+        await _make_source_rootcap(gateway, backups),
+        lambda completed, total: progress.append((completed, total)),
+    )
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+@ensureDeferred
+async def test_import_rootcap_raises_upgrade_required_error(gateway):
+    manager = RootcapManager(gateway)
+    rootcap = await gateway.mkdir()
+    await gateway.mkdir(rootcap, "v0")
+    with pytest.raises(UpgradeRequiredError):
+        await manager.import_rootcap(rootcap)
+
+
+@ensureDeferred
+async def test_import_rootcap_links_backups_in_a_single_write(gateway):
+    manager = RootcapManager(gateway)
+    await manager.add_backup("Backups", "existing", "URI:DIR2:existing")
+    backup_cap = await manager.get_backup_cap("Backups")
+    writes = gateway.writes[backup_cap]
+    backups = {"Backups": {f"backup-{i}": f"URI:DIR2:{i}" for i in range(5)}}
+    await manager.import_rootcap(await _make_source_rootcap(gateway, backups))
+    assert gateway.writes[backup_cap] == writes + 1
@@ -0,0 +1,111 @@
+from unittest.mock import Mock
+
+import pytest
+from twisted.internet.task import Clock
+
+from gridsync.scheduler import CoalescingScheduler
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+def make_scheduler(clock, delay=0.25, max_wait=None):
+    function = Mock()
+    return CoalescingScheduler(function, delay, max_wait, clock), function
+
+
+def test_schedule_calls_function_after_delay(clock):
+    scheduler, function = make_scheduler(clock)
+    scheduler.schedule("TestFolder")
+    clock.advance(0.2)
+    function.assert_not_called()
+    clock.advance(0.05)
+    function.assert_called_once_with("TestFolder")
+
+
+def test_schedule_coalesces_requests_into_one_call(clock):
+    scheduler, function = make_scheduler(clock)
+    for _ in range(10):
+        scheduler.schedule("TestFolder")
+        clock.advance(0.1)
+    clock.advance(1)
+    function.assert_called_once_with("TestFolder")
+
+
+def test_schedule_calls_on_trailing_edge(clock):
+    scheduler, function = make_scheduler(clock)
+    scheduler.schedule("TestFolder")
+    clock.advance(0.2)
+    scheduler.schedule("TestFolder")
+    clock.advance(0.2)
+    function.assert_not_called()
+    clock.advance(0.05)
+    function.assert_called_once_with("TestFolder")
+
+
+def test_schedule_respects_max_wait(clock):
+    scheduler, function = make_scheduler(clock, max_wait=1)
+    for _ in range(12):  # 2.4 seconds of continuous requests
+        scheduler.schedule("TestFolder")
+        clock.advance(0.2)
+    assert function.call_count == 2
+
+
+def test_schedule_keeps_keys_independent(clock):
+    scheduler, function = make_scheduler(clock)
+    scheduler.schedule("TestFolder1")
+    scheduler.schedule("TestFolder2")
+    scheduler.schedule("TestFolder1")
+    clock.advance(1)
+    assert sorted(c.args[0] for c in function.call_args_list) == [
+        "TestFolder1",
+        "TestFolder2",
+    ]
+
+
+def test_schedule_keeps_one_delayed_call_per_key(clock):
+    scheduler, _ = make_scheduler(clock)
+    for _ in range(100):
+        scheduler.schedule("TestFolder")
+    assert len(clock.getDelayedCalls()) == 1
+
+
+def test_schedule_records_stats(clock):
+    scheduler, _ = make_scheduler(clock)
+    for _ in range(5):
+        scheduler.schedule("TestFolder1")
+    scheduler.schedule("TestFolder2")
+    clock.advance(1)
+    assert (
+        scheduler.stats.requests,
+        scheduler.stats.calls,
+        scheduler.stats.coalesced,
+    ) == (6, 2, 4)
+
+
+def test_is_pending(clock):
+    scheduler, _ = make_scheduler(clock)
+    scheduler.schedule("TestFolder")
+    assert scheduler.is_pending("TestFolder")
+    clock.advance(1)
+    assert not scheduler.is_pending("TestFolder")
+
+
+def test_cancel_prevents_call(clock):
+    scheduler, function = make_scheduler(clock)
+    scheduler.schedule("TestFolder")
+    scheduler.cancel("TestFolder")
+    clock.advance(1)
+    function.assert_not_called()
+
+
+def test_cancel_all_prevents_calls(clock):
+    scheduler, function = make_scheduler(clock)
+    scheduler.schedule("TestFolder1")
+    scheduler.schedule("TestFolder2")
+    scheduler.cancel_all()
+    clock.advance(1)
+    function.assert_not_called()
+    assert not clock.getDelayedCalls()
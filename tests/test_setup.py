@@ -579,12 +579,12 @@ def test_join_grid_storage_servers(monkeypatch, tmpdir):
 async def test_join_folders_emit_joined_folders_signal(
     monkeypatch, qtbot, tmpdir
 ):
-    async def fake_link(self, dircap, name, childcap):
+    async def fake_link_many(self, dircap, children):
         return None
 
     monkeypatch.setattr(
-        "gridsync.tahoe.Tahoe.link",
-        fake_link,
+        "gridsync.tahoe.Tahoe.link_many",
+        fake_link_many,
     )
     sr = SetupRunner([])
     sr.gateway = Tahoe(str(tmpdir.mkdir("TestGrid")))
@@ -595,6 +595,31 @@ async def test_join_folders_emit_joined_folders_signal(
     assert blocker.args == [["TestFolder"]]
 
 
+@ensureDeferred
+async def test_join_folders_links_all_folders_at_once(monkeypatch, tmpdir):
+    fake_link_many = Mock(return_value=succeed(None))
+    monkeypatch.setattr("gridsync.tahoe.Tahoe.link_many", fake_link_many)
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.get_rootcap", lambda _: "URI:rootcap"
+    )
+    sr = SetupRunner([])
+    sr.gateway = Tahoe(str(tmpdir.mkdir("TestGrid")))
+    folders_data = {
+        "TestFolder": {"code": "URI:1+URI:2"},
+        "TestFolder2": {"code": "URI:3+URI:4"},
+    }
+    await Deferred.fromCoroutine(sr.join_folders(folders_data))
+    fake_link_many.assert_called_once_with(
+        "URI:rootcap",
+        {
+            "TestFolder (collective)": "URI:1",
+            "TestFolder (personal)": "URI:2",
+            "TestFolder2 (collective)": "URI:3",
+            "TestFolder2 (personal)": "URI:4",
+        },
+    )
+
+
 @inlineCallbacks
 def test_run_raise_upgrade_required_error():
     sr = SetupRunner([])
@@ -1,10 +1,13 @@
 import sys
 
+import pytest
+from filelock import Timeout
 from psutil import Process
 from pytest_twisted import inlineCallbacks
 from twisted.internet import reactor
 from twisted.internet.task import deferLater
 
+from gridsync.profiler import StartupProfiler
 from gridsync.supervisor import Supervisor
 from gridsync.util import until
 
@@ -94,3 +97,17 @@ def test_supervisor_calls_call_after_start(tmp_path):
     )
     yield supervisor.stop()
     assert f_was_called[0] is True
+
+
+@inlineCallbacks
+def test_supervisor_ends_pidfile_span_if_locking_fails(tmp_path, monkeypatch):
+    def fake_file_lock(lockfile, timeout):
+        raise Timeout(lockfile)
+
+    profiler = StartupProfiler()
+    monkeypatch.setattr("gridsync.supervisor.startup_profiler", profiler)
+    monkeypatch.setattr("gridsync.supervisor.FileLock", fake_file_lock)
+    supervisor = Supervisor(tmp_path / "pidfile")
+    with pytest.raises(Timeout):
+        yield supervisor.start(PROCESS_ARGS)
+    assert [span.end is not None for span in profiler.spans] == [True]
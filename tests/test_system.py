@@ -1,7 +1,18 @@
+from unittest.mock import Mock
+
 import pytest
+from pytest_twisted import ensureDeferred
+from twisted.internet.defer import succeed
+from twisted.internet.error import ProcessDone, ProcessTerminated
+from twisted.python.failure import Failure
 
 from gridsync.crypto import randstr
-from gridsync.system import which
+from gridsync.system import (
+    ExecutableVersionCache,
+    SubprocessError,
+    SubprocessProtocol,
+    which,
+)
 
 
 def test_which():
@@ -12,3 +23,136 @@ def test_which():
 def test_which_raises_environment_error():
     with pytest.raises(EnvironmentError):
         which(randstr(32))
+
+
+@pytest.fixture()
+def executable(tmp_path):
+    path = tmp_path / "tahoe"
+    path.write_text("#!/bin/sh\n")
+    return str(path)
+
+
+@pytest.fixture()
+def version_cache(tmp_path):
+    return ExecutableVersionCache(str(tmp_path / "versions.json"))
+
+
+def test_executable_version_cache_get_returns_none_if_missing(
+    version_cache, executable
+):
+    assert version_cache.get(executable) is None
+
+
+def test_executable_version_cache_persists_versions(tmp_path, executable):
+    ExecutableVersionCache(str(tmp_path / "versions.json")).set(
+        executable, "1.2.3"
+    )
+    version_cache = ExecutableVersionCache(str(tmp_path / "versions.json"))
+    assert version_cache.get(executable) == "1.2.3"
+
+
+def test_executable_version_cache_invalidated_by_modification(
+    version_cache, executable
+):
+    version_cache.set(executable, "1.2.3")
+    with open(executable, "a") as f:
+        f.write("exit 0\n")
+    assert version_cache.get(executable) is None
+
+
+def test_executable_version_cache_ignores_corrupt_file(tmp_path, executable):
+    path = tmp_path / "versions.json"
+    path.write_text("{")
+    assert ExecutableVersionCache(str(path)).get(executable) is None
+
+
+@ensureDeferred
+async def test_executable_version_cache_get_version_probes_once(
+    version_cache, executable
+):
+    probe = Mock(return_value=succeed("1.2.3"))
+    assert await version_cache.get_version(executable, probe) == "1.2.3"
+    assert await version_cache.get_version(executable, probe) == "1.2.3"
+    assert probe.call_count == 1
+
+
+def test_subprocess_protocol_joins_lines_split_across_chunks():
+    lines = []
+    protocol = SubprocessProtocol(stdout_line_collector=lines.append)
+    protocol.childDataReceived(1, b"Hello, ")
+    protocol.childDataReceived(1, b"World!\nSecond")
+    protocol.childDataReceived(1, b" line\nThird ")
+    assert lines == ["Hello, World!", "Second line"]
+
+
+def test_subprocess_protocol_decodes_characters_split_across_chunks():
+    lines = []
+    protocol = SubprocessProtocol(stdout_line_collector=lines.append)
+    data = "Caf\u00e9\n".encode("utf-8")
+    protocol.childDataReceived(1, data[:4])
+    protocol.childDataReceived(1, data[4:])
+    assert lines == ["Caf\u00e9"]
+
+
+def test_subprocess_protocol_keeps_partial_lines_separate_per_fd():
+    stdout = []
+    stderr = []
+    protocol = SubprocessProtocol(
+        stdout_line_collector=stdout.append,
+        stderr_line_collector=stderr.append,
+    )
+    protocol.childDataReceived(1, b"out")
+    protocol.childDataReceived(2, b"err")
+    protocol.childDataReceived(1, b"put\n")
+    protocol.childDataReceived(2, b"or\n")
+    assert (stdout, stderr) == (["output"], ["error"])
+
+
+def test_subprocess_protocol_skips_blank_lines():
+    lines = []
+    protocol = SubprocessProtocol(stdout_line_collector=lines.append)
+    protocol.childDataReceived(1, b"\nA\r\n\n  \nB\n")
+    assert lines == ["A", "B"]
+
+
+def test_subprocess_protocol_flushes_partial_line_when_ended():
+    lines = []
+    protocol = SubprocessProtocol(stdout_line_collector=lines.append)
+    protocol.childDataReceived(1, b"A\nB")
+    protocol.processEnded(Failure(ProcessDone(0)))
+    assert (lines, protocol.done.result) == (["A", "B"], "A\nB")
+
+
+def test_subprocess_protocol_callback_trigger_fires_done_with_output():
+    protocol = SubprocessProtocol(callback_triggers=["Started"])
+    protocol.childDataReceived(1, b"Starting...\nSta")
+    assert not protocol.done.called
+    protocol.childDataReceived(1, b"rted\n")
+    assert protocol.done.result == "Starting...\nStarted"
+
+
+def test_subprocess_protocol_errback_trigger_fires_done_with_exception():
+    protocol = SubprocessProtocol(
+        callback_triggers=["Started"],
+        errback_triggers=[("Address in use", OSError)],
+    )
+    protocol.childDataReceived(2, b"Error: Address in use\n")
+    with pytest.raises(OSError, match="Address in use"):
+        protocol.done.result.raiseException()
+    protocol.done.addErrback(lambda _: None)
+
+
+def test_subprocess_protocol_triggers_fire_done_only_once():
+    protocol = SubprocessProtocol(callback_triggers=["Started", "Ready"])
+    protocol.childDataReceived(1, b"Started and Ready\nReady\n")
+    assert protocol.done.result == "Started and Ready"
+
+
+def test_subprocess_protocol_caps_output(monkeypatch):
+    monkeypatch.setattr("gridsync.system.SUBPROCESS_OUTPUT_MAX_LINES", 3)
+    protocol = SubprocessProtocol()
+    protocol.childDataReceived(1, b"1\n2\n3\n4\n5\n")
+    protocol.processEnded(Failure(ProcessTerminated(1)))
+    with pytest.raises(SubprocessError, match="^3\n4\n5$"):
+        protocol.done.result.raiseException()
+    protocol.done.addErrback(lambda _: None)
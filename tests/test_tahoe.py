@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import json
 import os
 from pathlib import Path
 from typing import Awaitable, Callable, TypeVar
@@ -606,13 +607,47 @@ def test_get_grid_status(tahoe, monkeypatch):
     assert (num_connected, num_known, available_space) == (2, 3, 3072)
 
 
-@inlineCallbacks
-def test_get_connected_servers(tahoe, monkeypatch):
-    html = b"Connected to <span>3</span>of <span>10</span>"
-    monkeypatch.setattr("treq.get", fake_get)
-    monkeypatch.setattr("treq.content", lambda _: succeed(html))
-    output = yield Deferred.fromCoroutine(tahoe.get_connected_servers())
-    assert output == 3
+@ensureDeferred
+async def test_get_grid_status_reuses_recent_result(tahoe, monkeypatch):
+    fake_fetch = Mock(return_value=succeed((3, 5, 1024)))
+    monkeypatch.setattr("gridsync.tahoe.fetch_grid_status", fake_fetch)
+    await tahoe.get_grid_status()
+    assert await tahoe.get_grid_status() == (3, 5, 1024)
+    assert fake_fetch.call_count == 1
+
+
+@ensureDeferred
+async def test_get_grid_status_refetches_when_max_age_exceeded(
+    tahoe, monkeypatch
+):
+    fake_fetch = Mock(return_value=succeed((3, 5, 1024)))
+    monkeypatch.setattr("gridsync.tahoe.fetch_grid_status", fake_fetch)
+    await tahoe.get_grid_status()
+    await tahoe.get_grid_status(max_age=0)
+    assert fake_fetch.call_count == 2
+
+
+@ensureDeferred
+async def test_get_grid_status_shares_concurrent_requests(tahoe, monkeypatch):
+    d = Deferred()
+    fake_fetch = Mock(return_value=d)
+    monkeypatch.setattr("gridsync.tahoe.fetch_grid_status", fake_fetch)
+    first = Deferred.fromCoroutine(tahoe.get_grid_status())
+    second = Deferred.fromCoroutine(tahoe.get_grid_status())
+    d.callback((3, 5, 1024))
+    assert (await first, await second) == ((3, 5, 1024), (3, 5, 1024))
+    assert fake_fetch.call_count == 1
+
+
+@ensureDeferred
+async def test_get_grid_status_updates_ready_state(tahoe, monkeypatch):
+    tahoe.shares_happy = 3
+    monkeypatch.setattr(
+        "gridsync.tahoe.fetch_grid_status",
+        Mock(return_value=succeed((3, 5, 1024))),
+    )
+    await tahoe.get_grid_status()
+    assert tahoe.ready is True
 
 
 @inlineCallbacks
@@ -635,7 +670,7 @@ def fake_awaitable_method(value: T) -> Callable[[], Awaitable[T]]:
 def test_is_ready_false_not_connected_servers(tahoe, monkeypatch):
     tahoe.shares_happy = 7
     monkeypatch.setattr(
-        "gridsync.tahoe.Tahoe.get_connected_servers",
+        "gridsync.tahoe.Tahoe.get_grid_status",
         fake_awaitable_method(None),
     )
     output = yield Deferred.fromCoroutine(tahoe.is_ready())
@@ -646,8 +681,8 @@ def test_is_ready_false_not_connected_servers(tahoe, monkeypatch):
 def test_is_ready_true(tahoe, monkeypatch):
     tahoe.shares_happy = 7
     monkeypatch.setattr(
-        "gridsync.tahoe.Tahoe.get_connected_servers",
-        fake_awaitable_method(10),
+        "gridsync.tahoe.Tahoe.get_grid_status",
+        fake_awaitable_method((10, 10, 1024)),
     )
     output = yield Deferred.fromCoroutine(tahoe.is_ready())
     assert output is True
@@ -657,13 +692,46 @@ def test_is_ready_true(tahoe, monkeypatch):
 def test_is_ready_false_connected_less_than_happy(tahoe, monkeypatch):
     tahoe.shares_happy = 7
     monkeypatch.setattr(
-        "gridsync.tahoe.Tahoe.get_connected_servers",
-        fake_awaitable_method(3),
+        "gridsync.tahoe.Tahoe.get_grid_status",
+        fake_awaitable_method((3, 10, 1024)),
     )
     output = yield Deferred.fromCoroutine(tahoe.is_ready())
     assert output is False
 
 
+@inlineCallbacks
+def test_is_ready_caches_ready_state(tahoe, monkeypatch):
+    tahoe.shares_happy = 7
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.get_grid_status",
+        fake_awaitable_method((10, 10, 1024)),
+    )
+    yield Deferred.fromCoroutine(tahoe.is_ready())
+    assert tahoe.ready is True
+
+
+def test_update_ready_state_false_without_shares_happy(tahoe):
+    tahoe.shares_happy = 0
+    assert tahoe.update_ready_state(10) is False
+
+
+def test_update_ready_state_false_after_disconnecting(tahoe):
+    tahoe.shares_happy = 7
+    tahoe.update_ready_state(10)
+    tahoe.update_ready_state(3)
+    assert tahoe.ready is False
+
+
+def test_await_ready_returns_immediately_when_known_ready(tahoe, monkeypatch):
+    tahoe.shares_happy = 7
+    tahoe.update_ready_state(10)
+    fake_is_ready = Mock()
+    monkeypatch.setattr("gridsync.tahoe.Tahoe.is_ready", fake_is_ready)
+    d = tahoe.await_ready()
+    assert d.called
+    assert fake_is_ready.call_count == 0
+
+
 @inlineCallbacks
 def test_await_ready(tahoe, monkeypatch):
     monkeypatch.setattr(
@@ -833,6 +901,82 @@ async def test_tahoe_link_fail_code_500(tahoe, monkeypatch):
         await tahoe.link("test_dircap", "test_childname", "test_childcap")
 
 
+DIRCAP = (
+    "URI:DIR2:h6esoa5ca2bkwgersspqfk5gty:"
+    "ixphgtnlhm3eypfcbadnh3ywzrthua4vxgldywh6nbq2ligddl3q"
+)
+FILECAP = (
+    "URI:CHK:5qm4v3trdsrir2q3ojjpjk2qgi:"
+    "wkf3l4kziur5vwipywwfjaerxo6e62oazjeejazy7cfgiaghizsa:1:1:1024"
+)
+
+
+@ensureDeferred
+async def test_tahoe_link_many_sets_all_children_in_one_request(
+    tahoe, monkeypatch
+):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    post = Mock(side_effect=fake_post)
+    monkeypatch.setattr("treq.post", post)
+    await tahoe.link_many(
+        "URI:DIR2:abc",
+        {"dir": DIRCAP, "file": FILECAP},
+    )
+    post.assert_called_once()
+    assert post.call_args.kwargs["params"] == {"t": "set_children"}
+    assert json.loads(post.call_args.kwargs["data"]) == {
+        "dir": ["dirnode", {"rw_uri": DIRCAP}],
+        "file": ["filenode", {"ro_uri": FILECAP}],
+    }
+
+
+@ensureDeferred
+async def test_tahoe_link_many_fail_code_500(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    monkeypatch.setattr("treq.post", fake_post_code_500)
+    monkeypatch.setattr("treq.content", lambda _: succeed(b"test content"))
+    with pytest.raises(TahoeWebError):
+        await tahoe.link_many("URI:DIR2:abc", {"dir": DIRCAP})
+
+
+@ensureDeferred
+async def test_tahoe_mkdir_with_children(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    post = Mock(side_effect=fake_post)
+    monkeypatch.setattr("treq.post", post)
+    monkeypatch.setattr("treq.content", lambda _: succeed(b"URI:DIR2:abc"))
+    output = await tahoe.mkdir(children={"dir": DIRCAP})
+    assert output == "URI:DIR2:abc"
+    assert post.call_args.kwargs["params"] == {"t": "mkdir-with-children"}
+    assert json.loads(post.call_args.kwargs["data"]) == {
+        "dir": ["dirnode", {"rw_uri": DIRCAP}],
+    }
+
+
+@ensureDeferred
+async def test_tahoe_get_json_is_cached_until_link(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    get = Mock(side_effect=fake_post)
+    monkeypatch.setattr("treq.get", get)
+    monkeypatch.setattr("treq.post", fake_post)
+    monkeypatch.setattr("treq.content", lambda _: succeed(b'["dirnode"]'))
+    tahoe.nodeurl = "http://127.0.0.1:65536/"
+    await tahoe.get_json("URI:DIR2:abc")
+    await tahoe.get_json("URI:DIR2:abc")
+    assert get.call_count == 1
+    await tahoe.link("URI:DIR2:abc", "test_childname", "test_childcap")
+    assert await tahoe.get_json("URI:DIR2:abc") == ["dirnode"]
+    assert get.call_count == 2
+
+
 @ensureDeferred
 async def test_tahoe_unlink(tahoe, monkeypatch):
     monkeypatch.setattr(
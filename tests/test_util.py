@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 
+import json
 from binascii import hexlify, unhexlify
 
 import pytest
+from pytest_twisted import inlineCallbacks
+from twisted.internet.defer import Deferred
 
 from gridsync.util import (
+    JSONArrayParser,
     b58decode,
     b58encode,
     future_date,
+    gather_limited,
     humanized_list,
     strip_html_tags,
     to_bool,
@@ -111,3 +116,72 @@ def test_future_date_does_not_return_centuries_for_small_int_days():
 )
 def test_strip_html_tags(s, expected):
     assert strip_html_tags(s) == expected
+
+
+JSON_ARRAY = json.dumps(
+    [{"relpath": f"Fïle-{i}", "size": i * 1.5} for i in range(100)]
+    + [1, -2.5e-3, "three", True, None, []],
+    indent=1,
+).encode("utf-8")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 4096])
+def test_json_array_parser_yields_elements_across_chunks(chunk_size):
+    parser = JSONArrayParser()
+    items = []
+    for i in range(0, len(JSON_ARRAY), chunk_size):
+        items.extend(parser.feed(JSON_ARRAY[i : i + chunk_size]))
+    parser.close()
+    assert items == json.loads(JSON_ARRAY)
+
+
+def test_json_array_parser_yields_elements_once_received_in_full():
+    parser = JSONArrayParser()
+    assert (parser.feed(b'[{"a": 1}, {"b"'), parser.feed(b": 2}]")) == (
+        [{"a": 1}],
+        [{"b": 2}],
+    )
+
+
+@pytest.mark.parametrize("data", [b"{}", b"[1 2]", b"[1]2", b"[1,]", b"[1, 2"])
+def test_json_array_parser_raises_value_error_if_invalid(data):
+    parser = JSONArrayParser()
+    with pytest.raises(ValueError):
+        parser.feed(data)
+        parser.close()
+
+
+@inlineCallbacks
+def test_gather_limited_preserves_order_and_limits_concurrency():
+    running = []
+    max_running = []
+    waiting = [Deferred() for _ in range(5)]
+
+    def make_function(i):
+        async def function():
+            running.append(i)
+            max_running.append(len(running))
+            await waiting[i]
+            running.remove(i)
+            return i
+
+        return function
+
+    d = gather_limited([make_function(i) for i in range(5)], 2)
+    for waiter in reversed(waiting):
+        waiter.callback(None)
+    results = yield d
+    assert results == [0, 1, 2, 3, 4]
+    assert max(max_running) == 2
+
+
+@inlineCallbacks
+def test_gather_limited_raises_first_error():
+    async def fail():
+        raise ValueError("test")
+
+    async def succeed_():
+        return None
+
+    with pytest.raises(ValueError):
+        yield gather_limited([succeed_, fail, succeed_], 2)
@@ -0,0 +1,152 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+from watchdog.events import (
+    DirCreatedEvent,
+    DirModifiedEvent,
+    FileClosedEvent,
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+)
+
+from gridsync.watchdog import PathTrie, Watchdog, is_relevant_event
+
+
+@pytest.fixture()
+def trie(tmp_path):
+    trie = PathTrie()
+    trie.add(str(tmp_path / "Folder"), "Folder")
+    trie.add(str(tmp_path / "Folder" / "Nested"), "Nested")
+    trie.add(str(tmp_path / "Other"), "Other")
+    return trie
+
+
+def test_lookup_returns_value_for_root(trie, tmp_path):
+    assert trie.lookup(str(tmp_path / "Folder")) == "Folder"
+
+
+def test_lookup_returns_value_for_path_inside_root(trie, tmp_path):
+    path = tmp_path / "Other" / "a" / "b.txt"
+    assert trie.lookup(str(path)) == "Other"
+
+
+def test_lookup_returns_deepest_root(trie, tmp_path):
+    path = tmp_path / "Folder" / "Nested" / "file.txt"
+    assert trie.lookup(str(path)) == "Nested"
+
+
+def test_lookup_does_not_match_sibling_with_common_prefix(trie, tmp_path):
+    assert trie.lookup(str(tmp_path / "FolderX" / "file.txt")) is None
+
+
+def test_lookup_normalizes_path(trie, tmp_path):
+    path = str(tmp_path / "Other") + os.sep + "a" + os.sep + ".." + os.sep
+    assert trie.lookup(path) == "Other"
+
+
+def test_remove(trie, tmp_path):
+    trie.remove(str(tmp_path / "Folder" / "Nested"))
+    path = tmp_path / "Folder" / "Nested" / "file.txt"
+    assert (trie.lookup(str(path)), len(trie)) == ("Folder", 2)
+
+
+def test_remove_prunes_empty_branches(tmp_path):
+    trie = PathTrie()
+    trie.add(str(tmp_path / "Folder"), "Folder")
+    trie.remove(str(tmp_path / "Folder"))
+    assert trie._root == {}
+
+
+def test_remove_unknown_path_is_ignored(trie, tmp_path):
+    trie.remove(str(tmp_path / "Unknown"))
+    assert len(trie) == 3
+
+
+@pytest.mark.parametrize(
+    "event,relevant",
+    [
+        (FileCreatedEvent("/Folder/file.txt"), True),
+        (FileModifiedEvent("/Folder/file.txt"), True),
+        (FileDeletedEvent("/Folder/file.txt"), True),
+        (FileClosedEvent("/Folder/file.txt"), True),
+        (DirCreatedEvent("/Folder/Subfolder"), True),
+        (DirModifiedEvent("/Folder/Subfolder"), False),
+        (FileModifiedEvent("/Folder/file.txt.backup"), False),
+        (FileCreatedEvent("/Folder/file.txt.conflict-Alice"), False),
+        (FileModifiedEvent("/Folder/.file.txt.swp"), False),
+        (FileModifiedEvent("/Folder/file.txt~"), False),
+        (FileMovedEvent("/Folder/file.tmp", "/Folder/file.txt"), True),
+        (FileMovedEvent("/Folder/file.txt", "/Folder/file.txt.backup"), True),
+        (FileMovedEvent("/Folder/a.tmp", "/Folder/b.tmp"), False),
+    ],
+)
+def test_is_relevant_event(event, relevant):
+    assert is_relevant_event(event) == relevant
+
+
+def test_is_relevant_event_ignores_opened_events():
+    event = FileModifiedEvent("/Folder/file.txt")
+    event.event_type = "opened"
+    assert is_relevant_event(event) is False
+
+
+@pytest.fixture()
+def watchdog(tmp_path):
+    watchdog = Watchdog()
+    watchdog._observer = Mock()
+    watchdog.add_watch(str(tmp_path / "Folder"))
+    watchdog.add_watch(str(tmp_path / "Other"))
+    return watchdog
+
+
+def test_watchdog_emits_one_notification_per_dirty_folder(
+    watchdog, tmp_path, qtbot
+):
+    modified = []
+    watchdog.path_modified.connect(modified.append)
+    for i in range(1000):
+        path = tmp_path / "Folder" / f"file{i}.txt"
+        watchdog.on_event(FileModifiedEvent(str(path)))
+        watchdog.on_event(FileModifiedEvent(str(tmp_path / "Other" / "a")))
+    qtbot.wait_until(lambda: len(modified) == 2)
+    assert sorted(modified) == [
+        str(tmp_path / "Folder"),
+        str(tmp_path / "Other"),
+    ]
+
+
+def test_watchdog_notifies_again_after_delivery(watchdog, tmp_path, qtbot):
+    modified = []
+    watchdog.path_modified.connect(modified.append)
+    event = FileModifiedEvent(str(tmp_path / "Folder" / "file.txt"))
+    watchdog.on_event(event)
+    qtbot.wait_until(lambda: len(modified) == 1)
+    watchdog.on_event(event)
+    qtbot.wait_until(lambda: len(modified) == 2)
+
+
+def test_watchdog_drops_irrelevant_events(watchdog, tmp_path, qtbot):
+    watchdog.on_event(FileModifiedEvent(str(tmp_path / "Folder" / "a.tmp")))
+    watchdog.on_event(FileModifiedEvent(str(tmp_path / "Unwatched" / "a")))
+    assert (
+        watchdog.stats.events,
+        watchdog.stats.ignored,
+        watchdog.stats.notified,
+    ) == (2, 1, 0)
+
+
+def test_watchdog_notifies_both_folders_of_move_between_them(
+    watchdog, tmp_path, qtbot
+):
+    modified = []
+    watchdog.path_modified.connect(modified.append)
+    watchdog.on_event(
+        FileMovedEvent(
+            str(tmp_path / "Folder" / "a.txt"),
+            str(tmp_path / "Other" / "a.txt"),
+        )
+    )
+    qtbot.wait_until(lambda: len(modified) == 2)
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
+import json
 from unittest.mock import Mock
 
 import pytest
 from pytest_twisted import inlineCallbacks
+from twisted.internet.defer import succeed
 
 from gridsync.tahoe import TahoeWebError
 from gridsync.zkapauthorizer import PLUGIN_NAME, ZKAPAuthorizer
@@ -159,3 +161,105 @@ def test_get_version(tahoe, monkeypatch):
     monkeypatch.setattr("treq.content", Mock(return_value=b'{"version": "9"}'))
     result = yield ZKAPAuthorizer(tahoe).get_version()
     assert result == "9"
+
+
+def _dir_json(children):
+    return json.dumps(
+        [
+            "dirnode",
+            {
+                "children": {
+                    name: [node_type, {"rw_uri": cap, "size": size}]
+                    for name, (node_type, cap, size) in children.items()
+                }
+            },
+        ]
+    ).encode("utf-8")
+
+
+@pytest.fixture()
+def fake_grid(tahoe, monkeypatch):
+    """
+    Serve the "?t=json" content of a rootcap with two writable children
+    along with the sizes of some magic-folder objects.
+    """
+    grid = {
+        "URI:DIR2:rootcap": _dir_json(
+            {
+                "a": ("dirnode", "URI:DIR2:a", None),
+                "b": ("dirnode", "URI:DIR2:b", None),
+            }
+        ),
+        "URI:DIR2:a": _dir_json({"file": ("filenode", "URI:CHK:1", 100)}),
+        "URI:DIR2:b": _dir_json({"file": ("filenode", "URI:CHK:2", 200)}),
+    }
+    reads = []
+
+    async def fake_fetch_json_content(self, cap):
+        reads.append(cap)
+        return grid[cap]
+
+    async def fake_get_all_object_sizes(concurrency):
+        return [1, 2, 3]
+
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe._fetch_json_content", fake_fetch_json_content
+    )
+    monkeypatch.setattr(
+        "gridsync.zkapauthorizer.ZKAPAuthorizer._get_content",
+        lambda _, path: succeed(grid[path.split("/")[0]]),
+    )
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.get_rootcap", lambda _: "URI:DIR2:rootcap"
+    )
+    tahoe.magic_folder = Mock(get_all_object_sizes=fake_get_all_object_sizes)
+    grid["reads"] = reads
+    return grid
+
+
+@inlineCallbacks
+def test_get_sizes(tahoe, fake_grid):
+    sizes = yield ZKAPAuthorizer(tahoe).get_sizes()
+    assert sizes == [
+        len(fake_grid["URI:DIR2:rootcap"]),
+        len(fake_grid["URI:DIR2:a"]),
+        100,
+        len(fake_grid["URI:DIR2:b"]),
+        200,
+        1,
+        2,
+        3,
+    ]
+
+
+@inlineCallbacks
+def test_get_sizes_reuses_sizes_of_unchanged_dircaps(tahoe, fake_grid):
+    zkapauthorizer = ZKAPAuthorizer(tahoe)
+    first = yield zkapauthorizer.get_sizes()
+    second = yield zkapauthorizer.get_sizes()
+    assert first == second
+    assert sorted(fake_grid["reads"]) == ["URI:DIR2:a", "URI:DIR2:b"]
+
+
+@inlineCallbacks
+def test_get_sizes_does_not_reread_unchanged_dircaps_after_expiry(
+    tahoe, fake_grid
+):
+    tahoe.dircache.ttl = 0  # Every listing expires immediately
+    zkapauthorizer = ZKAPAuthorizer(tahoe)
+    yield zkapauthorizer.get_sizes()
+    yield zkapauthorizer.get_sizes()
+    assert sorted(fake_grid["reads"]) == ["URI:DIR2:a", "URI:DIR2:b"]
+
+
+@inlineCallbacks
+def test_get_sizes_rereads_modified_dircaps(tahoe, fake_grid):
+    zkapauthorizer = ZKAPAuthorizer(tahoe)
+    yield zkapauthorizer.get_sizes()
+    fake_grid["URI:DIR2:a"] = _dir_json(
+        {"file": ("filenode", "URI:CHK:3", 300)}
+    )
+    tahoe.dircache.invalidate("URI:DIR2:a")
+    sizes = yield zkapauthorizer.get_sizes()
+    assert 300 in sizes
+    assert 100 not in sizes